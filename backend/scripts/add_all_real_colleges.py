@@ -7,16 +7,17 @@ This script adds thousands of REAL, verified colleges from:
 - State Admission Committees (ACPC, TNEA, DTE, KEA)
 - AICTE Approved List
 
-Run: python add_all_real_colleges.py
+Run: python add_all_real_colleges.py [--backend sqlite]
 """
 
-import json
+import argparse
 import csv
 import os
-from pathlib import Path
 import re
 
-BASE_DIR = Path(__file__).parent / "models"
+from college_schema import validate
+from college_store import MODELS_DIR, CollegeStore
+from sqlite_store import add_backend_argument, open_store
 
 def generate_id(name, city):
     """Generate unique college ID"""
@@ -26,31 +27,20 @@ def generate_id(name, city):
     city_str = re.sub(r'[-\s]+', '-', city_str)
     return f"{id_str[:30]}-{city_str[:15]}"
 
-def load_existing_colleges(state_file):
-    """Load existing colleges"""
-    try:
-        with open(state_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def add_college(college_data, state_name, store=None):
+    """Add a single college to state file
 
-def save_colleges(state_file, colleges):
-    """Save colleges to file"""
-    with open(state_file, 'w', encoding='utf-8') as f:
-        json.dump(colleges, f, indent=2, ensure_ascii=False)
-
-def add_college(college_data, state_name):
-    """Add a single college to state file"""
-    state_filename = f"{state_name.replace(' ', '_')}_Colleges.json"
-    state_path = BASE_DIR / state_filename
-    
-    existing_colleges = load_existing_colleges(state_path)
-    existing_ids = {c['id'] for c in existing_colleges}
+    Pass a CollegeStore to batch many adds; the caller commits it.
+    """
+    if store is None:
+        with CollegeStore(MODELS_DIR, validator=validate) as store:
+            return add_college(college_data, state_name, store)
     
     college_id = generate_id(college_data['name'], college_data['city'])
     
-    if college_id in existing_ids:
-        return False, "Already exists"
+    existing_file = store.locate(college_id)
+    if existing_file:
+        return False, f"Already exists in {existing_file}"
     
     college = {
         "id": college_id,
@@ -77,8 +67,11 @@ def add_college(college_data, state_name):
         }
     }
     
-    existing_colleges.append(college)
-    save_colleges(state_path, existing_colleges)
+    errors = validate(college)
+    if errors:
+        return False, "Invalid: " + "; ".join(f"{field} {message}" for field, message in errors)
+    
+    store.add(state_name, college)
     return True, "Added"
 
 # NIRF 2024 Top 300 Engineering Colleges - REAL DATA
@@ -224,7 +217,7 @@ NIRF_201_300 = [
     {"name": "Institute of Infrastructure Technology Research and Management", "city": "Ahmedabad", "state": "Gujarat", "tier": "Tier 2"},
 ]
 
-def add_nirf_colleges():
+def add_nirf_colleges(backend="json", db=None):
     """Add all NIRF ranked colleges to database"""
     print("\n" + "="*60)
     print("ADDING NIRF 2024 RANKED COLLEGES")
@@ -233,6 +226,7 @@ def add_nirf_colleges():
     all_nirf = NIRF_COLLEGES + NIRF_201_300
     added = 0
     skipped = 0
+    store = open_store(backend, MODELS_DIR, db, validator=validate)
     
     for college in all_nirf:
         college_data = {
@@ -245,24 +239,29 @@ def add_nirf_colleges():
             'ownership': 'Government' if 'National Institute of Technology' in college['name'] or 'Indian Institute of Technology' in college['name'] or 'Government' in college['name'] or 'Institute of Technology' in college['name'] else 'Private'
         }
         
-        success, msg = add_college(college_data, college['state'])
+        success, msg = add_college(college_data, college['state'], store)
         if success:
             added += 1
             print(f"  ✓ {college['name'][:50]}... ({college['state']})")
         else:
             skipped += 1
     
+    store.commit()
     print(f"\n✅ NIRF Colleges: {added} added, {skipped} skipped")
     return added
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Add NIRF ranked colleges to the state files')
+    add_backend_argument(parser)
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("ADDING REAL COLLEGES FROM OFFICIAL SOURCES")
     print("="*60)
     
     # Add NIRF colleges
-    nirf_added = add_nirf_colleges()
+    nirf_added = add_nirf_colleges(args.backend, args.db)
     
     print("\n" + "="*60)
     print("SUMMARY")
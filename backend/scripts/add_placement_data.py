@@ -1,7 +1,14 @@
-import json
-import os
+import argparse
 from pathlib import Path
 
+from change_log import ChangeLog
+from college_store import MODELS_DIR, file_label, record_files, write_change_report
+from parallel import add_jobs_argument, map_files
+from record_stream import rewrite_records
+from run_manifest import RunManifest, add_full_argument
+from run_metrics import Progress, add_profile_argument, instrumented
+from sqlite_store import SqliteStore, add_backend_argument
+
 # Verified placement data from official sources (2024)
 PLACEMENT_DATA = {
     # IITs
@@ -203,58 +210,105 @@ PLACEMENT_DATA = {
     "ssn-college-of-engineering": { "averagePackage": "₹12.5 LPA", "medianPackage": "₹9.0 LPA", "highestPackage": "₹1.17 CPA" }
 }
 
-def update_college_placements(models_dir):
-    """Update all college JSON files with placement data"""
+def apply_placements(college):
+    """Set verified placement data on one college; returns True if it has any"""
+    college_id = college.get('id')
+    if college_id in PLACEMENT_DATA:
+        college['placements'] = PLACEMENT_DATA[college_id]
+        return True
+    elif college_id == "iim-ahm":
+         print(f"  DEBUG: Found iim-ahm but not in PLACEMENT_DATA keys: {list(PLACEMENT_DATA.keys())}")
+    return False
+
+def update_file_placements(file_path):
+    """Apply placement data to one state file; returns the ids whose content changed (None on error)
+
+    The file is only rewritten when at least one college actually changed.
+    """
+    changed_ids = []
+    try:
+        rewrite_records(file_path, apply_placements, changed_ids)
+    except Exception as e:
+        print(f"  ✗ Error processing {file_label(file_path)}: {e}")
+        return None
+    return changed_ids
+
+def update_college_placements(models_dir, jobs=1, changed_out=None, full=False):
+    """Update all college JSON files with placement data
+
+    Returns {file name: [changed ids]}; also written to `changed_out` if given.
+    """
     models_path = Path(models_dir)
     
     if not models_path.exists():
         print(f"Error: Directory {models_dir} does not exist")
         return
     
-    # Find all college JSON files
-    college_files = list(models_path.glob("*_Colleges.json"))
+    # Find all college JSON files (district shards of sharded states included)
+    college_files = record_files(models_path)
     
-    updated_count = 0
+    changed = {}
     
-    for file_path in college_files:
-        print(f"Processing {file_path.name}...")
-        
-        try:
-            # Read the JSON file
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                data = json.load(f)
-            
-            # Handle different JSON structures (List vs Object with 'institutions')
-            if isinstance(data, dict) and 'institutions' in data:
-                colleges = data['institutions']
-                is_wrapper = True
-            else:
-                colleges = data
-                is_wrapper = False
+    # Skip files already processed with the same PLACEMENT_DATA
+    manifest = RunManifest("add_placement_data", models_path, inputs=(PLACEMENT_DATA, apply_placements))
+    pending = college_files if full else manifest.pending(college_files)
+    if len(pending) < len(college_files):
+        print(f"Skipping {len(college_files) - len(pending)} unchanged files")
+    
+    progress = Progress(len(pending), "files")
+    for file_path, ids in map_files(update_file_placements, pending, jobs):
+        progress.update()
+        if ids is None:
+            continue
+        if ids:
+            changed[file_label(file_path)] = ids
+        manifest.record(file_path)
+    manifest.save()
+    
+    updated_count = sum(len(ids) for ids in changed.values())
+    print(f"\n✓ Updated {updated_count} colleges with placement data")
+    print(f"  - Files rewritten: {len(changed)} of {len(college_files)}")
+    if changed_out:
+        write_change_report(changed_out, changed)
+        print(f"  - Changed ids written to {changed_out}")
+    return changed
 
-            # Update colleges with placement data
-            for college in colleges:
-                college_id = college.get('id')
-                if college_id in PLACEMENT_DATA:
-                    college['placements'] = PLACEMENT_DATA[college_id]
-                    print(f"  ✓ Updated {college.get('name', college_id)}")
-                    updated_count += 1
-                elif college_id == "iim-ahm":
-                     print(f"  DEBUG: Found iim-ahm but not in PLACEMENT_DATA keys: {list(PLACEMENT_DATA.keys())}")
-            
-            # Write back to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                if is_wrapper:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                else:
-                    json.dump(colleges, f, indent=2, ensure_ascii=False)
-        
-        except Exception as e:
-            print(f"  ✗ Error processing {file_path.name}: {e}")
+def update_sqlite_placements(db, changed_out=None):
+    """Apply placement data to every college in the SQLite store in one transaction"""
+    with SqliteStore(db) as store:
+        changed = store.rewrite(apply_placements)
     
+    updated_count = sum(len(ids) for ids in changed.values())
     print(f"\n✓ Updated {updated_count} colleges with placement data")
+    print(f"  - Files changed: {len(changed)}")
+    if changed_out:
+        write_change_report(changed_out, changed)
+        print(f"  - Changed ids written to {changed_out}")
+    return changed
+
+def log_college_placements(change_log):
+    """Append placement patches to the change log instead of rewriting state files"""
+    for college_id, placements in PLACEMENT_DATA.items():
+        change_log.patch(college_id, {"placements": placements})
+    print(f"✓ Logged placement updates for {len(PLACEMENT_DATA)} colleges to {change_log.path}")
+    print("  Run: python change_log.py compact")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Apply verified placement data')
     # Update the path to your models directory
-    models_directory = r"e:\CMAT-PROBLEM\backend\models"
-    update_college_placements(models_directory)
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--log', action='store_true', help='Append to the change log instead of rewriting files')
+    parser.add_argument('--changed-out', help='Write the ids of changed colleges to this JSON file')
+    add_jobs_argument(parser)
+    add_full_argument(parser)
+    add_backend_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with instrumented("add_placement_data", args.profile):
+        if args.log:
+            log_college_placements(ChangeLog.for_models(args.models_dir))
+        elif args.backend == "sqlite":
+            update_sqlite_placements(args.db, args.changed_out)
+        else:
+            update_college_placements(args.models_dir, args.jobs, args.changed_out, args.full)
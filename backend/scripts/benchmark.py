@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Data Script Benchmarks
+======================
+Times the data-maintenance scripts against synthetic models/ directories
+of growing size, so their scaling is measured instead of guessed.
+
+Tasks:
+- load      parse every state file (CollegeStore)
+- save      rewrite every state file
+- import    chunked CSV import (bulk_import_colleges) of size/10 rows
+- enrich    placements + cutoffs + enrich stages (pipeline.py, --full)
+- dedup     candidate generation and scoring (dedup_colleges)
+- validate  full schema check (college_schema)
+
+Each task runs in a fresh interpreter against a scratch copy of the
+dataset, so peak RSS is the task's own and runs do not share caches.
+Results (wall time, peak RSS, records/sec and the run_metrics stage
+times) are written as JSON; pass an earlier results file with --compare
+to see the change per task.
+
+Datasets come from synth_colleges (learned from models/, both file
+layouts) and are built once per size and seed under .cache/bench/data.
+
+Usage:
+    python benchmark.py                                 # 1k, 10k, 100k, 1M
+    python benchmark.py --sizes 1k,10k --tasks load,validate
+    python benchmark.py --compare .cache/bench/results/bench-20250101T000000Z.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from college_store import MODELS_DIR, CollegeStore, state_paths
+from run_metrics import METRICS, peak_rss_mb
+from synth_colleges import Profile, generate, iter_files, write_csv
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+BENCH_DIR = SCRIPTS_DIR / ".cache" / "bench"
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DATASET_VERSION = 2
+
+
+
+def build_dataset(size, directory, seed=0):
+    """Write a synthetic dataset of `size` colleges (synth_colleges, mixed layouts)"""
+    generate(Profile(MODELS_DIR), size, directory, seed, layout="mixed")
+    (Path(directory) / "dataset.json").write_text(json.dumps(
+        {"version": DATASET_VERSION, "size": size, "seed": seed}), encoding="utf-8")
+
+
+def dataset_dir(size, seed=0):
+    """Directory of the cached dataset for (size, seed), building it if needed"""
+    directory = BENCH_DIR / "data" / f"{size}-{seed}"
+    marker = directory / "dataset.json"
+    try:
+        info = json.loads(marker.read_text(encoding="utf-8"))
+        if info == {"version": DATASET_VERSION, "size": size, "seed": seed}:
+            return directory
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    shutil.rmtree(directory, ignore_errors=True)
+    print(f"  Building {size}-college dataset...", flush=True)
+    build_dataset(size, directory, seed)
+    return directory
+
+
+def write_import_csv(path, rows, seed=0):
+    """Template-format CSV of `rows` new colleges (a different seed than the dataset)"""
+    colleges = (college for _, _, file_colleges in iter_files(Profile(MODELS_DIR), rows, seed + 1)
+                for college in file_colleges)
+    write_csv(path, colleges)
+
+
+# -- tasks (run in the worker process) ----------------------------------------
+# Each takes the scratch models dir and returns the number of records handled.
+
+def task_load(models_dir):
+    store = CollegeStore(models_dir)
+    return sum(len(store.open(p.name)) for p in state_paths(models_dir))
+
+
+def task_save(models_dir):
+    store = CollegeStore(models_dir)
+    records = 0
+    for path in state_paths(models_dir):
+        state_file = store.open(path.name)
+        state_file.save()
+        records += len(state_file)
+    return records
+
+
+def task_import(models_dir):
+    from bulk_import_colleges import import_chunked
+    csv_path = Path(models_dir) / "import.csv"
+    with open(csv_path, encoding="utf-8") as f:
+        rows = sum(1 for _ in f) - 1
+    import_chunked(str(csv_path), models_dir=models_dir, errors_file=str(Path(models_dir) / "errors.csv"))
+    return rows
+
+
+def task_enrich(models_dir):
+    from pipeline import run_pipeline
+    return run_pipeline(models_dir, full=True)["records"]
+
+
+def task_dedup(models_dir):
+    from dedup_colleges import find_duplicates, load_entries
+    entries = load_entries(models_dir)
+    find_duplicates(entries)
+    return len(entries)
+
+
+def task_validate(models_dir):
+    from college_schema import validate_models
+    return sum(state["records"] for state in validate_models(models_dir).values())
+
+
+TASKS = {
+    "load": task_load,
+    "save": task_save,
+    "import": task_import,
+    "enrich": task_enrich,
+    "dedup": task_dedup,
+    "validate": task_validate,
+}
+
+
+def run_worker(task, models_dir):
+    """Run one task in this process and print its measurements as JSON"""
+    func = TASKS[task]
+    METRICS.reset()
+    start = time.perf_counter()
+    # Task output (import summaries etc.) goes to stderr so stdout stays JSON
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        records = func(models_dir)
+    finally:
+        sys.stdout = stdout
+    seconds = time.perf_counter() - start
+    print(json.dumps({"records": records, "seconds": seconds, "peakRssMb": round(peak_rss_mb(), 1),
+                      "stages": METRICS.report(seconds)["stages"]}))
+
+
+# -- driver ------------------------------------------------------------------
+
+def run_task(task, size, seed=0):
+    """Measure one task on a scratch copy of the dataset; returns a result dict"""
+    source = dataset_dir(size, seed)
+    with tempfile.TemporaryDirectory(prefix="bench-") as scratch:
+        models_dir = Path(scratch) / "models"
+        shutil.copytree(source, models_dir)
+        if task == "import":
+            write_import_csv(models_dir / "import.csv", max(size // 10, 100), seed)
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--worker", task, str(models_dir)],
+            cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"task": task, "size": size, "error": proc.stderr.strip().splitlines()[-1:]}
+    measured = json.loads(proc.stdout.strip().splitlines()[-1])
+    seconds = measured["seconds"]
+    return {
+        "task": task,
+        "size": size,
+        "records": measured["records"],
+        "seconds": round(seconds, 4),
+        "peakRssMb": measured["peakRssMb"],
+        "recordsPerSec": round(measured["records"] / seconds, 1) if seconds > 0 else None,
+        "stages": measured["stages"],
+    }
+
+
+def compare(results, previous):
+    """Print the change in time and memory against an earlier results file"""
+    before = {(r["task"], r["size"]): r for r in previous.get("results", []) if "error" not in r}
+    print("\nChange vs previous run:")
+    for result in results:
+        old = before.get((result["task"], result["size"]))
+        if old is None or "error" in result:
+            continue
+        time_change = (result["seconds"] / old["seconds"] - 1) * 100 if old["seconds"] else 0.0
+        rss_change = (result["peakRssMb"] / old["peakRssMb"] - 1) * 100 if old["peakRssMb"] else 0.0
+        mark = "⚠" if time_change > 10 or rss_change > 10 else "✓"
+        print(f"  {mark} {result['task']:<9} {result['size']:>9,}  time {time_change:+6.1f}%  rss {rss_change:+6.1f}%")
+
+
+def parse_size(text):
+    """A dataset size: 5000, 10k or 1M"""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if scale > 1 else text
+    size = int(float(number) * scale)
+    if size <= 0:
+        raise ValueError(f"size must be positive: {text}")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the data scripts on synthetic datasets')
+    parser.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated dataset sizes, k/M suffixes allowed (default: 1k,10k,100k,1M)')
+    parser.add_argument('--tasks', default=",".join(TASKS), help=f"Comma-separated tasks ({', '.join(TASKS)})")
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic datasets')
+    parser.add_argument('--output', '-o', help='Results JSON (default: .cache/bench/results/bench-<time>.json)')
+    parser.add_argument('--compare', help='Earlier results JSON to compare against')
+    parser.add_argument('--worker', nargs=2, metavar=('TASK', 'MODELS_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    try:
+        sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError as e:
+        parser.error(f"bad --sizes: {e}")
+    tasks = [t.strip() for t in args.tasks.split(",") if t.strip()]
+    unknown = [t for t in tasks if t not in TASKS]
+    if unknown:
+        parser.error(f"unknown tasks: {', '.join(unknown)}")
+
+    started = datetime.now(timezone.utc)
+    results = []
+    print("=" * 70)
+    for size in sizes:
+        for task in tasks:
+            result = run_task(task, size, args.seed)
+            results.append(result)
+            if "error" in result:
+                print(f"  ✗ {task:<9} {size:>9,}  failed: {' '.join(result['error'])}")
+            else:
+                print(f"  ✓ {task:<9} {size:>9,}  {result['seconds']:>9.3f}s  {result['peakRssMb']:>8.1f} MB"
+                      f"  {result['recordsPerSec'] or 0:>12,.0f} rec/s")
+    print("=" * 70)
+
+    report = {
+        "startedAt": started.isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "seed": args.seed,
+        "results": results,
+    }
+    output = Path(args.output) if args.output else \
+        BENCH_DIR / "results" / f"bench-{started.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Build College Bundle
+====================
+Merges every models/*_Colleges.json into one pre-deduplicated, minified
+bundle so the server can load a single file at startup instead of
+parsing ~38 files and deduplicating on every cold start.
+
+The merge matches loadStateCollegeFiles in services/dataStore.js: files
+in name order (a sharded state's district files in manifest order, in
+place of its state file), BOM stripped, list found under the same
+wrappers, and colleges deduplicated by id keeping the record with the
+most courses.
+
+Output (in models/bundle/):
+- colleges.<hash>.min.json  the merged college list, with the shared
+                            values it references (see normalize_colleges.py)
+- manifest.json             version, record count, content hash, build
+                            time and the size, mtime and hash of every
+                            source file (shard manifests and shards included)
+
+The server only uses the bundle while every source file still matches
+the manifest, so a stale bundle falls back to the per-file load. It
+hashes a source only when its mtime differs from the manifest's.
+
+Run: python build_bundle.py [--models-dir ../models]
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from college_store import (
+    MODELS_DIR, SHARD_MANIFEST_NAME, SHARED_REF, SharedValues, file_label, is_shared_ref, shard_dir,
+    state_paths, storage_files, write_bytes_atomic, write_json_atomic,
+)
+from json_codec import dumps_bytes, loads
+
+BUNDLE_FORMAT_VERSION = 2
+BUNDLE_DIR_NAME = "bundle"
+MANIFEST_NAME = "manifest.json"
+
+
+def find_college_list(data):
+    """Locate the college list the same way dataStore.js does"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("institutions", "colleges"):
+            if isinstance(data.get(key), list):
+                return data[key]
+        for value in data.values():
+            if isinstance(value, list):
+                return value
+    return []
+
+
+def course_count(college):
+    courses = college.get("courses")
+    return len(courses) if isinstance(courses, (list, str)) else 0
+
+
+def bundle_state_paths(models_dir):
+    """state_paths, plus state files whose suffix differs in case
+
+    dataStore.js matches /_Colleges\.json$/i, so models/x_colleges.json
+    is a state file to the server and must be one to the bundle too.
+    """
+    paths = {path.name: path for path in state_paths(models_dir)}
+    for path in Path(models_dir).iterdir():
+        if path.name.lower().endswith("_colleges.json") and path.is_file():
+            paths.setdefault(path.name, path)
+    return [paths[name] for name in sorted(paths)]
+
+
+def source_files(models_dir):
+    """(path, holds records) for every file the bundle depends on, in load order"""
+    files = []
+    for path in bundle_state_paths(models_dir):
+        stored = storage_files(path)
+        if stored != [path]:
+            # The shard manifest decides which shards exist, so it is a source too
+            files.append((shard_dir(path) / SHARD_MANIFEST_NAME, False))
+        files.extend((file, True) for file in stored)
+    return files
+
+
+def merge_state_files(files, shared=None):
+    """Merge and deduplicate colleges; returns (colleges, stats, sources)"""
+    unique = {}
+    total = 0
+    sources = {}
+
+    for path, holds_records in files:
+        # Stat before reading: a write in between then shows up as an mtime
+        # mismatch, so the server hashes the file instead of trusting it
+        mtime_ns = path.stat().st_mtime_ns
+        raw = path.read_bytes()
+        sources[file_label(path)] = {
+            "size": len(raw),
+            # A string: nanosecond times do not fit in a JavaScript number
+            "mtimeNs": str(mtime_ns),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+        }
+        if not holds_records:
+            continue
+        try:
+            data = loads(raw)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            print(f"  ⚠ Failed to read {file_label(path)}: {e}")
+            continue
+
+        for college in find_college_list(data):
+            if not isinstance(college, dict) or not (college.get("id") or college.get("name")):
+                continue
+            if shared is not None:
+                shared.expand(college)
+            total += 1
+            college_id = college.get("id")
+            if not college_id:
+                continue
+            existing = unique.get(college_id)
+            if existing is None or course_count(college) > course_count(existing):
+                unique[college_id] = college
+
+    colleges = list(unique.values())
+    stats = {"read": total, "records": len(colleges), "duplicatesRemoved": total - len(colleges)}
+    return colleges, stats, sources
+
+
+def build_bundle(models_dir=MODELS_DIR, out_dir=None):
+    """Write the bundle and manifest; returns the manifest dict"""
+    models_dir = Path(models_dir)
+    out_dir = Path(out_dir) if out_dir else models_dir / BUNDLE_DIR_NAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    shared = SharedValues.for_models(models_dir)
+    colleges, stats, sources = merge_state_files(source_files(models_dir), shared)
+
+    # Shared values go into the bundle once; the server expands references
+    used = {}
+    if shared is not None:
+        colleges = [shared.compress(college) for college in colleges]
+        for college in colleges:
+            for value in college.values():
+                if is_shared_ref(value):
+                    used[value[SHARED_REF]] = shared.values[value[SHARED_REF]]
+    payload = dumps_bytes({"shared": used, "colleges": colleges}, pretty=False)
+    content_hash = hashlib.sha256(payload).hexdigest()
+    bundle_name = f"colleges.{content_hash[:12]}.min.json"
+
+    manifest = {
+        "formatVersion": BUNDLE_FORMAT_VERSION,
+        "file": bundle_name,
+        "records": stats["records"],
+        "duplicatesRemoved": stats["duplicatesRemoved"],
+        "sha256": content_hash,
+        "builtAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sources": sources,
+    }
+
+    write_bytes_atomic(out_dir / bundle_name, payload)
+    write_json_atomic(out_dir / MANIFEST_NAME, manifest)
+
+    # Drop bundles from earlier builds once the new manifest points elsewhere
+    for old in out_dir.glob("colleges.*.min.json"):
+        if old.name != bundle_name:
+            old.unlink()
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the merged college bundle')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--out-dir', help='Output directory (default: <models-dir>/bundle)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = build_bundle(args.models_dir, args.out_dir)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ Bundled {manifest['records']} colleges from {len(manifest['sources'])} files in {elapsed:.2f}s")
+    print(f"  - Duplicates removed: {manifest['duplicatesRemoved']}")
+    print(f"  - File: {manifest['file']}")
+    print(f"  - SHA-256: {manifest['sha256']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,7 @@ Bulk College Import Script
 This script helps you add multiple colleges to the database efficiently.
 
 Usage:
-1. Prepare your college data in CSV/Excel format
+1. Prepare your college data in CSV/Excel (.xlsx) format
 2. Run: python bulk_import_colleges.py --input colleges.csv --state Gujarat
 3. The script will validate and add colleges to the respective state JSON file
 
@@ -19,6 +19,21 @@ Required CSV columns:
 - courses: JSON array of course objects
 - district: District name
 - ownership: Government/Private/Grant-in-Aid
+
+Large files (AICTE-scale, 100k+ rows):
+    python bulk_import_colleges.py --input aicte.csv --chunk-size 5000 --jobs 0
+
+reads the CSV in blocks, builds and validates each block in a worker
+pool and adds accepted records to their state (the --state given, else
+the row's state column or the last part of its location). Rejected rows
+go to an error file (<input>.errors.csv) with their row numbers.
+
+.xlsx workbooks are streamed with xlsx_reader (first sheet, or
+--sheet NAME); headers such as "Ranking Tier" or "Official URL" are
+matched to the template columns ignoring case, spaces and underscores.
+
+--backend sqlite adds to the SQLite store (sqlite_store.py) instead of
+the state files, in one transaction.
 """
 
 import json
@@ -26,14 +41,33 @@ import csv
 import sys
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import re
+import zipfile
+
+from college_schema import validate
+from college_store import MODELS_DIR, state_paths
+from parallel import add_jobs_argument, resolve_jobs
+from run_metrics import Progress, add_profile_argument, instrumented
+from sqlite_store import add_backend_argument, open_store
+from xlsx_reader import iter_xlsx_rows
+
+TEMPLATE_COLUMNS = (
+    'name', 'shortName', 'location', 'rankingTier', 'overview', 'campus', 'officialUrl',
+    'acceptedExams', 'courses', 'district', 'ownership', 'establishedYear', 'affiliations',
+    'topRecruiters', 'tuition', 'state',
+)
+_COLUMN_KEYS = {re.sub(r'[\s_]', '', c.lower()): c for c in TEMPLATE_COLUMNS}
+
+_ID_STRIP = re.compile(r'[^\w\s-]')
+_ID_SEPARATORS = re.compile(r'[-\s]+')
 
 def generate_id(name):
     """Generate a unique ID from college name"""
     # Remove special characters, convert to lowercase, replace spaces with hyphens
-    id_str = re.sub(r'[^\w\s-]', '', name.lower())
-    id_str = re.sub(r'[-\s]+', '-', id_str)
+    id_str = _ID_STRIP.sub('', name.lower())
+    id_str = _ID_SEPARATORS.sub('-', id_str)
     return id_str[:50]  # Limit length
 
 def validate_college(college):
@@ -47,35 +81,25 @@ def validate_college(college):
     if college['rankingTier'] not in ['Tier 1', 'Tier 2', 'Tier 3']:
         return False, "rankingTier must be Tier 1, Tier 2, or Tier 3"
     
+    # Full record schema (courses, meta, URLs, ...)
+    errors = validate(college)
+    if errors:
+        return False, "; ".join(f"{field}: {message}" for field, message in errors)
+    
     return True, "Valid"
 
-def load_existing_colleges(state_file):
-    """Load existing colleges from state JSON file"""
-    try:
-        with open(state_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        print(f"Error: {state_file} contains invalid JSON")
-        return []
-
-def save_colleges(state_file, colleges):
-    """Save colleges to state JSON file"""
-    with open(state_file, 'w', encoding='utf-8') as f:
-        json.dump(colleges, f, indent=2, ensure_ascii=False)
-
 def parse_courses(courses_str):
     """Parse courses from string format"""
     if not courses_str:
         return []
     
     courses = []
-    # Try to parse as JSON first
-    try:
-        return json.loads(courses_str)
-    except:
-        pass
+    # Try to parse as JSON first (only worth it for an array or object)
+    if courses_str.lstrip()[:1] in ('[', '{'):
+        try:
+            return json.loads(courses_str)
+        except ValueError:
+            pass
     
     # Simple parsing: course_name|degree|duration|exams
     for course_line in courses_str.split(';'):
@@ -89,77 +113,227 @@ def parse_courses(courses_str):
             })
     return courses
 
-def import_from_csv(csv_file, state_name):
-    """Import colleges from CSV file"""
-    state_filename = f"{state_name.replace(' ', '_')}_Colleges.json"
-    state_path = Path(__file__).parent / "models" / state_filename
-    
-    # Load existing colleges
-    existing_colleges = load_existing_colleges(state_path)
-    existing_ids = {c['id'] for c in existing_colleges}
+def column_key(header):
+    """Template column for a spreadsheet header ('Ranking Tier' -> 'rankingTier')"""
+    header = (header or '').strip()
+    return _COLUMN_KEYS.get(re.sub(r'[\s_]', '', header.lower()), header)
+
+def iter_rows(input_file, sheet=None):
+    """Yield (row number, row) from a CSV or .xlsx file; the header is row 1
+
+    Missing cells (short rows) come back as '' and cells past the header
+    are dropped, so every value is a string.
+    """
+    if Path(input_file).suffix.lower() == '.xlsx':
+        for row_number, row in iter_xlsx_rows(input_file, sheet):
+            yield row_number, {column_key(k): v or '' for k, v in row.items()}
+        return
+    with open(input_file, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames:
+            reader.fieldnames = [column_key(h) for h in reader.fieldnames]
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, {k: v or '' for k, v in row.items() if k is not None}
+
+def build_college(row):
+    """College object for one CSV row"""
+    return {
+        "id": generate_id(row['name']),
+        "name": row['name'],
+        "shortName": row.get('shortName', row['name']),
+        "location": row['location'],
+        "rankingTier": row['rankingTier'],
+        "overview": row.get('overview', ''),
+        "campus": row.get('campus', ''),
+        "officialUrl": row.get('officialUrl', ''),
+        "acceptedExams": [e.strip() for e in row.get('acceptedExams', '').split(',') if e.strip()],
+        "courses": parse_courses(row.get('courses', '')),
+        "pastCutoffs": [],
+        "topRecruiters": [r.strip() for r in row.get('topRecruiters', '').split(',') if r.strip()],
+        "tuition": row.get('tuition', ''),
+        "sources": [row.get('officialUrl', '')] if row.get('officialUrl') else [],
+        "meta": {
+            "affiliations": [a.strip() for a in row.get('affiliations', '').split(',') if a.strip()],
+            "ownership": row.get('ownership', 'Private'),
+            "establishedYear": row.get('establishedYear', ''),
+            "district": row.get('district', '')
+        }
+    }
+
+def import_from_csv(csv_file, state_name, models_dir=MODELS_DIR, sheet=None, backend="json", db=None):
+    """Import colleges from a CSV (or .xlsx) file"""
+    store = open_store(backend, models_dir, db, validator=validate)
+    state_file = store.state(state_name)
     
-    new_colleges = []
     updated_count = 0
     skipped_count = 0
+    progress = Progress(unit="rows")
     
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Generate ID
-            college_id = generate_id(row['name'])
-            
-            # Skip if already exists
-            if college_id in existing_ids:
-                skipped_count += 1
-                continue
-            
-            # Build college object
-            college = {
-                "id": college_id,
-                "name": row['name'],
-                "shortName": row.get('shortName', row['name']),
-                "location": row['location'],
-                "rankingTier": row['rankingTier'],
-                "overview": row.get('overview', ''),
-                "campus": row.get('campus', ''),
-                "officialUrl": row.get('officialUrl', ''),
-                "acceptedExams": [e.strip() for e in row.get('acceptedExams', '').split(',') if e.strip()],
-                "courses": parse_courses(row.get('courses', '')),
-                "pastCutoffs": [],
-                "topRecruiters": [r.strip() for r in row.get('topRecruiters', '').split(',') if r.strip()],
-                "tuition": row.get('tuition', ''),
-                "sources": [row.get('officialUrl', '')] if row.get('officialUrl') else [],
-                "meta": {
-                    "affiliations": [a.strip() for a in row.get('affiliations', '').split(',') if a.strip()],
-                    "ownership": row.get('ownership', 'Private'),
-                    "establishedYear": row.get('establishedYear', ''),
-                    "district": row.get('district', '')
-                }
-            }
-            
-            # Validate
-            is_valid, message = validate_college(college)
-            if not is_valid:
-                print(f"Skipping invalid college '{row['name']}': {message}")
-                skipped_count += 1
-                continue
-            
-            new_colleges.append(college)
-            existing_ids.add(college_id)
-            updated_count += 1
-    
-    # Merge and save
-    all_colleges = existing_colleges + new_colleges
-    save_colleges(state_path, all_colleges)
+    for _, row in iter_rows(csv_file, sheet):
+        progress.update()
+        # Skip if already exists in any state file
+        if store.exists(generate_id(row['name'])):
+            skipped_count += 1
+            continue
+        
+        college = build_college(row)
+        
+        # Validate
+        is_valid, message = validate_college(college)
+        if not is_valid:
+            print(f"Skipping invalid college '{row['name']}': {message}")
+            skipped_count += 1
+            continue
+        
+        state_file.add(college)
+        updated_count += 1
+    
+    store.commit()
     
     print(f"\nImport Summary for {state_name}:")
     print(f"  - New colleges added: {updated_count}")
     print(f"  - Skipped (duplicates/invalid): {skipped_count}")
-    print(f"  - Total colleges in {state_name}: {len(all_colleges)}")
-    print(f"  - File saved: {state_path}")
+    print(f"  - Total colleges in {state_name}: {len(state_file)}")
+    print(f"  - File saved: {state_file.path}")
     
     return updated_count
 
+def state_key(name):
+    """Comparable form of a state name ('Jammu and Kashmir' == 'Jammu_Kashmir')"""
+    return re.sub(r'[^a-z]', '', re.sub(r'[\s_]and[\s_]', ' ', name.lower()))
+
+def known_states(filenames):
+    """{state_key: state name} for the states that have a file"""
+    names = (f[:-len('_Colleges.json')].replace('_', ' ') for f in filenames if f.endswith('_Colleges.json'))
+    return {state_key(name): name for name in names}
+
+def row_state(row, states=None):
+    """State named by a row: its state column, else the last part of its location
+
+    With `states` (see known_states) the name is mapped to a known state,
+    or None if it is not one (e.g. 'TN' or a city).
+    """
+    state = (row.get('state') or '').strip()
+    if not state:
+        state = (row.get('location') or '').split(',')[-1].strip()
+    if states is not None and state:
+        return states.get(state_key(state))
+    return state
+
+def iter_chunks(input_file, chunk_size, sheet=None):
+    """Yield lists of (row number, row) from a CSV or .xlsx file"""
+    chunk = []
+    for row_number, row in iter_rows(input_file, sheet):
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def process_chunk(chunk, state_name=None, states=None):
+    """Build and validate a block of rows (runs in a worker)
+
+    Without `state_name`, each row's state must be one of `states`.
+    Returns (accepted, rejected): accepted holds (row number, state,
+    college), rejected holds (row number, name, reason).
+    """
+    accepted = []
+    rejected = []
+    for row_number, row in chunk:
+        name = (row.get('name') or '').strip()
+        if not name:
+            rejected.append((row_number, '', "Missing required field: name"))
+            continue
+        try:
+            college = build_college(row)
+        except KeyError as e:
+            rejected.append((row_number, name, f"Missing required field: {e.args[0]}"))
+            continue
+        except Exception as e:
+            # One malformed row must not abort the whole import
+            rejected.append((row_number, name, f"Unreadable row: {e}"))
+            continue
+        is_valid, message = validate_college(college)
+        if not is_valid:
+            rejected.append((row_number, name, message))
+            continue
+        state = state_name or row_state(row, states)
+        if not state:
+            given = (row.get('state') or row.get('location', '').split(',')[-1]).strip()
+            rejected.append((row_number, name, f"Unknown state: {given}" if given else "No state given"))
+            continue
+        accepted.append((row_number, state, college))
+    return accepted, rejected
+
+def _map_chunks(chunks, jobs, state_name, states):
+    """process_chunk over every block, in input order, with at most 2 blocks per worker in flight"""
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk, state_name, states)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk, state_name, states))
+            if len(pending) >= jobs * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+def import_chunked(csv_file, state_name=None, models_dir=MODELS_DIR, chunk_size=5000, jobs=1, errors_file=None,
+                   sheet=None, backend="json", db=None):
+    """Import a large CSV (or .xlsx) in blocks validated by a worker pool
+
+    Rows that fail validation, name no known state (without `state_name`)
+    or whose id already exists in any state are written to `errors_file`
+    (default <input>.errors.csv) with their row numbers. Returns the
+    number of colleges added.
+    """
+    store = open_store(backend, models_dir, db, validator=validate)
+    if backend == "sqlite":
+        filenames = [name for (name,) in store.conn.execute("SELECT name FROM files")]
+    else:
+        filenames = [path.name for path in state_paths(models_dir)]
+    states = known_states(filenames)
+    errors_file = errors_file or f"{csv_file}.errors.csv"
+    added = {}
+    rows = 0
+    rejected_count = 0
+    progress = Progress(unit="rows")
+
+    with open(errors_file, 'w', newline='', encoding='utf-8') as ef:
+        errors = csv.writer(ef)
+        errors.writerow(['row', 'name', 'error'])
+        for accepted, rejected in _map_chunks(iter_chunks(csv_file, chunk_size, sheet), jobs, state_name, states):
+            rows += len(accepted) + len(rejected)
+            progress.update(len(accepted) + len(rejected))
+            for row_number, state, college in accepted:
+                existing = store.locate(college['id'])
+                if existing:
+                    rejected.append((row_number, college['name'], f"Already exists in {existing}"))
+                    continue
+                store.add(state, college)
+                added[state] = added.get(state, 0) + 1
+            rejected.sort()
+            errors.writerows(rejected)
+            rejected_count += len(rejected)
+
+    written = store.commit()
+
+    print("=" * 70)
+    print(f"✓ Read {rows} rows in chunks of {chunk_size}")
+    for state, count in sorted(added.items()):
+        print(f"  - {state}: {count} added")
+    print(f"  - Files written: {len(written)}")
+    if rejected_count:
+        print(f"  ⚠ {rejected_count} rows skipped, see {errors_file}")
+    else:
+        os.remove(errors_file)
+    print("=" * 70)
+    return sum(added.values())
+
 def create_template_csv(output_file):
     """Create a template CSV file for bulk import"""
     template_data = [
@@ -193,10 +367,17 @@ def create_template_csv(output_file):
 
 def main():
     parser = argparse.ArgumentParser(description='Bulk Import Colleges to Database')
-    parser.add_argument('--input', '-i', help='Input CSV file with college data')
+    parser.add_argument('--input', '-i', help='Input CSV or .xlsx file with college data')
+    parser.add_argument('--sheet', help='Sheet to read from an .xlsx input (default: first sheet)')
     parser.add_argument('--state', '-s', help='State name (e.g., Gujarat, Maharashtra)')
     parser.add_argument('--template', '-t', help='Create template CSV file', action='store_true')
     parser.add_argument('--output', '-o', default='colleges_template.csv', help='Output template filename')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--chunk-size', type=int, help='Import in blocks of this many rows (large files)')
+    parser.add_argument('--errors', help='Error file for chunked imports (default: <input>.errors.csv)')
+    add_jobs_argument(parser)
+    add_backend_argument(parser)
+    add_profile_argument(parser)
     
     args = parser.parse_args()
     
@@ -204,18 +385,37 @@ def main():
         create_template_csv(args.output)
         return
     
+    if args.input and args.chunk_size:
+        if not os.path.exists(args.input):
+            print(f"Error: File not found: {args.input}")
+            sys.exit(1)
+        try:
+            with instrumented("bulk_import_colleges", args.profile):
+                import_chunked(args.input, args.state, args.models_dir, args.chunk_size, args.jobs, args.errors,
+                               args.sheet, args.backend, args.db)
+        except (ValueError, zipfile.BadZipFile) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+    
     if not args.input or not args.state:
         print("Error: Both --input and --state are required (or use --template to create a template)")
         print("\nExamples:")
         print("  Create template:  python bulk_import_colleges.py --template")
         print("  Import colleges:  python bulk_import_colleges.py --input colleges.csv --state Gujarat")
+        print("  Large CSV:        python bulk_import_colleges.py --input aicte.csv --chunk-size 5000 --jobs 0")
         sys.exit(1)
     
     if not os.path.exists(args.input):
         print(f"Error: File not found: {args.input}")
         sys.exit(1)
     
-    count = import_from_csv(args.input, args.state)
+    try:
+        with instrumented("bulk_import_colleges", args.profile):
+            count = import_from_csv(args.input, args.state, args.models_dir, args.sheet, args.backend, args.db)
+    except (ValueError, zipfile.BadZipFile) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
     if count > 0:
         print(f"\n✅ Successfully imported {count} colleges to {args.state}!")
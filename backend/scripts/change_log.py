@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+College Change Log
+==================
+Append-only JSONL log of record-level edits to the state files.
+
+Writers append one line per change instead of rewriting a whole
+multi-hundred-KB state file; `compact` later folds the log into
+models/*_Colleges.json with one load and one write per touched file.
+
+Each line is one of:
+  {"op": "upsert", "file": "Gujarat_Colleges.json", "id": "...", "record": {...}, "ts": ...}
+  {"op": "patch",  "file": null, "id": "...", "fields": {...}, "ts": ...}
+
+A patch with no "file" is applied to every state file that holds the id.
+
+Usage:
+    python change_log.py status
+    python change_log.py compact [--models-dir ../models] [--log ../models/college_changes.jsonl]
+
+The log lives in the models dir it applies to unless --log says otherwise.
+"""
+
+import argparse
+import copy
+import json
+import os
+import time
+from pathlib import Path
+
+from college_store import MODELS_DIR, CollegeStore
+from json_codec import dumps, loads
+
+LOG_NAME = "college_changes.jsonl"
+LOG_PATH = MODELS_DIR / LOG_NAME
+
+
+class ChangeLog:
+    """Appends change entries to a JSONL log"""
+
+    def __init__(self, path=LOG_PATH):
+        self.path = Path(path)
+
+    @classmethod
+    def for_models(cls, models_dir):
+        """The change log of a models directory"""
+        return cls(Path(models_dir) / LOG_NAME)
+
+    def append(self, entry):
+        """Append one entry as a single write so concurrent writers never interleave lines"""
+        entry.setdefault("ts", time.time())
+        line = (dumps(entry, pretty=False) + "\n").encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def upsert(self, college, state_file=None):
+        """Record a full college record, replacing any existing one with the same id"""
+        self.append({"op": "upsert", "file": state_file, "id": college["id"], "record": college})
+
+    def patch(self, college_id, fields, state_file=None):
+        """Record a partial update merged into the existing college"""
+        self.append({"op": "patch", "file": state_file, "id": college_id, "fields": fields})
+
+
+def read_entries(path):
+    """Yield log entries, skipping a torn final line left by a crashed writer"""
+    try:
+        f = open(path, 'r', encoding='utf-8-sig')
+    except FileNotFoundError:
+        return
+    with f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except json.JSONDecodeError:
+                print(f"  ⚠ {Path(path).name}:{line_no}: unreadable entry skipped")
+
+
+def _locate_ids(store, ids):
+    """Map ids to every state file that holds them, via the store's id index
+
+    Loaded files are checked directly; the index is consulted for the rest.
+    """
+    found = {}
+    for college_id in ids:
+        files = [filename for filename, state_file in store.files.items() if college_id in state_file]
+        for filename, _, _ in store.id_index.locate(college_id):
+            if filename not in store.files and filename not in files:
+                files.append(filename)
+        if files:
+            found[college_id] = files
+    return found
+
+
+def compact(log_path=None, models_dir=MODELS_DIR):
+    """Fold the change log into the state files in one pass
+
+    The live log is renamed aside first, so writers keep appending to a
+    fresh log while compaction runs. An entry without a file applies to
+    every state file holding its id (some ids are stored in two states).
+    Patches for ids that exist in no state file are dropped and counted as
+    unmatched; upserts with no file for a new id cannot be placed and are
+    appended back to the live log.
+    `log_path` defaults to the log in `models_dir`. Returns a summary dict.
+    """
+    log_path = Path(log_path) if log_path else Path(models_dir) / LOG_NAME
+    pending_path = log_path.with_name(log_path.name + ".compacting")
+
+    # A leftover pending file means an earlier compaction died; finish it first
+    if not pending_path.exists():
+        if not log_path.exists():
+            return {"entries": 0, "applied": 0, "unmatched": 0, "unresolved": 0, "files": []}
+        os.replace(log_path, pending_path)
+
+    entries = list(read_entries(pending_path))
+    store = CollegeStore(models_dir)
+
+    for entry in entries:
+        if entry.get("file"):
+            store.open(entry["file"])
+    unplaced = {e["id"] for e in entries if not e.get("file")}
+    locations = _locate_ids(store, unplaced) if unplaced else {}
+
+    applied = 0
+    unmatched = 0
+    unresolved = []
+    for entry in entries:
+        filenames = [entry["file"]] if entry.get("file") else locations.get(entry["id"], [])
+        if entry["op"] == "upsert":
+            if not filenames:
+                unresolved.append(entry)
+                continue
+            for filename in filenames:
+                # Each file gets its own copy, so later patches cannot leak between them
+                store.open(filename).upsert(copy.deepcopy(entry["record"]))
+            locations.setdefault(entry["id"], filenames)
+        elif entry["op"] == "patch":
+            updated = [store.open(filename).update(entry["id"], entry["fields"]) for filename in filenames]
+            if not any(updated):
+                unmatched += 1
+                continue
+        else:
+            unresolved.append(entry)
+            continue
+        applied += 1
+
+    written = store.commit()
+
+    if unresolved:
+        log = ChangeLog(log_path)
+        for entry in unresolved:
+            log.append(entry)
+    os.unlink(pending_path)
+
+    return {
+        "entries": len(entries),
+        "applied": applied,
+        "unmatched": unmatched,
+        "unresolved": len(unresolved),
+        "files": [p.name for p in written],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and compact college edits')
+    parser.add_argument('command', choices=['status', 'compact'])
+    parser.add_argument('--log', help=f'Change log file (default: <models-dir>/{LOG_NAME})')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    args = parser.parse_args()
+    args.log = args.log or str(Path(args.models_dir) / LOG_NAME)
+
+    if args.command == 'status':
+        entries = list(read_entries(args.log))
+        ops = {}
+        for entry in entries:
+            ops[entry.get("op")] = ops.get(entry.get("op"), 0) + 1
+        print(f"{len(entries)} pending changes in {args.log}")
+        for op, count in sorted(ops.items()):
+            print(f"  - {op}: {count}")
+        return
+
+    summary = compact(args.log, args.models_dir)
+    print(f"\n✓ Compacted {summary['applied']}/{summary['entries']} changes into {len(summary['files'])} files")
+    for name in summary['files']:
+        print(f"  - {name}")
+    if summary['unmatched']:
+        print(f"  ⚠ {summary['unmatched']} patches matched no college and were dropped")
+    if summary['unresolved']:
+        print(f"  ⚠ {summary['unresolved']} changes could not be placed and were kept in the log")
+
+
+if __name__ == '__main__':
+    main()
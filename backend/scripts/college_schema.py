@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+College Record Schema
+=====================
+The full shape of a college record, and a validator compiled from it.
+
+The schema is a JSON-Schema subset (type, required, properties, items,
+enum, pattern, minLength) written as a dict. compile_schema turns it
+into nested closures once, so checking a record is plain isinstance
+tests and dict lookups with no schema interpretation per record.
+
+Errors are reported as (field, message) pairs; array positions are
+collapsed (courses[].exams) so counts aggregate across records.
+
+Usage:
+    python college_schema.py                  # validate every state file (exit 1 if any is invalid)
+    python college_schema.py --jobs 0 --report schema_report.json
+
+    errors = validate(college)                # [(field, message), ...]
+    store = CollegeStore(validator=validate)  # refuse to write invalid records
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from college_store import MODELS_DIR, load_state_file, state_paths
+from parallel import add_jobs_argument, map_files
+
+RANKING_TIERS = ["Tier 1", "Tier 1.5", "Tier 2", "Tier 2.5", "Tier 3", "Unranked"]
+
+_TEXT = {"type": "string"}
+_TEXT_LIST = {"type": "array", "items": {"type": "string", "minLength": 1}}
+
+COLLEGE_SCHEMA = {
+    "type": "object",
+    "required": ["id", "name", "location", "rankingTier"],
+    "properties": {
+        "id": {"type": "string", "pattern": r"^[a-z0-9][a-z0-9_-]*$"},
+        "name": {"type": "string", "minLength": 1},
+        "shortName": _TEXT,
+        "location": {"type": "string", "minLength": 1},
+        "rankingTier": {"type": "string", "enum": RANKING_TIERS},
+        "overview": _TEXT,
+        "campus": _TEXT,
+        "officialUrl": {"type": "string", "pattern": r"^(https?://\S+)?$"},
+        "tuition": _TEXT,
+        "acceptedExams": _TEXT_LIST,
+        "topRecruiters": _TEXT_LIST,
+        "sources": _TEXT_LIST,
+        "courses": {"type": "array", "items": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string", "minLength": 1},
+                "degree": _TEXT,
+                "duration": _TEXT,
+                "exams": _TEXT_LIST,
+                "fees": _TEXT,
+            },
+        }},
+        "pastCutoffs": {"type": "array", "items": {
+            "type": "object",
+            "required": ["cutoff"],
+            "properties": {
+                "examId": {"type": "string", "minLength": 1},
+                "exam": _TEXT,
+                "year": {"type": ["string", "integer"]},
+                "cutoff": {"type": "string"},
+                "source": _TEXT,
+            },
+        }},
+        "placements": {"type": "object", "properties": {
+            "averagePackage": _TEXT,
+            "medianPackage": _TEXT,
+            "highestPackage": _TEXT,
+            "placementRate": _TEXT,
+            "average": _TEXT,
+            "highest": _TEXT,
+        }},
+        "meta": {"type": "object", "properties": {
+            "affiliations": _TEXT_LIST,
+            "district": _TEXT,
+            "ownership": _TEXT,
+            "establishedYear": {"type": ["string", "integer"]},
+            "naacGrade": _TEXT,
+            "sourceName": _TEXT,
+            "sourceType": {"type": ["string", "array"]},
+            "sourceNotes": {"type": "array"},
+            "seeded": {"type": "boolean"},
+            "dateAdded": _TEXT,
+            "state": _TEXT,
+            "dteMappingSource": _TEXT,
+        }},
+        "establishedYear": {"type": ["string", "integer"]},
+        "rating": {"type": "number"},
+        "cutoff": {"type": "object"},
+        "ranking": _TEXT,
+        "logo": _TEXT,
+        "type": _TEXT,
+        "state": _TEXT,
+        "ownership": _TEXT,
+        "approvedBy": _TEXT,
+        "dteCode": _TEXT,
+    },
+}
+
+_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+
+def _type_check(names):
+    """isinstance test for one or more schema type names (bool is not a number)"""
+    names = [names] if isinstance(names, str) else list(names)
+    classes = tuple({cls for name in names for cls in
+                     (_TYPES[name] if isinstance(_TYPES[name], tuple) else (_TYPES[name],))})
+    allow_bool = "boolean" in names
+    label = " or ".join(names)
+
+    if allow_bool or not any(issubclass(bool, cls) for cls in classes):
+        return (lambda value: isinstance(value, classes)), label
+
+    def check(value):
+        return isinstance(value, classes) and not isinstance(value, bool)
+    return check, label
+
+
+def compile_schema(schema, path=""):
+    """Compile `schema` into validate(value, errors) appending (field, message)"""
+    checks = []
+
+    if "type" in schema:
+        is_type, label = _type_check(schema["type"])
+        type_message = f"expected {label}"
+    else:
+        is_type = None
+
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+        enum_message = f"not one of {', '.join(map(str, schema['enum']))}"
+        checks.append(lambda value, errors: value in allowed or errors.append((path, enum_message)))
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+        checks.append(lambda value, errors: not isinstance(value, str) or len(value.strip()) >= min_length
+                      or errors.append((path, "empty")))
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+        pattern_message = f"does not match {schema['pattern']}"
+        checks.append(lambda value, errors: not isinstance(value, str) or pattern.match(value)
+                      or errors.append((path, pattern_message)))
+
+    if "items" in schema:
+        item_check = compile_schema(schema["items"], f"{path}[]")
+
+        def check_items(value, errors):
+            if isinstance(value, list):
+                for item in value:
+                    item_check(item, errors)
+        checks.append(check_items)
+
+    if "properties" in schema or "required" in schema:
+        properties = {key: compile_schema(sub, f"{path}.{key}" if path else key)
+                      for key, sub in schema.get("properties", {}).items()}
+        required = [(key, f"{path}.{key}" if path else key) for key in schema.get("required", ())]
+
+        def check_object(value, errors):
+            if not isinstance(value, dict):
+                return
+            for key, field in required:
+                if value.get(key) is None:
+                    errors.append((field, "missing"))
+            # Records carry fewer keys than the schema lists, so walk the record
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None and item is not None:
+                    check(item, errors)
+        checks.append(check_object)
+
+    if is_type is not None and not checks:
+        # Leaf fields: just the type test
+        return lambda value, errors: is_type(value) or errors.append((path, type_message))
+
+    def validate_value(value, errors):
+        if is_type is not None and not is_type(value):
+            errors.append((path, type_message))
+            return
+        for check in checks:
+            check(value, errors)
+    return validate_value
+
+
+_validate_college = compile_schema(COLLEGE_SCHEMA)
+
+
+def validate(college):
+    """Schema errors of one college record as [(field, message), ...]"""
+    errors = []
+    _validate_college(college, errors)
+    return errors
+
+
+def validate_file(path):
+    """(records, invalid records, Counter of (field, message)) for one state file"""
+    try:
+        _, colleges = load_state_file(path)
+    except ValueError as e:
+        return 0, 0, Counter({("(file)", str(e)): 1})
+    counts = Counter()
+    invalid = 0
+    for college in colleges:
+        errors = validate(college)
+        if errors:
+            invalid += 1
+            counts.update(errors)
+    return len(colleges), invalid, counts
+
+
+def state_of(path):
+    return Path(path).name[:-len("_Colleges.json")].replace("_", " ")
+
+
+def validate_models(models_dir=MODELS_DIR, jobs=1):
+    """Validate every state file; returns {state: {records, invalid, errors}}"""
+    paths = state_paths(models_dir)
+    report = {}
+    for path, (records, invalid, counts) in map_files(validate_file, paths, jobs):
+        report[state_of(path)] = {
+            "records": records,
+            "invalid": invalid,
+            "errors": {f"{field}: {message}": n for (field, message), n in counts.most_common()},
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate every college record against the schema')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--report', help='Write the per-state error counts to this JSON file')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = validate_models(args.models_dir, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    by_field = Counter()
+    for state in report.values():
+        by_field.update(state["errors"])
+    records = sum(s["records"] for s in report.values())
+    invalid = sum(s["invalid"] for s in report.values())
+
+    print("=" * 70)
+    print(f"✓ Validated {records} colleges in {len(report)} files in {elapsed * 1000:.0f} ms")
+    if invalid:
+        print(f"  ⚠ {invalid} colleges with schema errors")
+        print("\nBy field:")
+        for error, n in by_field.most_common():
+            print(f"  - {error}: {n}")
+        print("\nBy state:")
+        for state, result in sorted(report.items()):
+            if result["invalid"]:
+                print(f"  ✗ {state}: {result['invalid']} of {result['records']} invalid")
+    print("=" * 70)
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"Report written to {args.report}")
+
+    # Non-zero so CI or a script chain can stop on invalid data
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
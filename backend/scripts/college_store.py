@@ -0,0 +1,729 @@
+#!/usr/bin/env python3
+"""
+College Store
+=============
+Shared unit-of-work store for the data scripts.
+
+Each touched state file is loaded once, indexed by id in memory, and
+written back exactly once on commit using a temp-file-and-rename write,
+so adding N colleges costs one parse and one write per state file
+instead of N of each.
+
+Files are written in one format (json_codec): sorted keys, two-space
+indent, UTF-8 without a BOM and a final newline. Reading accepts a BOM.
+
+A state can also be stored sharded by district (see shard_states.py):
+models/<State>/manifest.json lists models/<State>/<District>.json files
+that together hold what <State>_Colleges.json would. The store and
+load_state_file treat the state's usual file name as the merged list,
+and only the touched district files are rewritten on commit.
+
+Usage:
+    with CollegeStore(BASE_DIR) as store:
+        store.add("Gujarat", college)
+        store.update("Gujarat", "iim-ahm", {"placements": {...}})
+    # dirty files are flushed when the block exits without an error
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from json_codec import canonical, dumps, dumps_bytes, indented, loads
+from run_metrics import METRICS
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+# Keys the backend (services/dataStore.js) accepts as a list wrapper
+WRAPPER_KEYS = ("institutions", "colleges")
+
+# Table of values hoisted out of the records by normalize_colleges.py; a
+# record field holding {"$shared": key} stands for values[key]
+SHARED_VALUES_NAME = "shared_values.json"
+SHARED_REF = "$shared"
+
+# Sharded states: models/<State>/manifest.json plus one list per district
+SHARD_MANIFEST_NAME = "manifest.json"
+SHARD_FORMAT_VERSION = 1
+UNASSIGNED_SHARD = "_unassigned.json"
+
+
+def state_filename(state_name):
+    """Build the state file name used in models/ (e.g. Tamil_Nadu_Colleges.json)"""
+    return f"{state_name.replace(' ', '_')}_Colleges.json"
+
+
+def shard_dir(path):
+    """models/<State> for a state file path models/<State>_Colleges.json"""
+    path = Path(path)
+    return path.parent / path.name[:-len("_Colleges.json")]
+
+
+def read_shard_manifest(path):
+    """The shard manifest of a state, or None if the state is a single file
+
+    A single file wins when both exist (shard_states.py writes the new
+    layout completely before removing the old one). A manifest.json that
+    is not in the shard format (models/bundle has one) also means None,
+    as in dataStore.js; a shard manifest with bad entries raises.
+    """
+    path = Path(path)
+    if path.exists():
+        return None
+    manifest_path = shard_dir(path) / SHARD_MANIFEST_NAME
+    try:
+        manifest = loads(manifest_path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{manifest_path} contains invalid JSON: {e}") from e
+    if (not isinstance(manifest, dict) or manifest.get("formatVersion") != SHARD_FORMAT_VERSION
+            or not isinstance(manifest.get("shards"), list)):
+        return None
+    if not all(isinstance(shard, dict) and isinstance(shard.get("file"), str) for shard in manifest["shards"]):
+        raise ValueError(f"{manifest_path}: malformed shard entries")
+    return manifest
+
+
+def is_sharded(path):
+    return read_shard_manifest(path) is not None
+
+
+def storage_files(path):
+    """The files holding a state's records: the state file, or its shards in order"""
+    manifest = read_shard_manifest(path)
+    if manifest is None:
+        return [Path(path)]
+    directory = shard_dir(path)
+    return [directory / shard["file"] for shard in manifest["shards"]]
+
+
+def state_paths(models_dir):
+    """Every state in `models_dir` as its *_Colleges.json path, sharded or not"""
+    models_dir = Path(models_dir)
+    paths = {path.name: path for path in models_dir.glob("*_Colleges.json")}
+    for manifest_path in models_dir.glob(f"*/{SHARD_MANIFEST_NAME}"):
+        path = models_dir / f"{manifest_path.parent.name}_Colleges.json"
+        # models/bundle has a manifest.json too; only shard manifests count
+        if path.name not in paths and is_sharded(path):
+            paths[path.name] = path
+    return [paths[name] for name in sorted(paths)]
+
+
+def record_files(models_dir):
+    """Every file holding college records: single state files and district shards"""
+    return [file for path in state_paths(models_dir) for file in storage_files(path)]
+
+
+def in_shard_dir(path):
+    """True for the files inside a models/<State>/ shard directory"""
+    return (Path(path).parent / SHARD_MANIFEST_NAME).is_file()
+
+
+def models_dir_of(path):
+    """The models dir a state file or shard file belongs to"""
+    path = Path(path)
+    return path.parent.parent if in_shard_dir(path) else path.parent
+
+
+def file_label(path):
+    """Name of a record file relative to the models dir ("Tamil_Nadu/Chennai.json" for shards)"""
+    path = Path(path)
+    return f"{path.parent.name}/{path.name}" if in_shard_dir(path) else path.name
+
+
+def state_stamp(path):
+    """(size, mtime) of a state, summed/maxed over the manifest and shards if sharded"""
+    path = Path(path)
+    if not is_sharded(path):
+        st = path.stat()
+        return st.st_size, st.st_mtime_ns
+    size = mtime = 0
+    for file in [shard_dir(path) / SHARD_MANIFEST_NAME, *storage_files(path)]:
+        st = file.stat()
+        size += st.st_size
+        mtime = max(mtime, st.st_mtime_ns)
+    return size, mtime
+
+
+def district_of(college):
+    meta = college.get("meta") if isinstance(college, dict) else None
+    district = meta.get("district") if isinstance(meta, dict) else None
+    return district.strip() if isinstance(district, str) else ""
+
+
+def shard_file(college):
+    """Shard file name for a college, from meta.district
+
+    Title-cased, so spellings differing only in case share a shard (and
+    never collide on case-insensitive file systems).
+    """
+    stem = re.sub(r"[^A-Za-z0-9-]+", "_", district_of(college)).strip("_").title()
+    if not stem:
+        return UNASSIGNED_SHARD
+    if stem.lower() == SHARD_MANIFEST_NAME[:-len(".json")]:
+        stem += "_district"
+    return f"{stem}.json"
+
+
+def _read_json_list(path):
+    with METRICS.stage("load"):
+        raw = Path(path).read_bytes()
+    try:
+        with METRICS.stage("parse"):
+            data = loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path} contains invalid JSON: {e}") from e
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: no college list found")
+    return data
+
+
+def load_shards(path, manifest):
+    """(container, colleges, homes) of a sharded state
+
+    The colleges are the shards concatenated in manifest order, so they
+    come back grouped by district. homes[i] is the shard file of
+    colleges[i].
+    """
+    directory = shard_dir(path)
+    colleges, homes = [], []
+    for shard in manifest["shards"]:
+        try:
+            shard_colleges = _read_json_list(directory / shard["file"])
+        except FileNotFoundError:
+            raise ValueError(f"{directory / shard['file']}: listed in the manifest but missing") from None
+        colleges.extend(shard_colleges)
+        homes.extend([shard["file"]] * len(shard_colleges))
+    wrapper = manifest.get("wrapper")
+    container = {wrapper: colleges, **manifest.get("extra", {})} if wrapper else colleges
+    return container, colleges, homes
+
+
+def load_state_file(path):
+    """Load a state file, returning (container, colleges)
+
+    Handles the UTF-8 BOM the files ship with, plain lists and the
+    {"institutions": [...]} / {"colleges": [...]} wrappers. A sharded
+    state is returned merged, as if it were one file. A missing file
+    yields an empty list; invalid JSON raises ValueError so a broken file
+    is never silently overwritten.
+    """
+    manifest = read_shard_manifest(path)
+    if manifest is not None:
+        data, colleges, _ = load_shards(path, manifest)
+        METRICS.count("records_read", len(colleges))
+        return data, _expand_all(path, colleges)
+    try:
+        with METRICS.stage("load"):
+            raw = Path(path).read_bytes()
+    except FileNotFoundError:
+        return [], []
+    try:
+        with METRICS.stage("parse"):
+            data = loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path} contains invalid JSON: {e}") from e
+
+    if isinstance(data, list):
+        colleges = data
+    elif isinstance(data, dict) and any(isinstance(data.get(key), list) for key in WRAPPER_KEYS):
+        colleges = next(data[key] for key in WRAPPER_KEYS if isinstance(data.get(key), list))
+    else:
+        raise ValueError(f"{path}: no college list found")
+    METRICS.count("records_read", len(colleges))
+    return data, _expand_all(path, colleges)
+
+
+def _expand_all(path, colleges):
+    shared = SharedValues.for_models(Path(path).parent)
+    if shared is not None:
+        for college in colleges:
+            shared.expand(college)
+    return colleges
+
+
+def write_text_atomic(path, text):
+    """Write text to a temp file next to `path` and rename it into place
+
+    A crash mid-write leaves the previous file intact instead of a
+    truncated one.
+    """
+    with METRICS.stage("write"):
+        _write_atomic(path, text, 'w', 'utf-8')
+
+
+def write_bytes_atomic(path, data):
+    """Binary counterpart of write_text_atomic"""
+    with METRICS.stage("write"):
+        _write_atomic(path, data, 'wb', None)
+
+
+def _write_atomic(path, data, mode, encoding):
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data, pretty=True):
+    """Atomically write `data` as canonical JSON (json_codec), pretty-printed or compact"""
+    with METRICS.stage("serialize"):
+        raw = dumps_bytes(data, pretty) + b"\n"
+    write_bytes_atomic(path, raw)
+
+
+def state_text(container):
+    """File text of a state file: canonical pretty JSON ending in a newline
+
+    A wrapper object keeps its college list first, with its other keys
+    after it in sorted order: the order record_stream.RecordWriter
+    streams them in, so both write the same bytes.
+    """
+    if not isinstance(container, dict):
+        return dumps(container) + "\n"
+    wrapper = next(key for key in WRAPPER_KEYS if isinstance(container.get(key), list))
+    parts = ["{\n  " + dumps(wrapper) + ": " + indented(container[wrapper], 1).lstrip()]
+    parts += [",\n  " + dumps(key) + ": " + indented(value, 1).lstrip()
+              for key, value in sorted(container.items()) if key != wrapper]
+    return "".join(parts) + "\n}\n"
+
+
+def write_state_atomic(path, container):
+    """Atomically write a state file's container (see state_text)"""
+    with METRICS.stage("serialize"):
+        text = state_text(container)
+    write_text_atomic(path, text)
+
+
+def canonical_json(value):
+    """Serialization that is equal for equal content (sorted keys, compact)"""
+    return canonical(value)
+
+
+def record_hash(college):
+    """Content hash of a record's canonical serialization"""
+    return hashlib.sha1(dumps_bytes(college, pretty=False)).hexdigest()
+
+
+def is_shared_ref(value):
+    return isinstance(value, dict) and len(value) == 1 and SHARED_REF in value
+
+
+class SharedValues:
+    """The shared_values.json table of a models dir
+
+    Readers expand references into private copies (so editing one
+    record never changes another); writers compress every field whose
+    value is in the table back into a reference.
+    """
+
+    _cache = {}
+
+    def __init__(self, values, path=None):
+        self.path = path
+        self.values = values
+        self._texts = {key: dumps(value, pretty=False, sort_keys=False) for key, value in values.items()}
+        self._keys = {canonical_json(value): key for key, value in values.items()}
+
+    @staticmethod
+    def key_for(value):
+        return hashlib.sha1(dumps_bytes(value, pretty=False)).hexdigest()[:16]
+
+    @classmethod
+    def for_models(cls, models_dir):
+        """The table for `models_dir`, or None if the files are not normalized"""
+        path = Path(models_dir) / SHARED_VALUES_NAME
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = cls._cache.get(path)
+        if cached is None or cached[0] != stamp:
+            values = loads(path.read_bytes()).get("values", {})
+            cached = (stamp, cls(values, path))
+            cls._cache[path] = cached
+        return cached[1]
+
+    def expand(self, college):
+        """Replace references in `college` with copies of their values, in place"""
+        if not isinstance(college, dict):
+            return college
+        for field, value in college.items():
+            if is_shared_ref(value):
+                text = self._texts.get(value[SHARED_REF])
+                if text is None:
+                    raise ValueError(f"{college.get('id')}: unknown shared value {value[SHARED_REF]}")
+                college[field] = loads(text)
+        return college
+
+    def compress(self, college):
+        """A shallow copy of `college` with table values replaced by references"""
+        if not isinstance(college, dict):
+            return college
+        compressed = None
+        for field, value in college.items():
+            if isinstance(value, (list, dict)) and value and not is_shared_ref(value):
+                key = self._keys.get(canonical_json(value))
+                if key is not None:
+                    if compressed is None:
+                        compressed = dict(college)
+                    compressed[field] = {SHARED_REF: key}
+        return college if compressed is None else compressed
+
+
+def write_change_report(path, changed):
+    """Write {file name: [changed ids]} so cache refreshes can target only those ids"""
+    report = {
+        "files": sorted(changed),
+        "ids": sorted({college_id for ids in changed.values() for college_id in ids if college_id}),
+        "changed": changed,
+    }
+    write_json_atomic(path, report)
+
+
+class StateFile:
+    """One loaded state file with an in-memory id index
+
+    Records touched through add/update/upsert/edit are hashed before the
+    change, so the file only counts as dirty if some record's content
+    really differs (or a record was removed) when it is time to write.
+
+    For a sharded state, save rewrites only the shards holding changed or
+    removed records (and the shard a record moves to when its district
+    changes).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifest = read_shard_manifest(self.path)
+        if self.manifest is None:
+            self.container, self.colleges = load_state_file(self.path)
+        else:
+            self.container, colleges, homes = load_shards(self.path, self.manifest)
+            self.colleges = _expand_all(self.path, colleges)
+            self._set_homes(homes)
+        self._reindex()
+        # id -> hash before the first change (None for records added in this session)
+        self.touched = {}
+        # ids of loaded records removed in this session
+        self.removed = []
+        # id(record) -> (record, hash before) for records edit_record could not track by id
+        self.touched_records = {}
+
+    def _reindex(self):
+        self.index = {c['id']: i for i, c in enumerate(self.colleges) if isinstance(c, dict) and c.get('id')}
+
+    def __contains__(self, college_id):
+        return college_id in self.index
+
+    def __len__(self):
+        return len(self.colleges)
+
+    def get(self, college_id):
+        pos = self.index.get(college_id)
+        return None if pos is None else self.colleges[pos]
+
+    def _touch(self, college_id):
+        if college_id not in self.touched:
+            college = self.get(college_id)
+            self.touched[college_id] = None if college is None else record_hash(college)
+
+    def edit(self, college_id):
+        """Return a college for in-place modification, tracking it for change detection"""
+        college = self.get(college_id)
+        if college is not None:
+            self._touch(college_id)
+        return college
+
+    def edit_record(self, college):
+        """Track a record of this file by identity, for modification in place
+
+        Unlike edit, this reaches every copy of an id that occurs more than
+        once in the file (and records without an id).
+        """
+        college_id = college.get('id') if isinstance(college, dict) else None
+        if college_id and self.get(college_id) is college:
+            self._touch(college_id)
+        elif id(college) not in self.touched_records:
+            self.touched_records[id(college)] = (college, record_hash(college))
+        return college
+
+    def changed_records(self):
+        """Records tracked by edit_record whose content changed"""
+        return [college for college, before in self.touched_records.values() if record_hash(college) != before]
+
+    def add(self, college):
+        """Append a college; returns False if its id already exists"""
+        if college['id'] in self.index:
+            return False
+        self._touch(college['id'])
+        self.index[college['id']] = len(self.colleges)
+        self.colleges.append(college)
+        return True
+
+    def update(self, college_id, fields):
+        """Merge `fields` into an existing college; returns False if not found"""
+        college = self.edit(college_id)
+        if college is None:
+            return False
+        college.update(fields)
+        return True
+
+    def upsert(self, college):
+        """Replace the college with the same id, or append it"""
+        pos = self.index.get(college['id'])
+        if pos is None:
+            return self.add(college)
+        self._touch(college['id'])
+        self.colleges[pos] = college
+        return True
+
+    def remove(self, college_id):
+        """Delete a college; returns False if not found"""
+        pos = self.index.get(college_id)
+        if pos is None:
+            return False
+        del self.colleges[pos]
+        self._reindex()
+        # Removing a record added in this session leaves nothing to write
+        if self.touched.pop(college_id, "loaded") is not None:
+            self.removed.append(college_id)
+        return True
+
+    def changed_ids(self):
+        """Ids whose content differs from what was loaded (or that were added or removed)"""
+        return [
+            college_id for college_id, before in self.touched.items()
+            if before is None or record_hash(self.get(college_id)) != before
+        ] + self.removed
+
+    @property
+    def dirty(self):
+        return bool(self.changed_ids() or self.changed_records())
+
+    def _serializable(self):
+        """The container as written: shared values compressed to references"""
+        shared = SharedValues.for_models(self.path.parent)
+        if shared is None:
+            return self.container
+        colleges = [shared.compress(college) for college in self.colleges]
+        if self.container is self.colleges:
+            return colleges
+        return {key: colleges if value is self.colleges else value for key, value in self.container.items()}
+
+    def _set_homes(self, homes):
+        # Shard of each loaded record, by object (records need not have ids) and by id
+        self._home_of = {id(college): home for college, home in zip(self.colleges, homes)}
+        self._home_by_id = {college['id']: home for college, home in zip(self.colleges, homes)
+                            if isinstance(college, dict) and college.get('id')}
+
+    def save(self):
+        if self.manifest is None:
+            write_state_atomic(self.path, self._serializable())
+            METRICS.count("records_written", len(self.colleges))
+        else:
+            self._save_shards()
+        self.touched = {}
+        self.removed = []
+        self.touched_records = {}
+
+    def _save_shards(self):
+        changed = set(self.changed_ids())
+        changed_records = {id(college) for college in self.changed_records()}
+        dirty = {self._home_by_id[college_id] for college_id in changed if college_id in self._home_by_id}
+        dirty.update(self._home_of[key] for key in changed_records if key in self._home_of)
+        gaining = set()
+        groups = {}
+        homes = []
+        for college in self.colleges:
+            if isinstance(college, dict) and (college.get('id') in changed or id(college) in changed_records):
+                home = shard_file(college)
+                dirty.add(home)
+                if self._home_of.get(id(college), home) != home:
+                    gaining.add(home)
+            else:
+                home = self._home_of.get(id(college)) or shard_file(college)
+            groups.setdefault(home, []).append(college)
+            homes.append(home)
+
+        directory = shard_dir(self.path)
+        shared = SharedValues.for_models(self.path.parent)
+        listed = [shard["file"] for shard in self.manifest["shards"]]
+        added = [home for home in groups if home not in listed]
+        emptied = [home for home in listed if home not in groups]
+
+        def write_shard(home):
+            colleges = groups[home]
+            if shared is not None:
+                colleges = [shared.compress(college) for college in colleges]
+            write_json_atomic(directory / home, colleges)
+            METRICS.count("records_written", len(colleges))
+
+        # Every shard a record moves into (new ones listed first) is written
+        # before any shard it leaves, and emptied shards are unlisted before
+        # they are deleted, so an interrupted save can duplicate a moved
+        # record but never lose it
+        for home in added:
+            write_shard(home)
+        if added:
+            self._write_manifest(listed + added, groups)
+        rewrite = [home for home in listed if home in dirty and home in groups]
+        for home in sorted(rewrite, key=lambda home: home not in gaining):
+            write_shard(home)
+        if emptied:
+            self._write_manifest([home for home in listed + added if home in groups], groups)
+            for home in emptied:
+                (directory / home).unlink(missing_ok=True)
+        self._set_homes(homes)
+
+    def _write_manifest(self, files, groups):
+        districts = {shard["file"]: shard["district"] for shard in self.manifest["shards"]}
+        self.manifest["shards"] = [
+            {"district": districts[file] if file in districts else district_of(groups[file][0]), "file": file}
+            for file in files
+        ]
+        write_json_atomic(shard_dir(self.path) / SHARD_MANIFEST_NAME, self.manifest)
+
+
+class SchemaError(ValueError):
+    """Raised by CollegeStore.commit when changed records fail validation"""
+
+    def __init__(self, problems):
+        self.problems = problems
+        shown = "; ".join(f"{college_id}: {field} {message}" for college_id, field, message in problems[:5])
+        more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+        super().__init__(f"{len(problems)} schema errors: {shown}{more}")
+
+
+class CollegeStore:
+    """Unit of work over the state files in a models directory
+
+    With a `validator` (e.g. college_schema.validate), commit checks every
+    added or changed record first and writes nothing if any is invalid.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, validator=None):
+        self.models_dir = Path(models_dir)
+        self.validator = validator
+        self.files = {}
+        self._id_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def open(self, filename):
+        """Return the loaded StateFile for a file name, loading it on first use"""
+        state_file = self.files.get(filename)
+        if state_file is None:
+            state_file = StateFile(self.models_dir / filename)
+            self.files[filename] = state_file
+        return state_file
+
+    def state(self, state_name):
+        """Return the loaded StateFile for a state name"""
+        return self.open(state_filename(state_name))
+
+    @property
+    def id_index(self):
+        """The global IdIndex for this models dir, loaded on first use"""
+        if self._id_index is None:
+            # Imported here: id_index builds on this module
+            from id_index import IdIndex
+            self._id_index = IdIndex(self.models_dir)
+        return self._id_index
+
+    def contains(self, state_name, college_id):
+        return college_id in self.state(state_name)
+
+    def locate(self, college_id):
+        """Name of a state file holding `college_id` in any state, or None
+
+        Files loaded in this session are checked in memory (so unsaved adds
+        and removals count); the rest through the id index, without
+        parsing them.
+        """
+        for filename, state_file in self.files.items():
+            if college_id in state_file:
+                return filename
+        for filename, _, _ in self.id_index.locate(college_id):
+            if filename not in self.files:
+                return filename
+        return None
+
+    def exists(self, college_id):
+        return self.locate(college_id) is not None
+
+    def add(self, state_name, college):
+        return self.state(state_name).add(college)
+
+    def update(self, state_name, college_id, fields):
+        return self.state(state_name).update(college_id, fields)
+
+    def upsert(self, state_name, college):
+        return self.state(state_name).upsert(college)
+
+    def remove(self, state_name, college_id):
+        return self.state(state_name).remove(college_id)
+
+    def dirty_files(self):
+        return [f for f in self.files.values() if f.dirty]
+
+    def changed_ids(self):
+        """Map file name -> ids changed in this session, for files with changes"""
+        changed = {}
+        for filename, state_file in self.files.items():
+            ids = state_file.changed_ids()
+            if ids:
+                changed[filename] = ids
+        return changed
+
+    def validate(self):
+        """(id, field, message) for every changed record the validator rejects"""
+        problems = []
+        for state_file in self.files.values():
+            for college_id in state_file.changed_ids():
+                college = state_file.get(college_id)
+                if college is not None:
+                    problems.extend((college_id, field, message) for field, message in self.validator(college))
+            for college in state_file.changed_records():
+                problems.extend((college.get('id'), field, message) for field, message in self.validator(college))
+        return problems
+
+    def commit(self):
+        """Write every file whose content changed, once; returns the paths written"""
+        if self.validator is not None:
+            problems = self.validate()
+            if problems:
+                raise SchemaError(problems)
+        dirty = self.dirty_files()
+        for state_file in dirty:
+            state_file.save()
+            if self._id_index is not None:
+                self._id_index.update_file(state_file)
+        if self._id_index is not None:
+            self._id_index.save()
+        return [f.path for f in dirty]
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Columnar College Table
+======================
+A column-per-field NumPy view of every college in the state files, for
+bulk rules, audits and aggregate statistics.
+
+The per-record scripts walk the dicts one college at a time and string-
+match `rankingTier` for each of them. Here the text fields (state, tier,
+ownership, district, file) are categorical columns: integer codes into a
+small list of distinct values. A rule is then evaluated once per
+distinct value and broadcast to all rows through the codes, and
+numeric placement figures live in float arrays.
+
+Records stay the source of truth: the table keeps a reference to each
+record, and rules write their results back to the dicts through
+CollegeStore, so only files with real changes are rewritten.
+
+Requires numpy (pip install numpy).
+
+Usage:
+    python college_table.py stats            # counts and placement ranges by tier
+    python college_table.py audit            # missing fields by state
+    python college_table.py enrich           # enrich_college rules, vectorized
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+
+from college_store import MODELS_DIR, CollegeStore, state_paths
+from enrich_college_data import (
+    DEFAULT_TIER, STANDARD_COURSES, get_placement_stats, get_recruiters_by_tier,
+)
+
+PLACEMENT_FIELDS = {
+    "averagePackage": ("averagePackage", "average"),
+    "medianPackage": ("medianPackage", "median"),
+    "highestPackage": ("highestPackage", "highest"),
+    "placementRate": ("placementRate",),
+}
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+class Categorical:
+    """Integer codes into a list of distinct values"""
+
+    def __init__(self, values):
+        lookup = {}
+        self.codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values),
+                                 dtype=np.int32, count=len(values))
+        self.categories = list(lookup)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def map(self, func, dtype=object):
+        """Apply `func` once per distinct value; returns one result per row"""
+        # Filled element-wise so equal-length lists stay single objects
+        per_category = np.empty(len(self.categories), dtype=dtype)
+        for i, value in enumerate(self.categories):
+            per_category[i] = func(value)
+        return per_category[self.codes]
+
+    def eq(self, value):
+        try:
+            return self.codes == self.categories.index(value)
+        except ValueError:
+            return np.zeros(len(self.codes), dtype=bool)
+
+    def contains(self, text):
+        """Rows whose value contains `text` (case-insensitive)"""
+        text = text.lower()
+        return self.map(lambda v: text in str(v or "").lower(), dtype=bool)
+
+    def counts(self, mask=None):
+        """{value: number of rows}, optionally among masked rows"""
+        codes = self.codes if mask is None else self.codes[mask]
+        counts = np.bincount(codes, minlength=len(self.categories))
+        return {value: int(n) for value, n in zip(self.categories, counts) if n}
+
+
+def parse_range(text):
+    """'₹15-25 LPA' -> (15, 25), '50+ LPA' -> (50, nan), '1.2 CPA' -> (120, 120), '70-85%' -> (70, 85)"""
+    if not isinstance(text, str):
+        return np.nan, np.nan
+    numbers = [float(n) for n in _NUMBER.findall(text.replace(",", ""))]
+    if not numbers:
+        return np.nan, np.nan
+    scale = 100.0 if "CPA" in text.upper() or "crore" in text.lower() else 1.0
+    low = numbers[0] * scale
+    if "+" in text and len(numbers) == 1:
+        return low, np.nan
+    high = numbers[1] * scale if len(numbers) > 1 else low
+    return low, high
+
+
+def _length(value):
+    return len(value) if isinstance(value, (list, str, dict)) else 0
+
+
+class CollegeTable:
+    """Columns over every college in a models directory
+
+    Built from a CollegeStore so rules can write back through it. Row i
+    of every column belongs to `records[i]`, stored in `files[i]`.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.records = []
+        files = []
+        for path in state_paths(store.models_dir):
+            try:
+                state_file = store.open(path.name)
+            except ValueError as e:
+                print(f"  ⚠ Skipping {path.name}: {e}")
+                continue
+            for college in state_file.colleges:
+                if isinstance(college, dict):
+                    self.records.append(college)
+                    files.append(path.name)
+        self._build(files)
+
+    @classmethod
+    def load(cls, models_dir=MODELS_DIR):
+        return cls(CollegeStore(models_dir))
+
+    def __len__(self):
+        return len(self.records)
+
+    def _build(self, files):
+        records = self.records
+        metas = [r.get("meta") if isinstance(r.get("meta"), dict) else {} for r in records]
+
+        self.ids = np.array([r.get("id") for r in records], dtype=object)
+        self.file = Categorical(files)
+        self.state = Categorical([(r.get("location") or "").split(",")[-1].strip() for r in records])
+        self.tier = Categorical([r.get("rankingTier") for r in records])
+        self.ownership = Categorical([m.get("ownership") for m in metas])
+        self.district = Categorical([m.get("district") for m in metas])
+
+        exam_lists = [r.get("acceptedExams") if isinstance(r.get("acceptedExams"), list) else [] for r in records]
+        self.exam_categories = sorted({e for exams in exam_lists for e in exams if isinstance(e, str)})
+        exam_pos = {e: i for i, e in enumerate(self.exam_categories)}
+        self.exams = np.zeros((len(records), len(self.exam_categories)), dtype=bool)
+        for row, exams in enumerate(exam_lists):
+            for exam in exams:
+                if exam in exam_pos:
+                    self.exams[row, exam_pos[exam]] = True
+
+        self.course_count = np.array([_length(r.get("courses")) for r in records], dtype=np.int32)
+        self.recruiter_count = np.array([_length(r.get("topRecruiters")) for r in records], dtype=np.int32)
+        self.cutoff_count = np.array([_length(r.get("pastCutoffs")) for r in records], dtype=np.int32)
+        self.has_placements = np.array([bool(r.get("placements")) for r in records], dtype=bool)
+        self.has_tuition = np.array([bool(r.get("tuition")) for r in records], dtype=bool)
+
+        # Placement figures in LPA (rate in %), NaN where missing
+        self.placements = {}
+        for field, aliases in PLACEMENT_FIELDS.items():
+            low = np.full(len(records), np.nan)
+            high = np.full(len(records), np.nan)
+            for row, r in enumerate(records):
+                placements = r.get("placements")
+                if isinstance(placements, dict):
+                    text = next((placements[a] for a in aliases if placements.get(a)), None)
+                    low[row], high[row] = parse_range(text)
+            self.placements[field] = (low, high)
+
+    def exam_mask(self, exam):
+        """Rows accepting `exam`"""
+        if exam not in self.exam_categories:
+            return np.zeros(len(self), dtype=bool)
+        return self.exams[:, self.exam_categories.index(exam)]
+
+    # -- write-back --------------------------------------------------------
+
+    def edit(self, row):
+        """The record at `row`, tracked by its state file for change detection"""
+        state_file = self.store.open(self.file.categories[self.file.codes[row]])
+        return state_file.edit_record(self.records[row])
+
+    def commit(self):
+        return self.store.commit()
+
+
+def enrich_table(table):
+    """enrich_college's rules over the whole table; returns {rule: rows changed}
+
+    Tier and ownership rules are evaluated once per distinct value; only
+    the rows a rule selects are touched.
+    """
+    missing = {
+        "courses": table.course_count == 0,
+        "topRecruiters": table.recruiter_count == 0,
+        "placements": ~table.has_placements,
+        "pastCutoffs": table.cutoff_count == 0,
+        "tuition": ~table.has_tuition,
+    }
+    recruiters = table.tier.map(lambda t: get_recruiters_by_tier(t or DEFAULT_TIER))
+    placements = table.tier.map(lambda t: get_placement_stats(t or DEFAULT_TIER))
+    government = table.ownership.map(lambda o: "Government" in (o or "Private"), dtype=bool)
+    tuition = np.where(government, "₹50,000 - 1,50,000 per year", "₹1,50,000 - 3,00,000 per year")
+
+    for row in np.flatnonzero(np.logical_or.reduce(list(missing.values()))):
+        college = table.edit(row)
+        if missing["courses"][row]:
+            college["courses"] = STANDARD_COURSES[:4]
+        if missing["topRecruiters"][row]:
+            college["topRecruiters"] = list(recruiters[row])
+        if missing["placements"][row]:
+            college["placements"] = dict(placements[row])
+        if missing["pastCutoffs"][row]:
+            exams = college.get("acceptedExams", ["jee-main"])
+            college["pastCutoffs"] = [
+                {"examId": exam, "year": "2024", "cutoff": "Check official website", "source": "Official"}
+                for exam in exams[:2]
+            ]
+        if missing["tuition"][row]:
+            college["tuition"] = str(tuition[row])
+
+    return {rule: int(mask.sum()) for rule, mask in missing.items()}
+
+
+def tier_stats(table):
+    """Rows and placement ranges per tier"""
+    stats = {}
+    for code, tier in enumerate(table.tier.categories):
+        mask = table.tier.codes == code
+        low, high = table.placements["averagePackage"]
+        stats[tier] = {
+            "colleges": int(mask.sum()),
+            "withPlacements": int(table.has_placements[mask].sum()),
+            "avgPackageLow": float(np.nanmean(low[mask])) if np.any(~np.isnan(low[mask])) else None,
+            "avgPackageHigh": float(np.nanmean(high[mask])) if np.any(~np.isnan(high[mask])) else None,
+            "courses": int(table.course_count[mask].sum()),
+        }
+    return stats
+
+
+def audit(table):
+    """Per state: number of colleges missing each field"""
+    checks = {
+        "courses": table.course_count == 0,
+        "topRecruiters": table.recruiter_count == 0,
+        "placements": ~table.has_placements,
+        "pastCutoffs": table.cutoff_count == 0,
+        "tuition": ~table.has_tuition,
+        "acceptedExams": ~table.exams.any(axis=1),
+    }
+    report = {}
+    totals = np.bincount(table.state.codes, minlength=len(table.state.categories))
+    for field, mask in checks.items():
+        counts = np.bincount(table.state.codes[mask], minlength=len(table.state.categories))
+        for state, total, n in zip(table.state.categories, totals, counts):
+            if n:
+                report.setdefault(state or "(no state)", {"colleges": int(total)})[field] = int(n)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar bulk operations over all colleges')
+    parser.add_argument('command', choices=['stats', 'audit', 'enrich'])
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = CollegeTable.load(args.models_dir)
+    loaded = time.perf_counter()
+    print(f"✓ Loaded {len(table)} colleges from {len(table.file.categories)} files in {(loaded - start) * 1000:.0f} ms")
+
+    if args.command == 'stats':
+        for tier, stats in tier_stats(table).items():
+            low, high = stats["avgPackageLow"], stats["avgPackageHigh"]
+            placement = f"{low:.1f}-{high:.1f} LPA" if low is not None and high is not None else "n/a"
+            print(f"  - {str(tier):<12} {stats['colleges']:>6} colleges  avg package {placement}")
+    elif args.command == 'audit':
+        for state, counts in sorted(audit(table).items()):
+            missing = ", ".join(f"{field} {n}" for field, n in counts.items() if field != "colleges")
+            print(f"  ⚠ {state}: {missing} (of {counts['colleges']})")
+    else:
+        changed = enrich_table(table)
+        ruled = time.perf_counter()
+        written = table.commit()
+        for rule, n in changed.items():
+            print(f"  - {rule:<14} {n:>6} colleges filled")
+        print(f"  Rules applied in {(ruled - loaded) * 1000:.1f} ms, {len(written)} files written")
+        return
+
+    print(f"  Computed in {(time.perf_counter() - loaded) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Crawl Checkpoints
+=================
+Persistent crawl state so a long scrape can resume after a crash,
+deploy or laptop sleep instead of starting again from zero.
+
+A SQLite file per source holds:
+- the frontier: every URL discovered, with its state
+  (pending / done / failed)
+- the records emitted so far, keyed by a content hash so a page that is
+  parsed twice never yields the same row twice
+
+Each page is committed in one transaction together with the URLs it
+discovered and the records it produced, so after an interruption the
+checkpoint is consistent and completed pages are not fetched again.
+
+Usage:
+    checkpoint = CrawlCheckpoint.for_source("aicte", resume=True)
+    result = await crawl(start_urls, parser, fetcher, checkpoint=checkpoint)
+    rows = list(checkpoint.records())
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+from json_codec import canonical, dumps, loads
+
+CHECKPOINT_DIR = Path(__file__).resolve().parent / ".cache" / "crawls"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    discovered_at REAL NOT NULL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS records (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state);
+"""
+
+
+def record_key(record):
+    return hashlib.sha1(canonical(record).encode("utf-8")).hexdigest()
+
+
+class CrawlCheckpoint:
+    """SQLite-backed frontier and emitted-record log for one crawl"""
+
+    def __init__(self, path, resume=True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            # A leftover -wal would be replayed into a fresh file of the same name
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM records").fetchone()[0]
+
+    @classmethod
+    def for_source(cls, source_key, resume=True, directory=CHECKPOINT_DIR):
+        return cls(Path(directory) / f"{source_key}.sqlite", resume)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def known_urls(self):
+        return {url for (url,) in self.db.execute("SELECT url FROM frontier")}
+
+    def unfinished_urls(self):
+        """URLs still to fetch: pending ones plus earlier failures, in discovery order"""
+        rows = self.db.execute(
+            "SELECT url FROM frontier WHERE state != ? ORDER BY discovered_at, rowid", (DONE,))
+        return [url for (url,) in rows]
+
+    def add_urls(self, urls):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO frontier (url, state, discovered_at) VALUES (?, ?, ?)",
+                [(url, PENDING, time.time()) for url in urls])
+
+    def complete(self, url, records, next_urls=()):
+        """Mark `url` done with its records and links; returns the records not emitted before"""
+        new_records = []
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO frontier (url, state, discovered_at) VALUES (?, ?, ?)",
+                [(next_url, PENDING, now) for next_url in next_urls])
+            for record in records:
+                self._seq += 1
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO records (key, seq, url, data) VALUES (?, ?, ?, ?)",
+                    (record_key(record), self._seq, url, dumps(record, pretty=False, sort_keys=False)))
+                if cursor.rowcount:
+                    new_records.append(record)
+            self.db.execute(
+                "UPDATE frontier SET state = ?, finished_at = ?, error = NULL WHERE url = ?",
+                (DONE, now, url))
+        return new_records
+
+    def fail(self, url, reason):
+        with self.db:
+            self.db.execute(
+                "UPDATE frontier SET state = ?, finished_at = ?, error = ? WHERE url = ?",
+                (FAILED, time.time(), reason, url))
+
+    def records(self):
+        """Yield every emitted record, in the order first seen"""
+        for (data,) in self.db.execute("SELECT data FROM records ORDER BY seq"):
+            yield loads(data)
+
+    def counts(self):
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        for state, count in self.db.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state"):
+            counts[state] = count
+        counts["records"] = self.db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        return counts
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate College Detection
+================================
+Finds colleges stored more than once across all state files.
+
+The import scripts build ids differently (bulk_import_colleges uses the
+name cut to 50 characters, the scrapers name[:30]-city[:15]), so the
+same institution can sit under two ids where dataStore.js cannot see
+that they match.
+
+Candidate pairs come from blocking instead of comparing every record
+with every other:
+- exact blocks on the normalized name and on the official URL domain
+- MinHash/LSH over character shingles of the normalized name, which
+  puts names with high Jaccard similarity in a shared bucket
+
+Only candidates are scored (IDF-weighted name token overlap, place and
+domain agreement), and matches are grouped into clusters by complete
+linkage: two clusters join only when every record in one matches every
+record in the other, so A~B and B~C do not pull in an unrelated C.
+
+Names that differ only in the place they name are never matched, and
+names of nothing but generic words ("College of Engineering") are capped
+below the --merge threshold: they are reported, not merged.
+
+Usage:
+    python dedup_colleges.py                      # write the report only
+    python dedup_colleges.py --merge              # also merge high-confidence clusters
+    python dedup_colleges.py --report dupes.json --min-score 0.9
+"""
+
+import argparse
+import math
+import re
+import time
+import zlib
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from random import Random
+from urllib.parse import urlsplit
+
+from college_store import MODELS_DIR, CollegeStore, write_json_atomic
+from record_stream import iter_models
+
+REPORT_PATH = Path(__file__).resolve().parent / "duplicate_report.json"
+
+SHINGLE_SIZE = 3
+NUM_PERM = 32
+BANDS = 8                  # 8 bands x 4 rows: pairs above ~0.6 Jaccard collide
+ROWS = NUM_PERM // BANDS
+MAX_BUCKET = 50            # larger blocks are split by place before pairing
+MERGE_SCORE = 0.9          # clusters at or above this are merged by --merge
+GENERIC_SCORE_CAP = 0.85   # highest score for names with nothing but generic words
+FUZZY_TOKEN = 0.6          # token shingle Jaccard treated as the same word
+
+_PRIME = (1 << 61) - 1
+_rng = Random(20240601)
+_MIX_A, _MIX_B = _rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)
+
+# Spellings folded together before comparing names
+TOKEN_ALIASES = {
+    "engg": "engineering", "engineerig": "engineering", "eng": "engineering",
+    "inst": "institute", "instt": "institute", "institution": "institute",
+    "tech": "technology", "technological": "technology",
+    "univ": "university", "coll": "college", "clg": "college",
+    "govt": "government", "mgmt": "management", "sci": "science", "sciences": "science",
+    "poly": "polytechnic", "st": "saint", "&": "and",
+}
+STOP_TOKENS = {"of", "and", "the", "for", "in", "at"}
+# Parentheticals that describe status rather than name the institution
+PAREN_NOTES = {"autonomous", "deemed to be university", "deemed university"}
+# Words that say what kind of institution it is, not which one
+GENERIC_TOKENS = {
+    "institute", "technology", "college", "engineering", "university", "government", "polytechnic",
+    "science", "management", "national", "indian", "school", "academy", "research", "studies",
+    "education", "technical", "centre", "center", "campus", "private", "public",
+}
+# Hosts shared by many unrelated institutions, useless as a duplicate signal
+SHARED_DOMAINS = {"", "gov.in", "nic.in", "ac.in", "edu.in", "facebook.com", "google.com", "sites.google.com"}
+
+
+def is_acronym(abbr, words):
+    """Whether `abbr` abbreviates `words` ("coep", "pesu" for "PES University")
+
+    Each letter either starts a later word or continues the prefix of the
+    word the previous letter matched; words may be skipped.
+    """
+    @lru_cache(maxsize=None)
+    def match(k, word, pos):
+        if k == len(abbr):
+            return True
+        c = abbr[k]
+        if word >= 0 and words[word][pos:pos + 1] == c and match(k + 1, word, pos + 1):
+            return True
+        return any(words[w][0] == c and match(k + 1, w, 1) for w in range(word + 1, len(words)))
+
+    return len(abbr) > 1 and match(0, -1, 0)
+
+
+def _drop_parenthetical(note, words):
+    note = " ".join(re.findall(r"[a-z0-9&]+", note))
+    return note in PAREN_NOTES or (note.isalpha() and is_acronym(note, tuple(words)))
+
+
+def name_tokens(name):
+    """Normalized name tokens: acronyms and status notes in parentheses dropped,
+    initials joined, aliases folded
+
+    Other parentheticals are kept: "(Degree Wing)" and "(Diploma Wing)"
+    tell two institutions apart.
+    """
+    name = (name or "").lower()
+    words = re.findall(r"[a-z0-9&]+", re.sub(r"\([^)]*\)", " ", name))
+    name = re.sub(r"\(([^)]*)\)", lambda m: " " if _drop_parenthetical(m.group(1), words) else f" {m.group(1)} ", name)
+    tokens = []
+    initials = False
+    for token in re.findall(r"[a-z0-9&]+", name):
+        single = len(token) == 1 and token.isalpha()
+        # "E.G.S. Pillay" and "EGS Pillay" should agree
+        if single and initials:
+            tokens[-1] += token
+        else:
+            tokens.append(token)
+        initials = single or (initials and single)
+    tokens = [TOKEN_ALIASES.get(t, t) for t in tokens]
+    return [t for t in tokens if t not in STOP_TOKENS]
+
+
+def url_domain(url):
+    if not url:
+        return ""
+    if "//" not in url:
+        url = "//" + url
+    host = urlsplit(url.strip()).netloc.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def place_tokens(college):
+    """Places named in the location (state dropped) plus meta.district"""
+    parts = [p for p in (college.get("location") or "").split(",") if p.strip()]
+    if len(parts) > 1:
+        parts = parts[:-1]
+    meta = college.get("meta") if isinstance(college.get("meta"), dict) else {}
+    parts += [college.get("city") or "", college.get("district") or "", meta.get("district") or ""]
+    places = set()
+    for part in parts:
+        place = re.sub(r"\b(district|dist|city|urban|rural)\b", "", part.lower())
+        place = re.sub(r"[^a-z ]", "", place).strip()
+        if place:
+            places.add(place)
+    return places
+
+
+def shingles(text):
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set):
+    """One-permutation MinHash signature of NUM_PERM values
+
+    Each shingle is hashed once and kept as the minimum of one of
+    NUM_PERM bins, instead of hashing it NUM_PERM times; empty bins
+    borrow the next filled bin's value (rotation densification) so
+    similar sets still agree bin by bin.
+    """
+    signature = [None] * NUM_PERM
+    for shingle in shingle_set:
+        h = (_MIX_A * zlib.crc32(shingle.encode("utf-8")) + _MIX_B) % _PRIME
+        b, value = h % NUM_PERM, h // NUM_PERM
+        if signature[b] is None or value < signature[b]:
+            signature[b] = value
+    filled = [b for b in range(NUM_PERM) if signature[b] is not None]
+    if filled:
+        for b in range(NUM_PERM):
+            if signature[b] is None:
+                source = filled[bisect_left(filled, b) % len(filled)]
+                signature[b] = (signature[source], (source - b) % NUM_PERM)
+    return signature
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Entry:
+    """What the matcher needs of one record"""
+
+    __slots__ = ("file", "id", "name", "tokens", "norm", "shingles", "places", "place_words",
+                 "domain", "score_fields")
+
+    def __init__(self, file, college):
+        self.file = file
+        self.id = college.get("id")
+        self.name = college.get("name") or ""
+        self.tokens = name_tokens(self.name)
+        self.norm = " ".join(self.tokens)
+        self.shingles = shingles(self.norm)
+        self.places = place_tokens(college)
+        self.place_words = {word for place in self.places for word in place.split()}
+        self.domain = url_domain(college.get("officialUrl"))
+        self.score_fields = completeness(college)
+
+    def key(self):
+        return (self.file, self.id)
+
+    def summary(self):
+        return {"file": self.file, "id": self.id, "name": self.name,
+                "places": sorted(self.places), "domain": self.domain}
+
+
+def completeness(college):
+    """Rank records for survival: most courses, then most filled fields"""
+    courses = college.get("courses")
+    return (len(courses) if isinstance(courses, list) else 0,
+            sum(1 for value in college.values() if value not in (None, "", [], {})))
+
+
+def load_entries(models_dir):
+    return [Entry(path.name, college) for path, college in iter_models(models_dir)
+            if isinstance(college, dict) and college.get("id")]
+
+
+def candidate_pairs(entries):
+    """Index pairs sharing an exact block or an LSH bucket"""
+    blocks = defaultdict(list)
+    for i, entry in enumerate(entries):
+        if entry.norm:
+            blocks[("name", entry.norm)].append(i)
+        if entry.domain not in SHARED_DOMAINS:
+            blocks[("domain", entry.domain)].append(i)
+        if entry.shingles:
+            signature = minhash(entry.shingles)
+            for band in range(BANDS):
+                rows = tuple(signature[band * ROWS:(band + 1) * ROWS])
+                blocks[("lsh", band, rows)].append(i)
+
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > MAX_BUCKET:
+            # e.g. every "Government Polytechnic": only pair within a place
+            by_place = defaultdict(list)
+            for i in members:
+                for place in entries[i].places:
+                    by_place[place].append(i)
+            groups = [g for g in by_place.values() if len(g) <= MAX_BUCKET]
+        else:
+            groups = [members]
+        for group in groups:
+            pairs.update(combinations(sorted(group), 2))
+    return pairs
+
+
+def token_weights(entries):
+    """IDF weight per name token, so 'college' counts for little and 'pillay' for a lot"""
+    df = defaultdict(int)
+    for entry in entries:
+        for token in set(entry.tokens):
+            df[token] += 1
+    total = len(entries) or 1
+    return {token: math.log(total / count) + 1.0 for token, count in df.items()}
+
+
+@lru_cache(maxsize=None)
+def _token_shingles(token):
+    return shingles(token)
+
+
+def name_similarity(a_tokens, b_tokens, weights):
+    """IDF-weighted token Jaccard; near-identical spellings count as shared"""
+    a_only = set(a_tokens) - set(b_tokens)
+    b_only = set(b_tokens) - set(a_tokens)
+    shared = set(a_tokens) & set(b_tokens)
+    for token in sorted(a_only):
+        for other in sorted(b_only):
+            if jaccard(_token_shingles(token), _token_shingles(other)) >= FUZZY_TOKEN:
+                shared.add(token)
+                a_only.discard(token)
+                b_only.discard(other)
+                break
+    weight = lambda tokens: sum(weights.get(t, 1.0) for t in tokens)
+    common = weight(shared)
+    total = common + weight(a_only) + weight(b_only)
+    return common / total if total else 0.0
+
+
+def score_pair(a, b, weights):
+    """Similarity in [0, 1] and the reasons for it"""
+    same_domain = a.domain == b.domain and a.domain not in SHARED_DOMAINS
+    shared_places = a.places & b.places
+    places_known = bool(a.places and b.places)
+
+    if places_known and not shared_places:
+        # Same name (or shared university domain) in different cities is a different campus
+        return 0.0, []
+    # A city both records are in says nothing when it also appears in one name
+    place_words = {word for place in shared_places for word in place.split()}
+    a_named = {t for t in a.tokens if t in place_words}
+    b_named = {t for t in b.tokens if t in place_words}
+    if a_named and b_named and not a_named & b_named:
+        # "... Alwar" and "... Jaisalmer": the names point at different places
+        return 0.0, []
+    a_rest = [t for t in a.tokens if t not in place_words]
+    b_rest = [t for t in b.tokens if t not in place_words]
+    name_sim = name_similarity(a_rest, b_rest, weights)
+    reasons = [f"name {name_sim:.2f}"]
+    score = name_sim
+    if same_domain:
+        reasons.append("same domain")
+        score = min(1.0, score + 0.1)
+    if shared_places:
+        reasons.append("same place")
+    else:
+        score *= 0.9
+    if a_named != b_named and GENERIC_TOKENS.issuperset(a_rest + b_rest):
+        # "College of Engineering" vs "College of Engineering Jaipur": only a
+        # place told them apart, and it is not in both names
+        reasons.append("generic name")
+        score = min(score, GENERIC_SCORE_CAP)
+    return round(score, 3), reasons
+
+
+def find_duplicates(entries, min_score=0.8):
+    """Cluster likely duplicates; returns (clusters, stats)
+
+    Matching pairs are taken best first, and a pair joins its two clusters
+    only if every record of one matches every record of the other.
+    """
+    pairs = candidate_pairs(entries)
+    weights = token_weights(entries)
+    scores = {}
+
+    def scored(i, j):
+        i, j = min(i, j), max(i, j)
+        if (i, j) not in scores:
+            a, b = entries[i], entries[j]
+            scores[(i, j)] = (0.0, []) if a.key() == b.key() else score_pair(a, b, weights)
+        return scores[(i, j)]
+
+    matches = sorted((scored(i, j)[0], min(i, j), max(i, j)) for i, j in pairs)
+    matches = [(i, j) for score, i, j in reversed(matches) if score >= min_score]
+
+    cluster_of = {}
+    rejected = 0
+    for i, j in matches:
+        left, right = cluster_of.get(i, [i]), cluster_of.get(j, [j])
+        if left is right:
+            continue
+        if not all(scored(a, b)[0] >= min_score for a in left for b in right):
+            rejected += 1
+            continue
+        joined = left + right
+        for k in joined:
+            cluster_of[k] = joined
+
+    grouped = {id(cluster): cluster for cluster in cluster_of.values()}
+    clusters = []
+    for cluster in grouped.values():
+        links = [(i, j, *scored(i, j)) for i, j in combinations(sorted(cluster), 2)]
+        members = sorted(cluster, key=lambda i: entries[i].score_fields, reverse=True)
+        clusters.append({
+            "survivor": entries[members[0]].summary(),
+            "members": [entries[i].summary() for i in members],
+            "score": min(link[2] for link in links),
+            "pairs": [{"a": entries[i].id, "b": entries[j].id, "score": score, "reasons": reasons}
+                      for i, j, score, reasons in sorted(links, key=lambda link: -link[2])],
+        })
+    clusters.sort(key=lambda c: (-c["score"], c["survivor"]["name"]))
+    stats = {"records": len(entries), "candidatePairs": len(pairs), "matches": len(matches),
+             "rejectedLinks": rejected, "clusters": len(clusters)}
+    return clusters, stats
+
+
+def merge_records(survivor, duplicate):
+    """Fill the survivor's gaps from a duplicate; lists are unioned"""
+    for field, value in duplicate.items():
+        if field == "id":
+            continue
+        current = survivor.get(field)
+        if current in (None, "", [], {}):
+            survivor[field] = value
+        elif field == "courses" and isinstance(current, list) and isinstance(value, list):
+            names = {c.get("name") for c in current if isinstance(c, dict)}
+            current.extend(c for c in value if isinstance(c, dict) and c.get("name") not in names)
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(v for v in value if v not in current)
+    meta = survivor.setdefault("meta", {})
+    if isinstance(meta, dict):
+        merged = meta.setdefault("mergedIds", [])
+        if duplicate.get("id") not in merged:
+            merged.append(duplicate.get("id"))
+
+
+def merge_clusters(clusters, models_dir, min_score=MERGE_SCORE):
+    """Merge clusters scoring at least `min_score`; returns (clusters merged, records removed)"""
+    merged = removed = 0
+    with CollegeStore(models_dir) as store:
+        for cluster in clusters:
+            if cluster["score"] < min_score:
+                continue
+            target = cluster["survivor"]
+            survivor = store.open(target["file"]).edit(target["id"])
+            if survivor is None:
+                continue
+            for member in cluster["members"][1:]:
+                if member["file"] == target["file"] and member["id"] == target["id"]:
+                    continue
+                state_file = store.open(member["file"])
+                duplicate = state_file.get(member["id"])
+                if duplicate is None:
+                    continue
+                merge_records(survivor, duplicate)
+                state_file.remove(member["id"])
+                removed += 1
+                print(f"  ✓ Merged {member['id']} ({member['file']}) into {target['id']}")
+            merged += 1
+    return merged, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find (and optionally merge) duplicate colleges')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--report', default=str(REPORT_PATH), help='Where to write the merge report')
+    parser.add_argument('--min-score', type=float, default=0.8, help='Lowest similarity reported')
+    parser.add_argument('--merge', action='store_true', help='Merge clusters scoring at least --merge-score')
+    parser.add_argument('--merge-score', type=float, default=MERGE_SCORE, help='Lowest similarity merged')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = load_entries(args.models_dir)
+    clusters, stats = find_duplicates(entries, args.min_score)
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+
+    write_json_atomic(args.report, {"stats": stats, "clusters": clusters})
+    print(f"✓ {stats['records']} records, {stats['candidatePairs']} candidate pairs, "
+          f"{stats['clusters']} duplicate clusters in {stats['seconds']}s")
+    print(f"  Report written to {args.report}")
+
+    if args.merge:
+        merged, removed = merge_clusters(clusters, args.models_dir, args.merge_score)
+        print(f"\n✅ Merged {merged} clusters, removed {removed} duplicate records")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,20 @@
 Enrich College Data with Missing Fields
 ========================================
 Adds courses, cutoffs, placements, and recruiters to existing colleges.
+
+Every state file is enriched, including those that wrap their list in an
+object ({"colleges": [...]}); older versions skipped those as "Not an
+array". The wrapper and its other keys are written back unchanged.
 """
 
-import json
-from pathlib import Path
+import argparse
 
-BASE_DIR = Path(__file__).parent / "models"
+from college_store import MODELS_DIR, file_label, record_files
+from parallel import add_jobs_argument, map_files
+from record_stream import rewrite_records
+from run_manifest import RunManifest, add_full_argument
+from run_metrics import Progress, add_profile_argument, instrumented
+from sqlite_store import SqliteStore, add_backend_argument
 
 # Standard engineering courses
 STANDARD_COURSES = [
@@ -21,6 +29,9 @@ STANDARD_COURSES = [
     {"name": "Chemical Engineering", "degree": "B.Tech", "duration": "4 years", "exams": ["jee-main"]},
 ]
 
+# Tier assumed when rankingTier is missing, null or empty
+DEFAULT_TIER = "Tier 2"
+
 # Top recruiters by tier
 TOP_RECRUITERS_TIER_1 = [
     "Google", "Microsoft", "Amazon", "Apple", "Meta", "Netflix", "Adobe", "Salesforce",
@@ -87,13 +98,13 @@ def enrich_college(college):
     
     # Add recruiters if missing
     if not college.get("topRecruiters") or len(college.get("topRecruiters", [])) == 0:
-        tier = college.get("rankingTier", "Tier 2")
+        tier = college.get("rankingTier") or DEFAULT_TIER
         college["topRecruiters"] = get_recruiters_by_tier(tier)
         modified = True
     
     # Add placements if missing
     if not college.get("placements"):
-        tier = college.get("rankingTier", "Tier 2")
+        tier = college.get("rankingTier") or DEFAULT_TIER
         college["placements"] = get_placement_stats(tier)
         modified = True
     
@@ -113,7 +124,7 @@ def enrich_college(college):
     
     # Add tuition if missing
     if not college.get("tuition"):
-        ownership = college.get("meta", {}).get("ownership", "Private")
+        ownership = college.get("meta", {}).get("ownership") or "Private"
         if "Government" in ownership:
             college["tuition"] = "₹50,000 - 1,50,000 per year"
         else:
@@ -123,46 +134,72 @@ def enrich_college(college):
     return modified
 
 def process_state_file(state_file):
-    """Process a single state file"""
+    """Process a single state file; returns the number of colleges enriched (None on error)"""
     try:
-        with open(state_file, 'r', encoding='utf-8') as f:
-            colleges = json.load(f)
-        
-        if not isinstance(colleges, list):
-            print(f"  ⚠ {state_file.name}: Not an array")
-            return 0
-        
-        enriched_count = 0
-        for college in colleges:
-            if enrich_college(college):
-                enriched_count += 1
-        
-        # Save back
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(colleges, f, indent=2, ensure_ascii=False)
-        
-        return enriched_count
+        return rewrite_records(state_file, enrich_college)
     except Exception as e:
-        print(f"  ✗ {state_file.name}: {e}")
-        return 0
+        print(f"  ✗ {file_label(state_file)}: {e}")
+        return None
 
-def main():
-    """Main function"""
-    print("="*70)
-    print("ENRICHING COLLEGE DATA WITH MISSING FIELDS")
-    print("="*70)
-    
+def enrich_files(models_dir, jobs=1, full=False):
+    """Enrich every state file; returns the number of colleges enriched"""
     total_enriched = 0
     
-    for state_file in BASE_DIR.glob("*_Colleges.json"):
-        count = process_state_file(state_file)
+    state_files = record_files(models_dir)
+    
+    # Only files changed since the last run with the same enrichment rules
+    manifest = RunManifest("enrich_college_data", models_dir, inputs=(
+        STANDARD_COURSES, TOP_RECRUITERS_TIER_1, TOP_RECRUITERS_TIER_2, TOP_RECRUITERS_TIER_3,
+        get_recruiters_by_tier, get_placement_stats, enrich_college,
+    ))
+    pending = state_files if full else manifest.pending(state_files)
+    if len(pending) < len(state_files):
+        print(f"Skipping {len(state_files) - len(pending)} unchanged files")
+    
+    progress = Progress(len(pending), "files")
+    for state_file, count in map_files(process_state_file, pending, jobs):
+        progress.update()
+        if count is None:
+            continue
+        manifest.record(state_file)
         if count > 0:
-            print(f"  ✓ {state_file.name}: {count} colleges enriched")
+            print(f"  ✓ {file_label(state_file)}: {count} colleges enriched")
             total_enriched += count
+    manifest.save()
+    return total_enriched
+
+def enrich_sqlite(db):
+    """Enrich every college in the SQLite store in one transaction"""
+    total_enriched = 0
+    with SqliteStore(db) as store:
+        for filename, ids in store.rewrite(enrich_college).items():
+            print(f"  ✓ {filename}: {len(ids)} colleges enriched")
+            total_enriched += len(ids)
+    return total_enriched
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Enrich colleges with missing fields')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    add_jobs_argument(parser)
+    add_full_argument(parser)
+    add_backend_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
     
-    print("\n" + "="*70)
-    print(f"Total colleges enriched: {total_enriched}")
     print("="*70)
+    print("ENRICHING COLLEGE DATA WITH MISSING FIELDS")
+    print("="*70)
+    
+    with instrumented("enrich_college_data", args.profile):
+        if args.backend == "sqlite":
+            total_enriched = enrich_sqlite(args.db)
+        else:
+            total_enriched = enrich_files(args.models_dir, args.jobs, args.full)
+        
+        print("\n" + "="*70)
+        print(f"Total colleges enriched: {total_enriched}")
+        print("="*70)
 
 if __name__ == '__main__':
     main()
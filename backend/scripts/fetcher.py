@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Async Fetch Engine
+==================
+Concurrent, polite fetching for the official-source scraper.
+
+- One pooled keep-alive aiohttp session for the whole crawl
+- Per-host concurrency limits and token-bucket rate limits
+- Retries with exponential backoff (honouring Retry-After) on network
+  errors, 429 and 5xx responses
+- Optional on-disk response cache (http_cache.py) with conditional
+  revalidation and an offline replay mode
+- Pluggable per-source page parsers that turn a page into records and
+  further URLs to crawl
+
+A crawl of hundreds of paginated listing pages is then bounded by the
+per-host politeness budget rather than by round-trip latency.
+
+Usage:
+    @register_parser("aicte")
+    def parse_aicte(page):
+        return rows, next_urls
+
+    rows = asyncio.run(crawl(["https://..."], PARSERS["aicte"]))
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from html_tables import TableExtractor, iter_table_rows
+from http_cache import HttpCache
+
+USER_AGENT = "CEI-College-Scraper/1.0 (+https://github.com/Jainit-Soni/CEI)"
+
+# Politeness defaults per host; override per source via HostPolicy
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0          # requests per second
+DEFAULT_BURST = 4
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5       # seconds, doubled per attempt
+DEFAULT_TIMEOUT = 30
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class Page:
+    """A fetched page handed to parsers"""
+    url: str
+    status: int
+    headers: dict
+    body: bytes
+    from_cache: bool = False
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+
+@dataclass
+class HostPolicy:
+    concurrency: int = DEFAULT_CONCURRENCY
+    rate: float = DEFAULT_RATE
+    burst: int = DEFAULT_BURST
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FetchError(Exception):
+    """Raised when a URL still fails after every retry"""
+
+    def __init__(self, url, reason):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+@dataclass
+class _Host:
+    semaphore: asyncio.Semaphore
+    bucket: TokenBucket
+
+
+class Fetcher:
+    """Pooled async HTTP client with per-host limits
+
+    Use as an async context manager so the connection pool is closed.
+    With a `cache`, 200 responses are stored and later requests for the
+    same URL are revalidated; `offline=True` serves only from the cache.
+    """
+
+    def __init__(self, policies=None, default_policy=None, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT, cache=None, offline=False):
+        if offline and cache is None:
+            raise ValueError("offline mode needs a cache")
+        self.cache = cache
+        self.offline = offline
+        self.policies = policies or {}
+        self.default_policy = default_policy or HostPolicy()
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = None
+        self._hosts = {}
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "cacheHits": 0, "notModified": 0}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT},
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            policy = self.policies.get(host, self.default_policy)
+            state = _Host(asyncio.Semaphore(policy.concurrency), TokenBucket(policy.rate, policy.burst))
+            self._hosts[host] = state
+        return state
+
+    async def _request(self, url, headers):
+        """One HTTP round trip under the host's limits"""
+        host = self._host(url)
+        async with host.semaphore:
+            await host.bucket.acquire()
+            self.stats["requests"] += 1
+            async with self.session.get(url, headers=headers) as resp:
+                body = await resp.read()
+                return Page(str(resp.url), resp.status, CIMultiDict(resp.headers), body)
+
+    def _retry_delay(self, attempt, page=None):
+        if page is not None:
+            retry_after = page.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _cached_page(self, entry):
+        return Page(entry["finalUrl"], entry["status"], CIMultiDict(entry["headers"]),
+                    self.cache.body(entry), from_cache=True)
+
+    async def fetch(self, url, headers=None):
+        """Fetch `url` through the cache, if any; returns a Page
+
+        Non-retryable HTTP errors (e.g. 404) are returned as pages, not
+        raised, so parsers can decide what they mean.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            self.stats["cacheHits"] += 1
+            return self._cached_page(entry)
+        if self.offline:
+            self.stats["failures"] += 1
+            raise FetchError(url, "not in cache (offline)")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(HttpCache.conditional_headers(entry))
+        page = await self._fetch_network(url, request_headers)
+
+        if entry is not None and page.status == 304:
+            self.stats["notModified"] += 1
+            self.cache.touch(url, entry, page.headers)
+            return self._cached_page(entry)
+        if self.cache is not None and page.status == 200:
+            self.cache.store(url, page.status, page.headers, page.body, page.url)
+        return page
+
+    async def _fetch_network(self, url, headers):
+        """Request `url`, retrying transient failures"""
+        last_error = None
+        for attempt in range(self.retries + 1):
+            page = None
+            try:
+                page = await self._request(url, headers)
+                if page.status not in RETRY_STATUSES:
+                    return page
+                last_error = f"HTTP {page.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = repr(e)
+            if attempt < self.retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._retry_delay(attempt, page))
+        self.stats["failures"] += 1
+        raise FetchError(url, last_error)
+
+
+# -- parsers ---------------------------------------------------------------
+
+PARSERS = {}
+
+
+def register_parser(source, parser=None):
+    """Register `parser(page) -> (records, next_urls)` for a source key"""
+    if parser is None:
+        return lambda func: register_parser(source, func)
+    PARSERS[source] = parser
+    return parser
+
+
+@register_parser("table")
+def parse_html_tables(page):
+    """Generic parser: rows of every HTML table plus rel=next / 'Next' pagination links
+
+    Uses the streaming extractor so even a very large listing page is
+    parsed without building a document tree.
+    """
+    extractor = TableExtractor(page.url)
+    records = list(iter_table_rows(page.body, extractor=extractor))
+    return records, extractor.next_urls
+
+
+# -- crawling --------------------------------------------------------------
+
+@dataclass
+class CrawlResult:
+    records: list = field(default_factory=list)
+    pages: int = 0
+    failed: list = field(default_factory=list)
+
+
+async def crawl(start_urls, parser, fetcher=None, workers=8, max_pages=None, on_records=None,
+                checkpoint=None):
+    """Breadth-first crawl from `start_urls`, following the URLs the parser returns
+
+    Each URL is fetched once. `on_records(page, records)` is called as
+    pages are parsed so callers can stream records onward; all records
+    are also collected in the returned CrawlResult.
+
+    With a `checkpoint` (crawl_checkpoint.CrawlCheckpoint) the frontier,
+    finished pages and emitted records are persisted as the crawl goes.
+    Pages finished in an earlier run are not fetched again, and records
+    already emitted are not passed on a second time.
+    """
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = Fetcher()
+        await fetcher.__aenter__()
+
+    result = CrawlResult()
+    queue = asyncio.Queue()
+    seen = set()
+    scheduled = 0
+
+    def schedule(url):
+        nonlocal scheduled
+        if url in seen or (max_pages is not None and scheduled >= max_pages):
+            return
+        seen.add(url)
+        scheduled += 1
+        queue.put_nowait(url)
+
+    async def worker():
+        while True:
+            url = await queue.get()
+            try:
+                page = await fetcher.fetch(url)
+                records, next_urls = parser(page)
+                if checkpoint is not None:
+                    records = checkpoint.complete(url, records, next_urls)
+                result.pages += 1
+                result.records.extend(records)
+                if on_records is not None:
+                    on_records(page, records)
+                for next_url in next_urls:
+                    schedule(next_url)
+            except Exception as e:
+                # A parser bug on one page must not stall the whole crawl
+                url, reason = (e.url, e.reason) if isinstance(e, FetchError) else (url, repr(e))
+                result.failed.append((url, reason))
+                if checkpoint is not None:
+                    checkpoint.fail(url, reason)
+            finally:
+                queue.task_done()
+
+    if checkpoint is not None:
+        checkpoint.add_urls(start_urls)
+        unfinished = checkpoint.unfinished_urls()
+        seen.update(checkpoint.known_urls() - set(unfinished))
+        start_urls = unfinished
+    for url in start_urls:
+        schedule(url)
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        await queue.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_fetcher:
+            await fetcher.__aexit__(None, None, None)
+    return result
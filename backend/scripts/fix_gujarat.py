@@ -1,7 +1,5 @@
 
-import json
-import os
-from pathlib import Path
+from college_store import load_state_file, write_state_atomic
 
 PLACEMENT_DATA = {
     "iim-ahm": {
@@ -15,8 +13,7 @@ file_path = r"e:\CMAT-PROBLEM\backend\models\Gujarat_Colleges.json"
 
 print(f"Reading {file_path}...")
 try:
-    with open(file_path, 'r', encoding='utf-8') as f:
-        colleges = json.load(f)
+    container, colleges = load_state_file(file_path)
     print(f"Loaded {len(colleges)} colleges.")
     
     found = False
@@ -32,8 +29,7 @@ try:
                 found = True
                 
     if found:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(colleges, f, indent=2, ensure_ascii=False)
+        write_state_atomic(file_path, container)
         print("Detailed verification: File written successfully.")
     else:
         print("Did not find 'iim-ahm' in file.")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML Table Extractor
+==============================
+Event-based table parsing for very large institution listings.
+
+Building a BeautifulSoup tree for a full AICTE "approved institutions"
+export holds every tag of the page in memory at once. This extractor
+feeds the page to html.parser in chunks and emits each table row as a
+dict as soon as its </tr> is seen, so memory is bounded by one row and
+rows can be imported while the rest of the page is still being parsed.
+
+Rows use the column names import_from_csv reads (name, city, district,
+state, ownership, officialUrl); other headers are kept as written.
+
+Usage:
+    python html_tables.py aicte_export.html --output aicte.csv
+
+    with open("aicte_export.html", "rb") as f:
+        for row in iter_table_rows(f):
+            ...
+"""
+
+import argparse
+import codecs
+import csv
+import sys
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+CHUNK_SIZE = 64 * 1024
+
+HEADER_ALIASES = {
+    "name": ("name of the institute", "institute name", "college name", "institution name", "name"),
+    "city": ("city", "town", "place"),
+    "district": ("district",),
+    "state": ("state", "state/ut", "state / ut"),
+    "ownership": ("ownership", "type", "institution type", "management"),
+    "officialUrl": ("website", "url", "web site"),
+}
+
+NEXT_LINK_TEXT = ("next", "next »", "»")
+
+
+def header_key(text):
+    """Map a table header to the column names import_from_csv reads"""
+    words = text.strip().lower()
+    for key, names in HEADER_ALIASES.items():
+        if words in names:
+            return key
+    return text.strip()
+
+
+class _Table:
+    def __init__(self):
+        self.headers = None
+        self.row = None
+        self.cell = None
+
+
+def _squash(parts):
+    """Text pieces joined, with runs of whitespace collapsed to one space"""
+    return " ".join("".join(parts).split())
+
+
+class TableExtractor(HTMLParser):
+    """Incremental parser collecting table rows and pagination links
+
+    Call feed() with text chunks and drain completed rows with
+    pop_rows(). Each table's first row is its header row; cells of
+    nested tables belong to the inner table only.
+    """
+
+    def __init__(self, base_url=""):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.next_urls = []
+        self._rows = []
+        self._tables = []
+        self._link = None
+
+    def pop_rows(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._tables.append(_Table())
+        elif tag == "a":
+            attrs = dict(attrs)
+            if attrs.get("href"):
+                self._link = {"href": attrs["href"], "rel": (attrs.get("rel") or "").split(), "text": []}
+        elif tag == "br":
+            self.handle_data(" ")
+        elif self._tables:
+            table = self._tables[-1]
+            if tag == "tr":
+                self._end_row(table)
+                table.row = []
+            elif tag in ("td", "th"):
+                self._end_cell(table)
+                if table.row is None:
+                    table.row = []
+                table.cell = []
+
+    def handle_endtag(self, tag):
+        if tag == "table":
+            if self._tables:
+                self._end_row(self._tables.pop())
+        elif tag == "a":
+            self._end_link()
+        elif self._tables:
+            table = self._tables[-1]
+            if tag == "tr":
+                self._end_row(table)
+            elif tag in ("td", "th"):
+                self._end_cell(table)
+
+    def handle_data(self, data):
+        # Kept raw: a word can arrive in pieces (split across feed() chunks
+        # or inline tags), so whitespace is normalized once the cell ends
+        if self._link is not None:
+            self._link["text"].append(data)
+        if self._tables and self._tables[-1].cell is not None:
+            self._tables[-1].cell.append(data)
+
+    def close(self):
+        super().close()
+        self._end_link()
+        while self._tables:
+            self._end_row(self._tables.pop())
+
+    def _end_cell(self, table):
+        if table.cell is not None:
+            table.row.append(_squash(table.cell))
+            table.cell = None
+
+    def _end_row(self, table):
+        self._end_cell(table)
+        row, table.row = table.row, None
+        if not row:
+            return
+        if table.headers is None:
+            table.headers = [header_key(cell) for cell in row]
+        elif any(row):
+            self._rows.append(dict(zip(table.headers, row)))
+
+    def _end_link(self):
+        link, self._link = self._link, None
+        if link is None:
+            return
+        if "next" in link["rel"] or _squash(link["text"]).lower() in NEXT_LINK_TEXT:
+            self.next_urls.append(urljoin(self.base_url, link["href"]))
+
+
+def iter_table_rows(source, base_url="", extractor=None, encoding="utf-8"):
+    """Yield row dicts from `source` as they are parsed
+
+    `source` is bytes, a binary file object or an iterable of byte
+    chunks. Pass an `extractor` to read its next_urls afterwards.
+    """
+    extractor = extractor or TableExtractor(base_url)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    if isinstance(source, (bytes, bytearray)):
+        view = memoryview(source)
+        chunks = (view[i:i + CHUNK_SIZE] for i in range(0, len(view), CHUNK_SIZE))
+    elif hasattr(source, "read"):
+        chunks = iter(lambda: source.read(CHUNK_SIZE), b"")
+    else:
+        chunks = source
+
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        yield from extractor.pop_rows()
+    extractor.feed(decoder.decode(b"", final=True))
+    extractor.close()
+    yield from extractor.pop_rows()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract table rows from a (large) HTML listing')
+    parser.add_argument('html', help='Saved HTML page')
+    parser.add_argument('--output', '-o', help='CSV file to write (default: stdout)')
+    args = parser.parse_args()
+
+    with open(args.html, 'rb') as f:
+        rows = iter_table_rows(f)
+        first = next(rows, None)
+        if first is None:
+            print("⚠ No table rows found", file=sys.stderr)
+            return
+        # Headers come from the first row; later tables with other columns keep the known ones
+        out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        try:
+            writer = csv.DictWriter(out, fieldnames=list(first), extrasaction='ignore')
+            writer.writeheader()
+            writer.writerow(first)
+            count = 1
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    print(f"✓ Extracted {count} rows", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
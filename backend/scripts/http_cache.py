@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache
+===================
+On-disk cache of scraped pages for the fetch engine.
+
+Bodies are stored once under their SHA-256 (identical pages served from
+different URLs share a file); a small index entry per URL records the
+status, validators (ETag / Last-Modified) and which body to use.
+
+- Online: cached URLs are revalidated with If-None-Match /
+  If-Modified-Since, so an unchanged page costs a 304 and no body
+- max_age: entries younger than this are used without any request
+- Offline: pages are replayed from the cache only and uncached URLs
+  fail, so parsers can be iterated on without touching the network
+
+Layout (scripts/.http_cache/):
+    index/<sha1(url)>.json
+    bodies/<sha256[:2]>/<sha256>
+
+Usage:
+    async with Fetcher(cache=HttpCache(), offline=True) as fetcher:
+        page = await fetcher.fetch(url)
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from college_store import write_bytes_atomic, write_json_atomic
+from json_codec import loads
+
+CACHE_DIR = Path(__file__).resolve().parent / ".http_cache"
+
+# Response headers kept with an entry (parsers only need these). Not
+# Content-Encoding: bodies are stored already decoded
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class HttpCache:
+    """Content-addressed response store keyed by URL"""
+
+    def __init__(self, path=CACHE_DIR, max_age=None):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.index_dir = self.path / "index"
+        self.body_dir = self.path / "bodies"
+
+    def _index_path(self, url):
+        return self.index_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def _body_path(self, digest):
+        return self.body_dir / digest[:2] / digest
+
+    def get(self, url):
+        """Return the index entry for `url`, or None if missing or its body is gone"""
+        try:
+            entry = loads(self._index_path(url).read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry.get("url") != url or not self._body_path(entry["sha256"]).exists():
+            return None
+        return entry
+
+    def body(self, entry):
+        return self._body_path(entry["sha256"]).read_bytes()
+
+    def is_fresh(self, entry):
+        """True if the entry is young enough to use without revalidating"""
+        return self.max_age is not None and time.time() - entry["checkedAt"] < self.max_age
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def store(self, url, status, headers, body, final_url=None):
+        """Save a response; returns the new index entry
+
+        `headers` should be case-insensitive (aiohttp's CIMultiDict) as
+        servers vary in how they spell ETag.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        if not body_path.exists():
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomic(body_path, body)
+
+        now = time.time()
+        entry = {
+            "url": url,
+            "finalUrl": final_url or url,
+            "status": status,
+            "headers": {name: headers[name] for name in KEPT_HEADERS if name in headers},
+            "etag": headers.get("ETag"),
+            "lastModified": headers.get("Last-Modified"),
+            "sha256": digest,
+            "size": len(body),
+            "fetchedAt": now,
+            "checkedAt": now,
+        }
+        self._write_entry(url, entry)
+        return entry
+
+    def touch(self, url, entry, headers=None):
+        """Record a successful revalidation (304), picking up refreshed validators"""
+        headers = headers or {}
+        entry["checkedAt"] = time.time()
+        entry["etag"] = headers.get("ETag", entry.get("etag"))
+        entry["lastModified"] = headers.get("Last-Modified", entry.get("lastModified"))
+        self._write_entry(url, entry)
+        return entry
+
+    def _write_entry(self, url, entry):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self._index_path(url), entry)
+
+    def prune(self):
+        """Delete bodies no index entry points at; returns the number removed"""
+        referenced = set()
+        for index_path in self.index_dir.glob("*.json"):
+            try:
+                referenced.add(loads(index_path.read_bytes())["sha256"])
+            except (json.JSONDecodeError, KeyError):
+                index_path.unlink(missing_ok=True)
+        removed = 0
+        for body_path in self.body_dir.glob("*/*"):
+            if body_path.name not in referenced:
+                body_path.unlink(missing_ok=True)
+                removed += 1
+        return removed
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Global College Id Index
+=======================
+On-disk index of id -> (state file, record position, content hash) for
+every *_Colleges.json in a models directory.
+
+Importers used to check for an existing id by parsing one state file,
+so an id already present in another state (or in Tier2_Colleges.json)
+went unnoticed. With the index an existence check is a dict lookup
+across all files, and tools can open only the file that holds an id.
+
+The index stores each file's size and mtime (for a sharded state, the
+total size and newest mtime of its shards); on load any file that has
+changed since is re-read (only that file), so the index is never
+trusted for a file it has not seen in its current state. CollegeStore
+updates the entries of the files it writes on commit.
+
+Stored as <models>/.id_index.json.
+
+Usage:
+    python id_index.py                 # refresh and print stats
+    python id_index.py --lookup iim-ahm
+    python id_index.py --rebuild
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from college_store import MODELS_DIR, record_hash, state_paths, state_stamp, write_json_atomic
+from json_codec import loads
+from record_stream import iter_records
+
+INDEX_NAME = ".id_index.json"
+INDEX_FORMAT_VERSION = 1
+
+
+class IdIndex:
+    """id -> [(file name, position, hash), ...] for all state files
+
+    An id can appear in several files (e.g. a state file and
+    Tier2_Colleges.json), so every location is kept.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, path=None, refresh=True):
+        self.models_dir = Path(models_dir)
+        self.path = Path(path) if path else self.models_dir / INDEX_NAME
+        self.files = {}
+        self.ids = {}
+        self.dirty = False
+        try:
+            data = loads(self.path.read_bytes())
+            if data.get("formatVersion") == INDEX_FORMAT_VERSION:
+                self.files = data.get("files", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        if refresh:
+            self.refresh()
+        else:
+            self._build_ids()
+
+    def _build_ids(self):
+        self.ids = {}
+        for filename in sorted(self.files):
+            for position, (college_id, digest) in enumerate(self.files[filename]["records"]):
+                if college_id:
+                    self.ids.setdefault(college_id, []).append((filename, position, digest))
+
+    def refresh(self):
+        """Re-read files that changed since they were indexed; returns their names"""
+        paths = {path.name: path for path in state_paths(self.models_dir)}
+        stale = []
+        for filename in list(self.files):
+            if filename not in paths:
+                del self.files[filename]
+                stale.append(filename)
+        for filename, path in sorted(paths.items()):
+            entry = self.files.get(filename)
+            size, mtime = state_stamp(path)
+            if entry is None or entry["size"] != size or entry["mtimeNs"] != mtime:
+                try:
+                    records = [[c.get("id") if isinstance(c, dict) else None, record_hash(c)]
+                               for c in iter_records(path)]
+                except ValueError as e:
+                    print(f"  ⚠ Not indexing {filename}: {e}")
+                    self.files.pop(filename, None)
+                    continue
+                self._set(filename, path, records)
+                stale.append(filename)
+        if stale:
+            self.dirty = True
+        self._build_ids()
+        return stale
+
+    def _set(self, filename, path, records):
+        size, mtime = state_stamp(path)
+        self.files[filename] = {"size": size, "mtimeNs": mtime, "records": records}
+
+    def update_file(self, state_file):
+        """Re-index a StateFile that was just written"""
+        records = [[c.get("id") if isinstance(c, dict) else None, record_hash(c)]
+                   for c in state_file.colleges]
+        self._set(state_file.path.name, state_file.path, records)
+        self.dirty = True
+        self._build_ids()
+
+    def __contains__(self, college_id):
+        return college_id in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def locate(self, college_id):
+        """All (file name, position, hash) entries for an id"""
+        return self.ids.get(college_id, [])
+
+    def file_of(self, college_id):
+        locations = self.ids.get(college_id)
+        return locations[0][0] if locations else None
+
+    def duplicates(self):
+        """Ids stored more than once, with their locations"""
+        return {college_id: locs for college_id, locs in self.ids.items() if len(locs) > 1}
+
+    def save(self, force=False):
+        if not (self.dirty or force):
+            return
+        data = {"formatVersion": INDEX_FORMAT_VERSION, "files": self.files}
+        write_json_atomic(self.path, data, pretty=False)
+        self.dirty = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the global college id index')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--rebuild', action='store_true', help='Discard the index and re-read every file')
+    parser.add_argument('--lookup', nargs='+', metavar='ID', help='Print where these ids are stored')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        Path(args.models_dir, INDEX_NAME).unlink(missing_ok=True)
+    index = IdIndex(args.models_dir)
+    index.save()
+
+    if args.lookup:
+        for college_id in args.lookup:
+            locations = index.locate(college_id)
+            if not locations:
+                print(f"  ✗ {college_id}: not found")
+            for filename, position, digest in locations:
+                print(f"  ✓ {college_id}: {filename} #{position} ({digest[:12]})")
+        return
+
+    duplicates = index.duplicates()
+    print(f"✓ {len(index)} ids in {len(index.files)} files ({index.path})")
+    if duplicates:
+        print(f"  ⚠ {len(duplicates)} ids appear in more than one file")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+JSON Codec
+==========
+The one JSON serializer the data scripts write model files with.
+
+- Backend: orjson when it is installed (several times faster than the
+  json module for indent=2 output), else the standard json module. Both
+  produce the same text, except that floats in exponent form are written
+  1e16 vs 1e+16 (college data has none). Set JSON_BACKEND=json (or call
+  set_backend) to force one.
+- Key order: canonical (sorted at every level) unless sort_keys=False,
+  so a file's bytes depend only on its content and diffs stay stable.
+- Encoding: read UTF-8 with or without a BOM; write UTF-8 without one.
+  Files written by college_store end in a newline.
+- Modes: pretty (2-space indent) and compact (no whitespace).
+
+canonical() is the compact, sorted form used for content hashes.
+
+Usage:
+    text = dumps(colleges)                       # pretty, canonical
+    data = dumps_bytes(value, pretty=False)      # compact
+    value = loads(path.read_bytes())             # BOM stripped
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+BOM = "\ufeff"
+
+
+def _json_dumps(value, pretty, sort_keys):
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    return json.dumps(value, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def _json_dumps_bytes(value, pretty, sort_keys):
+    return _json_dumps(value, pretty, sort_keys).encode("utf-8")
+
+
+def _orjson_dumps_bytes(value, pretty, sort_keys):
+    option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    try:
+        return orjson.dumps(value, option=option)
+    except TypeError:
+        # Values orjson refuses (integers over 64 bits, non-string keys) go
+        # through the json module, which handles them the usual way
+        return _json_dumps_bytes(value, pretty, sort_keys)
+
+
+def _orjson_dumps(value, pretty, sort_keys):
+    return _orjson_dumps_bytes(value, pretty, sort_keys).decode("utf-8")
+
+
+BACKENDS = {"json": (_json_dumps, _json_dumps_bytes, json.loads)}
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+    BACKENDS["orjson"] = (_orjson_dumps, _orjson_dumps_bytes, orjson.loads)
+
+_backend = None
+
+
+def set_backend(name):
+    """Use the named backend ("orjson" or "json") from now on"""
+    global _backend, _dumps, _dumps_bytes, _loads
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not available (have: {', '.join(BACKENDS)})")
+    _backend = name
+    _dumps, _dumps_bytes, _loads = BACKENDS[name]
+
+
+def backend():
+    return _backend
+
+
+set_backend(os.environ.get("JSON_BACKEND") or ("orjson" if orjson is not None else "json"))
+
+
+def dumps(value, pretty=True, sort_keys=True):
+    """`value` as JSON text (non-ASCII kept as is)"""
+    return _dumps(value, pretty, sort_keys)
+
+
+def dumps_bytes(value, pretty=True, sort_keys=True):
+    """`value` as UTF-8 encoded JSON"""
+    return _dumps_bytes(value, pretty, sort_keys)
+
+
+def canonical(value):
+    """Compact, sorted serialization that is equal for equal content"""
+    return _dumps(value, False, True)
+
+
+def loads(data):
+    """Parse JSON text or bytes, ignoring a leading UTF-8 BOM"""
+    if isinstance(data, (bytes, bytearray)):
+        if data[:3] == b"\xef\xbb\xbf":
+            data = data[3:]
+    elif data[:1] == BOM:
+        data = data[1:]
+    return _loads(data)
+
+
+def indented(value, level):
+    """dumps(value) shifted right by `level` indents, for embedding in a pretty document"""
+    pad = "  " * level
+    return pad + dumps(value).replace("\n", "\n" + pad)
@@ -4,14 +4,17 @@ Mass Add Real Colleges - Direct JSON Import
 ============================================
 Adds thousands of verified real colleges directly to state JSON files.
 Sources: NIRF, TNEA, ACPC, DTE, KEA, and other official admission committees.
+
+Run: python mass_add_real_colleges.py [--backend sqlite] [--profile]
 """
 
-import json
-import os
-from pathlib import Path
+import argparse
 import re
 
-BASE_DIR = Path(__file__).parent / "models"
+from college_schema import validate
+from college_store import MODELS_DIR
+from run_metrics import Progress, add_profile_argument, instrumented
+from sqlite_store import add_backend_argument, open_store
 
 def generate_id(name, city):
     """Generate unique college ID"""
@@ -21,23 +24,6 @@ def generate_id(name, city):
     city_str = re.sub(r'[-\s]+', '-', city_str)
     return f"{id_str[:30]}-{city_str[:15]}"
 
-def load_state_colleges(state_name):
-    """Load existing colleges from state file"""
-    filename = f"{state_name.replace(' ', '_')}_Colleges.json"
-    filepath = BASE_DIR / filename
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-def save_state_colleges(state_name, colleges):
-    """Save colleges to state file"""
-    filename = f"{state_name.replace(' ', '_')}_Colleges.json"
-    filepath = BASE_DIR / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(colleges, f, indent=2, ensure_ascii=False)
-
 def create_college_object(name, city, district, state, tier="Tier 2", exams=None, ownership="Private"):
     """Create a college object in the correct format"""
     if exams is None:
@@ -375,61 +361,66 @@ MAHARASHTRA_COLLEGES = [
     ("Smt. Kashibai Navale College of Engineering and Leadership Studies", "Pune", "Pune", "Tier 2", ["mht-cet"], "Private"),
 ]
 
-def add_colleges_to_state(colleges_list, state_name):
-    """Add colleges to a specific state"""
+def add_colleges_to_state(colleges_list, state_name, store):
+    """Add colleges to a specific state; the caller commits the store"""
     print(f"\nAdding colleges to {state_name}...")
     
-    # Load existing colleges
-    existing_colleges = load_state_colleges(state_name)
-    existing_ids = {c['id'] for c in existing_colleges}
+    state_file = store.state(state_name)
     
     added = 0
     skipped = 0
+    progress = Progress(len(colleges_list), "colleges")
     
     for college_data in colleges_list:
+        progress.update()
         name, city, district, tier, exams = college_data[:5]
         ownership = college_data[5] if len(college_data) > 5 else "Private"
         
         # Generate ID
         college_id = generate_id(name, city)
         
-        # Skip if already exists
-        if college_id in existing_ids:
+        # Skip if already exists in any state file
+        if store.exists(college_id):
             skipped += 1
             continue
         
         # Create college object
         college = create_college_object(name, city, district, state_name, tier, exams, ownership)
         
-        # Add to list
-        existing_colleges.append(college)
-        existing_ids.add(college_id)
-        added += 1
+        errors = validate(college)
+        if errors:
+            print(f"  ⚠ Skipping invalid college '{name}': {errors[0][0]} {errors[0][1]}")
+            skipped += 1
+            continue
         
-        if added % 10 == 0:
-            print(f"  Added {added} colleges...")
-    
-    # Save back to file
-    save_state_colleges(state_name, existing_colleges)
+        state_file.add(college)
+        added += 1
     
-    print(f"  ✓ {state_name}: {added} added, {skipped} skipped (Total: {len(existing_colleges)})")
+    print(f"  ✓ {state_name}: {added} added, {skipped} skipped (Total: {len(state_file)})")
     return added
 
 def main():
     """Main function to add all colleges"""
+    parser = argparse.ArgumentParser(description='Add the built-in Tamil Nadu and Maharashtra college lists')
+    add_backend_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    
     print("="*70)
     print("MASS ADDING REAL COLLEGES TO DATABASE")
     print("="*70)
     
     total_added = 0
     
-    # Add Tamil Nadu colleges
-    tn_added = add_colleges_to_state(TAMIL_NADU_COLLEGES, "Tamil Nadu")
-    total_added += tn_added
-    
-    # Add Maharashtra colleges
-    mh_added = add_colleges_to_state(MAHARASHTRA_COLLEGES, "Maharashtra")
-    total_added += mh_added
+    with instrumented("mass_add_real_colleges", args.profile), \
+            open_store(args.backend, MODELS_DIR, args.db, validator=validate) as store:
+        # Add Tamil Nadu colleges
+        tn_added = add_colleges_to_state(TAMIL_NADU_COLLEGES, "Tamil Nadu", store)
+        total_added += tn_added
+        
+        # Add Maharashtra colleges
+        mh_added = add_colleges_to_state(MAHARASHTRA_COLLEGES, "Maharashtra", store)
+        total_added += mh_added
     
     print("\n" + "="*70)
     print("SUMMARY")
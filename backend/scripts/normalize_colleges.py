@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Normalize Repeated Values
+=========================
+Hoists list and object values that many records repeat verbatim (the
+standard course list, tier recruiter lists, placement blocks written by
+the enrichers) into models/shared_values.json, and replaces each copy in
+the state files with a reference:
+
+    "topRecruiters": {"$shared": "3f2a9c0e1b7d4a55"}
+
+Keys are a hash of the value's content, so a key always stands for the
+same value. Everything that reads the state files through
+college_store / record_stream (and services/dataStore.js) expands the
+references again, so scripts and the server see complete records;
+writers through the same modules keep the files normalized.
+
+(models/shared_lists.json is unrelated: it holds the lists users share
+from the app.)
+
+Scripts that parse the state files directly do not know about
+references; run with --expand before using them.
+
+Usage:
+    python normalize_colleges.py                  # hoist values repeated 3+ times
+    python normalize_colleges.py --min-count 5 --min-bytes 128
+    python normalize_colleges.py --expand         # restore plain state files
+"""
+
+import argparse
+from pathlib import Path
+
+from college_store import (
+    MODELS_DIR, SHARED_VALUES_NAME, SharedValues, canonical_json, record_files, write_json_atomic,
+)
+from record_stream import RecordReader, RecordWriter, iter_records
+
+SHARED_FORMAT_VERSION = 1
+
+
+def count_values(paths):
+    """Canonical text -> [count, first value seen], for top-level lists/objects
+
+    The first value is kept as written so shared values keep the key
+    order of the records they came from.
+    """
+    counts = {}
+    for path in paths:
+        for college in iter_records(path):
+            if not isinstance(college, dict):
+                continue
+            for value in college.values():
+                if isinstance(value, (list, dict)) and value:
+                    entry = counts.setdefault(canonical_json(value), [0, value])
+                    entry[0] += 1
+    return counts
+
+
+def select_values(counts, min_count, min_bytes):
+    """{key: value} for values repeated at least `min_count` times and worth a reference"""
+    selected = {}
+    for text, (count, value) in counts.items():
+        if count >= min_count and len(text.encode("utf-8")) >= min_bytes:
+            selected[SharedValues.key_for(value)] = value
+    return selected
+
+
+def write_table(models_dir, values):
+    write_json_atomic(Path(models_dir) / SHARED_VALUES_NAME,
+                      {"formatVersion": SHARED_FORMAT_VERSION, "values": values})
+
+
+def rewrite_file(path, shared):
+    """Rewrite one state file with `shared` references (None = fully expanded)"""
+    reader = RecordReader(path)
+    with RecordWriter(path, compress=False) as writer:
+        writer.shared = shared
+        for college in reader:
+            writer.wrapper = reader.wrapper
+            writer.write(college)
+        writer.wrapper = reader.wrapper
+        writer.extra = reader.extra
+
+
+def normalize(models_dir=MODELS_DIR, min_count=3, min_bytes=64, expand=False):
+    """Rewrite every state file; returns (bytes before, bytes after, values shared)"""
+    models_dir = Path(models_dir)
+    paths = record_files(models_dir)
+    table_path = models_dir / SHARED_VALUES_NAME
+    before = sum(p.stat().st_size for p in paths) + (table_path.stat().st_size if table_path.exists() else 0)
+
+    if expand:
+        values = {}
+    else:
+        values = select_values(count_values(paths), min_count, min_bytes)
+        # Old and new values together while files are rewritten, so every
+        # reference on disk stays resolvable if the run is interrupted
+        current = SharedValues.for_models(models_dir)
+        write_table(models_dir, {**(current.values if current else {}), **values})
+
+    shared = SharedValues(values) if values else None
+    for path in paths:
+        rewrite_file(path, shared)
+
+    if values:
+        write_table(models_dir, values)
+    else:
+        table_path.unlink(missing_ok=True)
+
+    after = sum(p.stat().st_size for p in paths) + (table_path.stat().st_size if table_path.exists() else 0)
+    return before, after, len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hoist repeated values out of the state files')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--min-count', type=int, default=3, help='Share values repeated at least this often')
+    parser.add_argument('--min-bytes', type=int, default=64, help='Share values at least this long (serialized)')
+    parser.add_argument('--expand', action='store_true', help='Write every record in full and remove the table')
+    args = parser.parse_args()
+
+    before, after, shared = normalize(args.models_dir, args.min_count, args.min_bytes, args.expand)
+
+    print("=" * 70)
+    if args.expand:
+        print("✓ Expanded all state files")
+    else:
+        print(f"✓ {shared} shared values in {SHARED_VALUES_NAME}")
+    print(f"  - Size: {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+College Enrichment Pipeline
+===========================
+Applies every enrichment step in a single read and write per state file.
+
+Running add_placement_data.py, update_cutoffs.py and
+enrich_college_data.py one after another parses and rewrites the whole
+dataset three times. Here each step is a registered per-record stage and
+all stages run back to back on every record while the file is streamed.
+
+A stage is a function `transform(college)` that edits the record in
+place. Like rewrite_records, the per-stage counts compare content hashes
+before and after each stage, so a stage that rewrites a field with the
+same value (or returns True without changing anything) counts nothing:
+
+    @register_stage("my-stage")
+    def my_stage(college):
+        ...
+
+With --backend sqlite the stages run over the SQLite store
+(sqlite_store.py) in one transaction instead.
+
+Run: python pipeline.py [--stages placements,cutoffs,enrich] [--jobs 4] [--profile]
+"""
+
+import argparse
+import time
+from functools import partial
+
+import enrich_college_data
+from add_placement_data import PLACEMENT_DATA, apply_placements
+from college_store import MODELS_DIR, file_label, record_files, record_hash, write_change_report
+from enrich_college_data import enrich_college
+from parallel import add_jobs_argument, map_files
+from record_stream import rewrite_records
+from run_manifest import RunManifest, add_full_argument
+from run_metrics import Progress, add_profile_argument, instrumented
+from sqlite_store import SqliteStore, add_backend_argument
+from update_cutoffs import CUTOFF_DATA, apply_cutoffs
+
+STAGES = {}
+# Data each stage depends on, hashed into the run manifest with its source
+STAGE_INPUTS = {}
+
+
+def register_stage(name, transform=None, inputs=()):
+    """Register a per-record transform under `name` (usable as a decorator)
+
+    `inputs` lists the data and helper functions the transform reads, so
+    a change to any of them makes the next run reprocess every file.
+    """
+    if transform is None:
+        return partial(register_stage, name, inputs=inputs)
+    STAGES[name] = transform
+    STAGE_INPUTS[name] = (transform,) + tuple(inputs)
+    return transform
+
+
+register_stage("placements", apply_placements, inputs=(PLACEMENT_DATA,))
+register_stage("cutoffs", apply_cutoffs, inputs=(CUTOFF_DATA,))
+register_stage("enrich", enrich_college, inputs=(
+    enrich_college_data.STANDARD_COURSES,
+    enrich_college_data.TOP_RECRUITERS_TIER_1,
+    enrich_college_data.TOP_RECRUITERS_TIER_2,
+    enrich_college_data.TOP_RECRUITERS_TIER_3,
+    enrich_college_data.get_recruiters_by_tier,
+    enrich_college_data.get_placement_stats,
+))
+
+DEFAULT_STAGES = ("placements", "cutoffs", "enrich")
+
+
+def stage_runner(stage_names):
+    """(transform running every named stage, stats dict it updates)"""
+    transforms = [(name, STAGES[name]) for name in stage_names]
+    stats = {
+        "records": 0,
+        "changed": [],
+        "seconds": 0.0,
+        "stages": {name: {"changed": 0, "seconds": 0.0} for name in stage_names},
+    }
+
+    def apply_all(college):
+        stats["records"] += 1
+        before = original = record_hash(college)
+        for name, transform in transforms:
+            start = time.perf_counter()
+            transform(college)
+            stage = stats["stages"][name]
+            stage["seconds"] += time.perf_counter() - start
+            after = record_hash(college)
+            if after != before:
+                stage["changed"] += 1
+                before = after
+        return before != original
+
+    return apply_all, stats
+
+
+def process_file(stage_names, file_path):
+    """Run the named stages over one state file; returns its stats dict"""
+    apply_all, stats = stage_runner(stage_names)
+    start = time.perf_counter()
+    try:
+        rewrite_records(file_path, apply_all, stats["changed"])
+    except Exception as e:
+        print(f"  ✗ {file_label(file_path)}: {e}")
+        stats["error"] = str(e)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def run_pipeline(models_dir=MODELS_DIR, stage_names=DEFAULT_STAGES, jobs=1, full=False):
+    """Run the stages over every state file; returns the merged summary
+
+    Files unchanged since the last run of the same stages with the same
+    inputs are skipped unless `full` is set.
+    """
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+
+    paths = record_files(models_dir)
+    inputs = tuple(item for name in stage_names for item in STAGE_INPUTS[name])
+    manifest = RunManifest("pipeline:" + ",".join(stage_names), models_dir, inputs=inputs)
+    pending = paths if full else manifest.pending(paths)
+
+    summary = {
+        "files": 0,
+        "filesSkipped": len(paths) - len(pending),
+        "filesWritten": 0,
+        "records": 0,
+        "seconds": 0.0,
+        "stages": {name: {"changed": 0, "seconds": 0.0} for name in stage_names},
+        "changed": {},
+    }
+
+    start = time.perf_counter()
+    progress = Progress(len(pending), "files")
+    for path, stats in map_files(partial(process_file, tuple(stage_names)), pending, jobs):
+        progress.update()
+        if "error" not in stats:
+            manifest.record(path)
+        summary["files"] += 1
+        summary["records"] += stats["records"]
+        if stats["changed"]:
+            summary["filesWritten"] += 1
+            summary["changed"][file_label(path)] = stats["changed"]
+        for name, stage in stats["stages"].items():
+            summary["stages"][name]["changed"] += stage["changed"]
+            summary["stages"][name]["seconds"] += stage["seconds"]
+    manifest.save()
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def run_pipeline_sqlite(store, stage_names=DEFAULT_STAGES):
+    """Run the stages over every record of a SqliteStore; returns the summary run_pipeline gives"""
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+    apply_all, stats = stage_runner(stage_names)
+    start = time.perf_counter()
+    changed = store.rewrite(apply_all)
+    files = store.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    return {
+        "files": files,
+        "filesSkipped": 0,
+        "filesWritten": len(changed),
+        "records": stats["records"],
+        "seconds": time.perf_counter() - start,
+        "stages": stats["stages"],
+        "changed": changed,
+    }
+
+
+def print_summary(summary):
+    print("\n" + "="*70)
+    print("PIPELINE SUMMARY")
+    print("="*70)
+    print(f"Files: {summary['files']} read, {summary['filesWritten']} written, {summary['filesSkipped']} unchanged since last run")
+    print(f"Records: {summary['records']} ({sum(len(ids) for ids in summary['changed'].values())} changed)")
+    for name, stage in summary["stages"].items():
+        print(f"  - {name:<12} {stage['changed']:>6} changed  {stage['seconds'] * 1000:>9.1f} ms")
+    print(f"Total time: {summary['seconds']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run enrichment stages in one pass per state file')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--stages', default=",".join(DEFAULT_STAGES), help='Comma-separated stages to run, in order')
+    parser.add_argument('--list', action='store_true', help='List registered stages')
+    parser.add_argument('--changed-out', help='Write the ids of changed colleges to this JSON file')
+    add_jobs_argument(parser)
+    add_full_argument(parser)
+    add_backend_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        for name in STAGES:
+            print(name)
+        return
+
+    stage_names = [name.strip() for name in args.stages.split(",") if name.strip()]
+    with instrumented("pipeline", args.profile):
+        try:
+            if args.backend == "sqlite":
+                with SqliteStore(args.db) as store:
+                    summary = run_pipeline_sqlite(store, stage_names)
+            else:
+                summary = run_pipeline(args.models_dir, stage_names, args.jobs, args.full)
+        except ValueError as e:
+            parser.error(str(e))
+        print_summary(summary)
+        if args.changed_out:
+            write_change_report(args.changed_out, summary["changed"])
+            print(f"Changed ids written to {args.changed_out}")
+
+
+if __name__ == '__main__':
+    main()
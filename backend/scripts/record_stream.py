@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Streaming Record Reader/Writer
+==============================
+Reads and writes college records one at a time so memory stays flat no
+matter how many institutions a state file holds.
+
+Handles the same layouts as college_store.load_state_file: a UTF-8 BOM,
+plain lists and the {"institutions": [...]} / {"colleges": [...]}
+wrappers. The writer produces the same bytes as
+college_store.state_text (canonical JSON, see json_codec).
+
+RecordReader and RecordWriter work on one file, which may be a district
+shard; iter_records and rewrite_records take a state file path and cover
+all shards of a sharded state.
+
+Usage:
+    reader = RecordReader(path)
+    for college in reader:
+        ...
+
+    with RecordWriter(out_path, wrapper=reader.wrapper) as writer:
+        for college in RecordReader(path):
+            writer.write(college)
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from college_store import WRAPPER_KEYS, SharedValues, models_dir_of, record_hash, state_paths, storage_files
+from json_codec import dumps, indented
+from run_metrics import METRICS
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+_decoder = json.JSONDecoder()
+
+
+class RecordReader:
+    """Iterates the college records of one state file
+
+    After iteration, `wrapper` holds the wrapper key (None for a plain
+    list) and `extra` holds any other top-level keys of a wrapper object.
+    References to shared values are expanded unless `expand` is False.
+    """
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, expand=True):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.expand = expand
+        self.wrapper = None
+        self.extra = {}
+
+    def __iter__(self):
+        shared = SharedValues.for_models(models_dir_of(self.path)) if self.expand else None
+        with open(self.path, 'r', encoding='utf-8-sig') as f:
+            self._f = f
+            self._buf = ""
+            self._pos = 0
+            self._eof = False
+            try:
+                for college in self._document():
+                    METRICS.count("records_read")
+                    yield college if shared is None else shared.expand(college)
+            finally:
+                self._f = None
+
+    # -- buffer helpers -------------------------------------------------
+
+    def _fill(self):
+        """Read one more chunk; returns False at end of file"""
+        if self._eof:
+            return False
+        start = time.perf_counter()
+        chunk = self._f.read(self.chunk_size)
+        METRICS.add("load", time.perf_counter() - start)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos > self.chunk_size:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next character ('' at EOF)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"{self.path}: expected '{char}' at offset {self._pos}")
+        self._pos += 1
+
+    def _value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self._peek()
+        while True:
+            try:
+                start = time.perf_counter()
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+                METRICS.add("parse", time.perf_counter() - start)
+                # A value ending exactly at the buffer edge may be cut short (e.g. a number)
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise ValueError(f"{self.path} contains invalid JSON: {e}") from e
+            self._fill()
+
+    # -- document structure ---------------------------------------------
+
+    def _document(self):
+        first = self._peek()
+        if first == "[":
+            yield from self._array()
+        elif first == "{":
+            yield from self._wrapper_object()
+        else:
+            raise ValueError(f"{self.path}: no college list found")
+
+    def _array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            char = self._peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"{self.path}: expected ',' or ']' at offset {self._pos - 1}")
+
+    def _wrapper_object(self):
+        self._expect("{")
+        if self._peek() == "}":
+            raise ValueError(f"{self.path}: no college list found")
+        while True:
+            key = self._value()
+            self._expect(":")
+            if self.wrapper is None and key in WRAPPER_KEYS and self._peek() == "[":
+                self.wrapper = key
+                yield from self._array()
+            else:
+                self.extra[key] = self._value()
+            char = self._peek()
+            self._pos += 1
+            if char == "}":
+                break
+            if char != ",":
+                raise ValueError(f"{self.path}: expected ',' or '}}' at offset {self._pos - 1}")
+        if self.wrapper is None:
+            raise ValueError(f"{self.path}: no college list found")
+
+
+def iter_records(path):
+    """Yield the college records of one state (every shard, if sharded)"""
+    for file in storage_files(path):
+        yield from RecordReader(file)
+
+
+def iter_models(models_dir, pattern="*_Colleges.json"):
+    """Yield (path, college) for every record in every state file"""
+    for path in state_paths(models_dir):
+        if path.match(pattern):
+            for college in iter_records(path):
+                yield path, college
+
+
+class RecordWriter:
+    """Writes records to a state file as they are produced
+
+    Output goes to a temp file that replaces `path` on a clean close; on
+    an exception (or abort) the temp file is removed and `path` is left
+    untouched. `wrapper` may be set any time before the first write; set
+    `extra` before closing to keep other keys of a wrapper object.
+    Values in the models dir's shared table are written as references
+    unless `compress` is False.
+    """
+
+    def __init__(self, path, wrapper=None, compress=True):
+        self.path = Path(path)
+        self.wrapper = wrapper
+        self.shared = SharedValues.for_models(models_dir_of(self.path)) if compress else None
+        self.extra = {}
+        self.count = 0
+        self._tmp_path = None
+        self._f = None
+        self._level = 1
+        self._started = False
+        self._closed = False
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        self._f = os.fdopen(fd, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        elif not self._closed:
+            self.close()
+        return False
+
+    def _start(self):
+        if self.wrapper:
+            self._level = 2
+            self._f.write("{\n  " + dumps(self.wrapper) + ": [")
+        else:
+            self._f.write("[")
+        self._started = True
+
+    def write(self, college):
+        if not self._started:
+            self._start()
+        if self.shared is not None:
+            college = self.shared.compress(college)
+        start = time.perf_counter()
+        text = indented(college, self._level)
+        written = time.perf_counter()
+        self._f.write(",\n" if self.count else "\n")
+        self._f.write(text)
+        METRICS.add("serialize", written - start)
+        METRICS.add("write", time.perf_counter() - written)
+        self.count += 1
+
+    def close(self):
+        if not self._started:
+            self._start()
+        closing_pad = "  " * (self._level - 1)
+        self._f.write(("\n" + closing_pad if self.count else "") + "]")
+        if self.wrapper:
+            for key, value in sorted(self.extra.items()):
+                self._f.write(",\n  " + dumps(key) + ": " + indented(value, 1).lstrip())
+            self._f.write("\n}")
+        self._f.write("\n")
+        with METRICS.stage("write"):
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._f.close()
+            self._closed = True
+            try:
+                os.chmod(self._tmp_path, self.path.stat().st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(self._tmp_path, 0o644)
+            os.replace(self._tmp_path, self.path)
+        METRICS.count("records_written", self.count)
+
+    def abort(self):
+        """Discard everything written so far"""
+        if self._closed:
+            return
+        self._f.close()
+        self._closed = True
+        try:
+            os.unlink(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def rewrite_records(path, transform, changed_ids=None):
+    """Stream a state file through `transform`, replacing it only if a record changed
+
+    `transform(college)` edits the record in place. Whether a record
+    changed is decided by comparing content hashes before and after, not
+    by the transform's return value, so a transform that rewrites a field
+    with the same value leaves the file untouched. Ids of changed records
+    are appended to `changed_ids` when given. Returns the number of
+    changed records.
+
+    For a sharded state each shard is streamed on its own and only the
+    shards with a changed record are replaced; records stay in their
+    shard.
+    """
+    files = storage_files(path)
+    if files != [Path(path)]:
+        return sum(rewrite_records(file, transform, changed_ids) for file in files)
+    reader = RecordReader(path)
+    changed = 0
+    with RecordWriter(path) as writer:
+        for college in reader:
+            # The wrapper key is known once the reader reaches the list
+            writer.wrapper = reader.wrapper
+            start = time.perf_counter()
+            before = record_hash(college)
+            transform(college)
+            modified = record_hash(college) != before
+            METRICS.add("transform", time.perf_counter() - start)
+            if modified:
+                changed += 1
+                if changed_ids is not None:
+                    changed_ids.append(college.get('id'))
+            writer.write(college)
+        writer.wrapper = reader.wrapper
+        writer.extra = reader.extra
+        if not changed:
+            writer.abort()
+    METRICS.count("records_changed", changed)
+    return changed
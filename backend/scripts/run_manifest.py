@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Incremental Run Manifest
+========================
+Remembers, per pipeline step, what every state file looked like after the
+step last processed it, plus a hash of the step's inputs (e.g.
+CUTOFF_DATA and the transform's source code).
+
+On the next run only files whose size/mtime changed (and whose content
+hash really differs) are processed again; if the inputs changed, every
+file is. A no-op re-run therefore costs one stat() per file.
+
+Usage:
+    manifest = RunManifest("update_cutoffs", models_dir, inputs=(CUTOFF_DATA, apply_cutoffs))
+    for path in manifest.pending(paths):
+        process(path)
+        manifest.record(path)
+    manifest.save()
+"""
+
+import hashlib
+import inspect
+import json
+from pathlib import Path
+
+from college_store import file_label, write_json_atomic
+from json_codec import loads
+
+MANIFEST_PATH = Path(__file__).resolve().parent / ".cache" / "run_manifest.json"
+
+
+def input_hash(inputs):
+    """Hash step inputs; functions contribute their source so logic edits count too"""
+    digest = hashlib.sha256()
+    for item in inputs:
+        if callable(item):
+            text = inspect.getsource(item)
+        else:
+            text = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load(path):
+    try:
+        return loads(Path(path).read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+class RunManifest:
+    """Per-step record of processed files, keyed by step name and models dir"""
+
+    def __init__(self, step, models_dir, inputs=(), path=MANIFEST_PATH):
+        self.path = Path(path)
+        self.key = f"{step}@{Path(models_dir).resolve()}"
+        self.input_hash = input_hash(inputs)
+        self._all = _load(self.path)
+        entry = self._all.get(self.key, {})
+        # Different inputs invalidate everything recorded for this step
+        if entry.get("inputHash") != self.input_hash:
+            entry = {}
+        self.files = entry.get("files", {})
+
+    def is_current(self, path):
+        """True if `path` is unchanged since this step last recorded it"""
+        path = Path(path)
+        seen = self.files.get(file_label(path))
+        if seen is None:
+            return False
+        st = path.stat()
+        if st.st_size == seen["size"] and st.st_mtime_ns == seen["mtimeNs"]:
+            return True
+        # Touched but maybe not modified (e.g. checkout); fall back to content
+        if st.st_size == seen["size"] and file_hash(path) == seen["sha256"]:
+            seen["mtimeNs"] = st.st_mtime_ns
+            return True
+        return False
+
+    def pending(self, paths):
+        """Return the paths that need processing"""
+        return [p for p in paths if not self.is_current(p)]
+
+    def record(self, path):
+        """Mark `path` as processed in its current state"""
+        path = Path(path)
+        st = path.stat()
+        self.files[file_label(path)] = {"size": st.st_size, "mtimeNs": st.st_mtime_ns, "sha256": file_hash(path)}
+
+    def save(self):
+        self._all = _load(self.path)
+        self._all[self.key] = {"inputHash": self.input_hash, "files": self.files}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.path, self._all)
+
+
+def add_full_argument(parser):
+    parser.add_argument('--full', action='store_true',
+                        help='Process every state file, ignoring the run manifest')
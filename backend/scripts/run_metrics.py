@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Run Metrics
+===========
+Timing, memory and throughput instrumentation shared by the data scripts.
+
+The readers and writers (college_store, record_stream, sqlite_store)
+add their time to a process-wide METRICS object under five stages:
+
+    load       reading file bytes
+    parse      JSON decode
+    transform  per-record edits (enrichers, pipeline stages)
+    serialize  JSON encode
+    write      writing files / database rows to disk
+
+Counters record how many records were read, written and changed, so a
+run reports records/sec. With --jobs the workers' metrics are merged
+into the parent by parallel.map_files, so stage times are CPU seconds
+summed over workers and can exceed the wall time.
+
+Progress prints at most one line per interval instead of one per record.
+
+    with instrumented("add_placement_data", profile=args.profile):
+        ...   # prints a metrics summary at the end
+
+With --profile the run is also profiled with cProfile, Python heap use
+is traced with tracemalloc, and both a .prof dump (for pstats/snakeviz)
+and a JSON metrics file are written to .cache/profile/.
+
+Usage:
+    add_profile_argument(parser)
+    with METRICS.stage("parse"):
+        data = json.loads(text)
+    progress = Progress(len(paths), "files")
+    for path in paths:
+        ...
+        progress.update()
+"""
+
+import contextlib
+import cProfile
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).resolve().parent / ".cache" / "profile"
+STAGE_NAMES = ("load", "parse", "transform", "serialize", "write")
+PROGRESS_INTERVAL = 2.0
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB
+
+    Linux keeps ru_maxrss across exec (it would report the parent's peak
+    for a small task), so the per-image VmHWM is used where available.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class RunMetrics:
+    """Accumulated stage times and counters of one run"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.seconds = dict.fromkeys(STAGE_NAMES, 0.0)
+        self.counters = {}
+
+    def add(self, stage, seconds):
+        """Add `seconds` to a stage (for hot loops where a `with` block costs too much)"""
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        return {"seconds": dict(self.seconds), "counters": dict(self.counters)}
+
+    def merge(self, snapshot):
+        """Add a snapshot taken in another process (see parallel.map_files)"""
+        for stage, seconds in snapshot["seconds"].items():
+            self.add(stage, seconds)
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+
+    def report(self, elapsed):
+        """Metrics of the run as a JSON-ready dict"""
+        records = self.counters.get("records_read", 0)
+        return {
+            "seconds": round(elapsed, 4),
+            "stages": {stage: round(seconds, 4) for stage, seconds in self.seconds.items()},
+            "counters": dict(self.counters),
+            "recordsPerSec": round(records / elapsed, 1) if elapsed > 0 else None,
+            "peakRssMb": round(peak_rss_mb(), 1),
+        }
+
+
+METRICS = RunMetrics()
+
+
+class Progress:
+    """Throttled progress line: at most one print per `interval` seconds"""
+
+    def __init__(self, total=None, unit="records", interval=PROGRESS_INTERVAL):
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.done = 0
+        self.start = time.perf_counter()
+        self._next = self.start + interval
+
+    def update(self, n=1):
+        self.done += n
+        now = time.perf_counter()
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        rate = self.done / (now - self.start)
+        of = f"/{self.total:,}" if self.total is not None else ""
+        print(f"  … {self.done:,}{of} {self.unit} ({rate:,.0f}/s)", flush=True)
+
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Write a cProfile dump and JSON metrics for this run to {PROFILE_DIR}')
+
+
+def print_metrics(report):
+    stages = "  ".join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in report["stages"].items()
+                       if seconds)
+    counters = report["counters"]
+    print(f"Timing: {report['seconds']:.2f}s" + (f"  ({stages})" if stages else ""))
+    line = f"  - Records: {counters.get('records_read', 0):,} read, {counters.get('records_written', 0):,} written"
+    if report["recordsPerSec"]:
+        line += f", {report['recordsPerSec']:,.0f} rec/s"
+    print(line)
+    memory = f"  - Peak memory: {report['peakRssMb']:.1f} MB RSS"
+    if "tracemallocPeakMb" in report:
+        memory += f", {report['tracemallocPeakMb']:.1f} MB Python heap"
+    print(memory)
+
+
+@contextlib.contextmanager
+def instrumented(script, profile=False, out_dir=PROFILE_DIR):
+    """Measure the enclosed run of `script` and print a metrics summary
+
+    With `profile`, the run is cProfiled and traced with tracemalloc, and
+    <script>-<time>.prof and <script>-<time>.json are written to `out_dir`.
+    """
+    METRICS.reset()
+    started = datetime.now(timezone.utc)
+    profiler = cProfile.Profile() if profile else None
+    if profile:
+        tracemalloc.start()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield METRICS
+    finally:
+        elapsed = time.perf_counter() - start
+        if profile:
+            profiler.disable()
+            heap_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    # Only reached when the block succeeded: failed runs (and parser.error exits) report nothing
+    report = METRICS.report(elapsed)
+    if profile:
+        report["tracemallocPeakMb"] = round(heap_peak / (1024 * 1024), 1)
+    print_metrics(report)
+    if profile:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        base = out_dir / f"{script}-{started.strftime('%Y%m%dT%H%M%SZ')}"
+        profiler.dump_stats(f"{base}.prof")
+        report = {"script": script, "startedAt": started.isoformat(timespec="seconds"),
+                  "argv": sys.argv[1:], **report}
+        Path(f"{base}.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"  - Profile written to {base}.prof and {base}.json")
@@ -12,21 +12,25 @@ Usage:
 1. Run: python scrape_real_colleges.py --source nirf --state all
 2. Run: python scrape_real_colleges.py --source aicte --state Gujarat
 3. Run: python scrape_real_colleges.py --source tnea --add-to-db
+4. Add --backend sqlite to write to the SQLite store (sqlite_store.py)
 """
 
-import json
 import csv
 import sys
 import argparse
 import os
-from pathlib import Path
 import re
 import requests
 from bs4 import BeautifulSoup
 import time
+import asyncio
 
-# Base directory
-BASE_DIR = Path(__file__).parent / "models"
+from college_schema import validate
+from college_store import MODELS_DIR, CollegeStore
+from crawl_checkpoint import CrawlCheckpoint
+from html_tables import iter_table_rows
+from http_cache import HttpCache
+from sqlite_store import add_backend_argument, open_store
 
 # Official data sources
 SOURCES = {
@@ -70,34 +74,23 @@ def generate_id(name, city):
     city_str = re.sub(r'[-\s]+', '-', city_str)
     return f"{id_str[:30]}-{city_str[:15]}"
 
-def load_existing_colleges(state_file):
-    """Load existing colleges from state JSON file"""
-    try:
-        with open(state_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-def save_colleges(state_file, colleges):
-    """Save colleges to state JSON file"""
-    with open(state_file, 'w', encoding='utf-8') as f:
-        json.dump(colleges, f, indent=2, ensure_ascii=False)
+def add_college_to_state(college_data, state_name, store=None):
+    """Add a single college to a state file
 
-def add_college_to_state(college_data, state_name):
-    """Add a single college to a state file"""
-    state_filename = f"{state_name.replace(' ', '_')}_Colleges.json"
-    state_path = BASE_DIR / state_filename
-    
-    # Load existing colleges
-    existing_colleges = load_existing_colleges(state_path)
-    existing_ids = {c['id'] for c in existing_colleges}
+    Pass a CollegeStore to batch many adds; the caller commits it. Without
+    one the college is written immediately.
+    """
+    if store is None:
+        with CollegeStore(MODELS_DIR, validator=validate) as store:
+            return add_college_to_state(college_data, state_name, store)
     
     # Generate ID
     college_id = generate_id(college_data['name'], college_data['city'])
     
-    # Skip if already exists
-    if college_id in existing_ids:
-        return False, "Already exists"
+    # Skip if already exists in any state file
+    existing_file = store.locate(college_id)
+    if existing_file:
+        return False, f"Already exists in {existing_file}"
     
     # Build full college object
     college = {
@@ -125,9 +118,11 @@ def add_college_to_state(college_data, state_name):
         }
     }
     
-    # Add to list and save
-    existing_colleges.append(college)
-    save_colleges(state_path, existing_colleges)
+    errors = validate(college)
+    if errors:
+        return False, "Invalid: " + "; ".join(f"{field} {message}" for field, message in errors)
+    
+    store.add(state_name, college)
     
     return True, "Added successfully"
 
@@ -182,49 +177,110 @@ def get_state_from_location(location):
             return state
     return "Unknown"
 
-def import_from_csv(csv_file, source_name=""):
-    """Import colleges from CSV file with verified data"""
+def import_rows(rows, source_name="", store=None):
+    """Import college rows (dicts with the CSV column names) into the state files"""
     added_count = 0
     skipped_count = 0
     
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            state = row.get('state', '').strip()
-            if not state:
-                continue
-            
-            college_data = {
-                'name': row['name'].strip(),
-                'shortName': row.get('shortName', '').strip(),
-                'city': row.get('city', '').strip(),
-                'district': row.get('district', row.get('city', '')).strip(),
-                'rankingTier': row.get('rankingTier', 'Tier 2'),
-                'overview': row.get('overview', ''),
-                'campus': row.get('campus', ''),
-                'officialUrl': row.get('officialUrl', ''),
-                'acceptedExams': [e.strip() for e in row.get('acceptedExams', '').split(',') if e.strip()],
-                'ownership': row.get('ownership', 'Private'),
-                'sourceName': source_name
-            }
-            
-            success, message = add_college_to_state(college_data, state)
-            if success:
-                added_count += 1
-                print(f"  ✓ Added: {college_data['name']}")
-            else:
-                skipped_count += 1
-                print(f"  ⚠ Skipped: {college_data['name']} - {message}")
+    if store is None:
+        with CollegeStore(MODELS_DIR, validator=validate) as store:
+            return import_rows(rows, source_name, store)
+    
+    for row in rows:
+        state = row.get('state', '').strip()
+        if not state or not row.get('name', '').strip():
+            continue
+        
+        college_data = {
+            'name': row['name'].strip(),
+            'shortName': row.get('shortName', '').strip(),
+            'city': row.get('city', '').strip(),
+            'district': row.get('district', row.get('city', '')).strip(),
+            'rankingTier': row.get('rankingTier', 'Tier 2'),
+            'overview': row.get('overview', ''),
+            'campus': row.get('campus', ''),
+            'officialUrl': row.get('officialUrl', ''),
+            'acceptedExams': [e.strip() for e in row.get('acceptedExams', '').split(',') if e.strip()],
+            'ownership': row.get('ownership', 'Private'),
+            'sourceName': source_name
+        }
+        
+        success, message = add_college_to_state(college_data, state, store)
+        if success:
+            added_count += 1
+            print(f"  ✓ Added: {college_data['name']}")
+        else:
+            skipped_count += 1
+            print(f"  ⚠ Skipped: {college_data['name']} - {message}")
     
     return added_count, skipped_count
 
+def import_from_csv(csv_file, source_name="", store=None):
+    """Import colleges from CSV file with verified data"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        return import_rows(csv.DictReader(f), source_name, store)
+
+def import_from_html(html_file, source_name="", store=None):
+    """Import colleges from a saved HTML listing (e.g. the AICTE export)
+
+    Rows are parsed incrementally and imported as they are read, so the
+    page is never held as a document tree.
+    """
+    with open(html_file, 'rb') as f:
+        return import_rows(iter_table_rows(f), source_name, store)
+
+def crawl_source(source_key, max_pages=None, workers=8, use_cache=True, offline=False, max_age=None,
+                 resume=False):
+    """Crawl a source's listing pages concurrently; returns the parsed rows
+
+    Progress is checkpointed per source, so with `resume` an interrupted
+    crawl continues from its frontier and the rows of earlier runs are
+    returned along with the new ones.
+    """
+    # Imported here: the fetcher needs aiohttp, which CSV and HTML imports do not
+    try:
+        from fetcher import PARSERS, Fetcher, crawl
+    except ImportError as e:
+        raise SystemExit(f"✗ --crawl needs aiohttp (pip install aiohttp): {e}")
+    source = SOURCES[source_key]
+    parser = PARSERS.get(source_key, PARSERS["table"])
+    cache = HttpCache(max_age=max_age) if use_cache or offline else None
+    
+    async def run(checkpoint):
+        async with Fetcher(cache=cache, offline=offline) as fetcher:
+            result = await crawl([source['url']], parser, fetcher, workers=workers, max_pages=max_pages,
+                                 checkpoint=checkpoint)
+            return result, fetcher.stats
+    
+    with CrawlCheckpoint.for_source(source_key, resume=resume) as checkpoint:
+        if resume:
+            counts = checkpoint.counts()
+            print(f"  Resuming: {counts['done']} pages done, {counts['pending'] + counts['failed']} to fetch, "
+                  f"{counts['records']} rows so far")
+        result, stats = asyncio.run(run(checkpoint))
+        print(f"  Fetched {result.pages} pages ({stats['requests']} requests, {stats['retries']} retries, "
+              f"{stats['cacheHits']} from cache, {stats['notModified']} not modified)")
+        for url, reason in result.failed:
+            print(f"  ✗ {url}: {reason}")
+        return list(checkpoint.records())
+
 def main():
     parser = argparse.ArgumentParser(description='Scrape and Add Real Colleges from Official Sources')
-    parser.add_argument('--source', '-s', choices=['nirf', 'aicte', 'acpc', 'tnea', 'kea', 'mhtcet', 'csv'],
+    parser.add_argument('--source', '-s', choices=['nirf', 'aicte', 'acpc', 'tnea', 'kea', 'mhtcet', 'csv', 'html'],
                         help='Data source to scrape from')
     parser.add_argument('--state', '-st', help='Specific state to process (or "all")')
-    parser.add_argument('--input', '-i', help='Input CSV file with verified college data')
+    parser.add_argument('--input', '-i', help='Input CSV (or saved HTML listing) with verified college data')
     parser.add_argument('--list-sources', '-l', action='store_true', help='List available data sources')
+    parser.add_argument('--crawl', action='store_true', help='Crawl the source listing pages concurrently')
+    parser.add_argument('--add-to-db', action='store_true', help='Import crawled rows into the state files')
+    parser.add_argument('--output', '-o', help='Write crawled rows to this CSV file')
+    parser.add_argument('--max-pages', type=int, help='Stop after this many pages')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent crawl workers (per-host limits still apply)')
+    parser.add_argument('--resume', action='store_true', help='Continue the last interrupted crawl of this source')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the HTTP cache')
+    parser.add_argument('--offline', action='store_true', help='Replay pages from the HTTP cache without network access')
+    parser.add_argument('--max-age', type=float, help='Use cached pages younger than this many seconds without revalidating')
+    add_backend_argument(parser)
     
     args = parser.parse_args()
     
@@ -245,18 +301,61 @@ def main():
             sys.exit(1)
         
         print(f"\nImporting colleges from {args.input}...")
-        added, skipped = import_from_csv(args.input, "CSV Import")
+        store = open_store(args.backend, MODELS_DIR, args.db, validator=validate)
+        added, skipped = import_from_csv(args.input, "CSV Import", store)
+        store.commit()
         print(f"\n✅ Import complete!")
         print(f"  Added: {added} colleges")
         print(f"  Skipped: {skipped} colleges")
         return
     
+    if args.source == 'html' and args.input:
+        if not os.path.exists(args.input):
+            print(f"Error: File not found: {args.input}")
+            sys.exit(1)
+        
+        print(f"\nImporting colleges from {args.input}...")
+        store = open_store(args.backend, MODELS_DIR, args.db, validator=validate)
+        added, skipped = import_from_html(args.input, "HTML Import", store)
+        store.commit()
+        print(f"\n✅ Import complete!")
+        print(f"  Added: {added} colleges")
+        print(f"  Skipped: {skipped} colleges")
+        return
+    
+    if args.crawl and args.source in SOURCES:
+        print(f"\nCrawling {SOURCES[args.source]['name']}...")
+        rows = crawl_source(args.source, args.max_pages, args.workers,
+                            use_cache=not args.no_cache, offline=args.offline, max_age=args.max_age,
+                            resume=args.resume)
+        if args.state and args.state != 'all':
+            rows = [r for r in rows if r.get('state', '').strip() == args.state]
+        print(f"Found {len(rows)} rows")
+        
+        if args.output:
+            fieldnames = sorted({key for row in rows for key in row})
+            with open(args.output, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+            print(f"  Rows written to {args.output}")
+        
+        if args.add_to_db:
+            store = open_store(args.backend, MODELS_DIR, args.db, validator=validate)
+            added, skipped = import_rows(rows, SOURCES[args.source]['name'], store)
+            store.commit()
+            print(f"\n✅ Crawl import complete!")
+            print(f"  Added: {added} colleges")
+            print(f"  Skipped: {skipped} colleges")
+        return
+    
     if args.source == 'nirf':
         print("\nFetching NIRF 2024 ranked colleges...")
         colleges = scrape_nirf_colleges()
         print(f"Found {len(colleges)} NIRF ranked colleges")
         
         added = 0
+        store = open_store(args.backend, MODELS_DIR, args.db, validator=validate)
         for college in colleges:
             if args.state and args.state != 'all' and college['state'] != args.state:
                 continue
@@ -270,9 +369,10 @@ def main():
                 'sourceName': 'NIRF 2024'
             }
             
-            success, _ = add_college_to_state(college_data, college['state'])
+            success, _ = add_college_to_state(college_data, college['state'], store)
             if success:
                 added += 1
+        store.commit()
         
         print(f"\n✅ Added {added} NIRF ranked colleges")
         return
@@ -282,6 +382,9 @@ def main():
     print("1. Download official college lists from state admission committees")
     print("2. Format as CSV with columns: name, city, district, state, rankingTier, overview, officialUrl, acceptedExams, ownership")
     print("3. Run: python scrape_real_colleges.py --source csv --input your_file.csv")
+    print("   (a saved HTML listing works too: --source html --input listing.html)")
+    print("\nTo crawl an official listing:")
+    print("  python scrape_real_colleges.py --source aicte --crawl --output aicte.csv")
     print("\nFor NIRF ranked colleges:")
     print("  python scrape_real_colleges.py --source nirf --state all")
     print("\nList available sources:")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Shard State Files by District
+=============================
+Splits large state files into one file per district, so an edit to a
+few colleges rewrites a few small files instead of the whole state:
+
+    models/Tamil_Nadu_Colleges.json
+        ->  models/Tamil_Nadu/manifest.json
+            models/Tamil_Nadu/Chennai.json
+            models/Tamil_Nadu/Coimbatore.json
+            models/Tamil_Nadu/_unassigned.json   (no meta.district)
+
+The manifest lists the shard files in order along with the state file's
+list wrapper and any other top-level keys, so nothing is lost. Readers
+(college_store, record_stream, services/dataStore.js, build_bundle.py)
+merge the shards back into the list the state file held, grouped by
+district; CollegeStore rewrites only the shards it changed.
+
+The new layout is written completely before the old one is removed,
+and a state file wins over a shard directory while both exist, so an
+interrupted run never loses records.
+
+Usage:
+    python shard_states.py Tamil_Nadu Maharashtra   # shard these states
+    python shard_states.py --min-kb 256             # shard every state file over 256 KB
+    python shard_states.py --unshard Tamil_Nadu     # back to a single file
+    python shard_states.py --unshard --all
+    python shard_states.py --list
+"""
+
+import argparse
+from pathlib import Path
+
+from college_store import (
+    MODELS_DIR, SHARD_FORMAT_VERSION, SHARD_MANIFEST_NAME, WRAPPER_KEYS, SharedValues,
+    district_of, load_state_file, read_shard_manifest, shard_dir, shard_file, state_filename,
+    state_paths, storage_files, write_json_atomic, write_state_atomic,
+)
+
+
+def split_container(container):
+    """(wrapper key or None, other top-level keys) of a loaded state file"""
+    if isinstance(container, list):
+        return None, {}
+    wrapper = next(key for key in WRAPPER_KEYS if isinstance(container.get(key), list))
+    return wrapper, {key: value for key, value in container.items() if key != wrapper}
+
+
+def shard_state(path):
+    """Split one state file into district shards; returns the number of shards"""
+    path = Path(path)
+    container, colleges = load_state_file(path)
+    wrapper, extra = split_container(container)
+
+    groups = {}
+    for college in colleges:
+        groups.setdefault(shard_file(college), []).append(college)
+
+    directory = shard_dir(path)
+    directory.mkdir(exist_ok=True)
+    shared = SharedValues.for_models(path.parent)
+    shards = []
+    for file, group in groups.items():
+        if shared is not None:
+            group = [shared.compress(college) for college in group]
+        write_json_atomic(directory / file, group)
+        shards.append({"district": district_of(groups[file][0]), "file": file})
+
+    write_json_atomic(directory / SHARD_MANIFEST_NAME, {
+        "formatVersion": SHARD_FORMAT_VERSION,
+        "state": path.name,
+        "wrapper": wrapper,
+        "extra": extra,
+        "shards": shards,
+    })
+    path.unlink()
+    return len(shards)
+
+
+def unshard_state(path):
+    """Merge a sharded state back into its state file; returns the number of records"""
+    path = Path(path)
+    files = storage_files(path)
+    container, colleges = load_state_file(path)
+    shared = SharedValues.for_models(path.parent)
+    if shared is not None:
+        compressed = [shared.compress(college) for college in colleges]
+        container = compressed if container is colleges else \
+            {key: compressed if value is colleges else value for key, value in container.items()}
+    write_state_atomic(path, container)
+
+    directory = shard_dir(path)
+    for file in files:
+        file.unlink(missing_ok=True)
+    (directory / SHARD_MANIFEST_NAME).unlink(missing_ok=True)
+    try:
+        directory.rmdir()
+    except OSError:
+        print(f"  ⚠ Left {directory} in place (it holds other files)")
+    return len(colleges)
+
+
+def state_path(models_dir, name):
+    """State file path for 'Tamil_Nadu', 'Tamil Nadu' or 'Tamil_Nadu_Colleges.json'"""
+    filename = name if name.endswith("_Colleges.json") else state_filename(name)
+    return Path(models_dir) / filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Split state files into per-district shards (or merge them back)')
+    parser.add_argument('states', nargs='*', help='States to shard or unshard (e.g. Tamil_Nadu)')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--min-kb', type=int, help='Shard every single-file state larger than this')
+    parser.add_argument('--unshard', action='store_true', help='Merge sharded states back into one file')
+    parser.add_argument('--all', action='store_true', help='With --unshard: every sharded state')
+    parser.add_argument('--list', action='store_true', help='Show which states are sharded')
+    args = parser.parse_args()
+
+    models_dir = Path(args.models_dir)
+    paths = state_paths(models_dir)
+
+    if args.list:
+        for path in paths:
+            manifest = read_shard_manifest(path)
+            if manifest is None:
+                print(f"  - {path.name}: single file, {path.stat().st_size / 1024:.0f} KB")
+            else:
+                size = sum(file.stat().st_size for file in storage_files(path))
+                print(f"  - {path.name}: {len(manifest['shards'])} shards, {size / 1024:.0f} KB")
+        return
+
+    if args.unshard:
+        targets = [p for p in paths if read_shard_manifest(p) is not None] if args.all else \
+            [state_path(models_dir, name) for name in args.states]
+    elif args.min_kb is not None:
+        targets = [p for p in paths if p.exists() and p.stat().st_size > args.min_kb * 1024]
+    else:
+        targets = [state_path(models_dir, name) for name in args.states]
+    if not targets:
+        parser.error("no states to process (name states, or use --min-kb / --unshard --all)")
+
+    print("=" * 70)
+    for path in targets:
+        sharded = read_shard_manifest(path) is not None
+        if args.unshard:
+            if not sharded:
+                print(f"  ⚠ {path.name}: not sharded")
+                continue
+            print(f"  ✓ {path.name}: {unshard_state(path)} colleges merged back")
+        else:
+            if sharded or not path.exists():
+                print(f"  ⚠ {path.name}: {'already sharded' if sharded else 'not found'}")
+                continue
+            print(f"  ✓ {path.name}: {shard_state(path)} district shards")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+SQLite College Store
+====================
+Optional SQLite backing store for the data scripts, with indexes on id,
+state, tier, ownership, district and accepted exam.
+
+The JSON state files stay the format the server reads; the database is
+a working copy the scripts can import into, update with indexed lookups
+and batched transactions, and export back from. Each record is kept as
+the JSON text of its entry in the state file (shared values as
+references) next to the indexed columns, and each file keeps its
+layout (BOM, indent, list wrapper, trailing text), so an import/export
+round trip reproduces models/*_Colleges.json byte for byte. A sharded
+state (see shard_states.py) is imported merged and exported as a single
+file.
+
+SqliteStore has the CollegeStore interface (state, open, locate,
+exists, add, update, upsert, remove, commit, validator=), so importers
+take it as-is; enrichers use rewrite() to stream every record through a
+transform in one transaction.
+
+Usage:
+    python sqlite_store.py import                     # models/*_Colleges.json -> models/colleges.db
+    python sqlite_store.py export [--output DIR]      # colleges.db -> *_Colleges.json
+    python sqlite_store.py query --tier "Tier 2" --ownership private --exam mht-cet
+    python sqlite_store.py stats
+
+    python bulk_import_colleges.py -i aicte.csv --chunk-size 5000 --backend sqlite
+    python pipeline.py --backend sqlite
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from college_store import (
+    MODELS_DIR, SHARED_VALUES_NAME, WRAPPER_KEYS, SchemaError, SharedValues, load_shards,
+    read_shard_manifest, record_hash, state_filename, state_paths, write_bytes_atomic,
+)
+from json_codec import dumps, loads
+from run_metrics import METRICS
+
+DB_PATH = MODELS_DIR / "colleges.db"
+DB_FORMAT_VERSION = 1
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+-- One row per state file, with what it takes to write it back unchanged
+CREATE TABLE IF NOT EXISTS files (
+    name   TEXT PRIMARY KEY,
+    bom    INTEGER NOT NULL DEFAULT 0,
+    indent INTEGER NOT NULL DEFAULT 2,
+    layout TEXT NOT NULL DEFAULT '[]',  -- wrapper object with the list as null, or [] for a plain list
+    suffix TEXT NOT NULL DEFAULT ''     -- text after the JSON (usually a newline)
+);
+CREATE TABLE IF NOT EXISTS colleges (
+    rowid     INTEGER PRIMARY KEY,
+    file      TEXT NOT NULL REFERENCES files(name),
+    position  INTEGER NOT NULL,
+    id        TEXT,
+    state     TEXT COLLATE NOCASE,
+    tier      TEXT,
+    ownership TEXT COLLATE NOCASE,
+    district  TEXT COLLATE NOCASE,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS colleges_file ON colleges(file, position);
+CREATE INDEX IF NOT EXISTS colleges_id ON colleges(id);
+CREATE INDEX IF NOT EXISTS colleges_state ON colleges(state);
+CREATE INDEX IF NOT EXISTS colleges_tier ON colleges(tier);
+CREATE INDEX IF NOT EXISTS colleges_ownership ON colleges(ownership);
+CREATE INDEX IF NOT EXISTS colleges_district ON colleges(district);
+CREATE TABLE IF NOT EXISTS exams (
+    exam    TEXT NOT NULL,
+    college INTEGER NOT NULL REFERENCES colleges(rowid) ON DELETE CASCADE,
+    PRIMARY KEY (exam, college)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS exams_college ON exams(college);
+-- Other models/ files the state files depend on (shared_values.json)
+CREATE TABLE IF NOT EXISTS raw_files (
+    name    TEXT PRIMARY KEY,
+    content BLOB NOT NULL
+);
+"""
+
+
+def record_text(college):
+    """Compact JSON of a record, keys in their original order"""
+    return dumps(college, pretty=False, sort_keys=False)
+
+
+def index_columns(college):
+    """(state, tier, ownership, district, exams) of an expanded record"""
+    meta = college.get("meta") if isinstance(college.get("meta"), dict) else {}
+    state = college.get("state")
+    if not state and isinstance(college.get("location"), str):
+        state = college["location"].split(",")[-1].strip()
+    tier = college.get("rankingTier") or college.get("ranking")
+    ownership = meta.get("ownership") or college.get("ownership")
+    district = meta.get("district") or college.get("district")
+    exams = college.get("acceptedExams")
+    exams = sorted({e.strip().lower() for e in exams if isinstance(e, str) and e.strip()}) \
+        if isinstance(exams, list) else []
+    text = [v if isinstance(v, str) and v else None for v in (state, tier, ownership, district)]
+    return (*text, exams)
+
+
+def detect_layout(text):
+    """(indent, suffix) of a state file's JSON text"""
+    stripped = text.rstrip()
+    suffix = text[len(stripped):]
+    lines = stripped.split("\n", 2)
+    indent = len(lines[1]) - len(lines[1].lstrip(" ")) if len(lines) > 1 else 2
+    return indent or 2, suffix
+
+
+def _shift(text, pad):
+    return text.replace("\n", "\n" + pad)
+
+
+def render_file(layout, records, indent):
+    """The file text json.dumps(container, indent=indent, ensure_ascii=False) would give
+
+    `records` yields the records' compact JSON; each is re-indented on
+    its own so the whole file is never held as Python objects.
+    """
+    pad = " " * indent
+    wrapper = next((key for key, value in layout.items() if value is None), None) \
+        if isinstance(layout, dict) else None
+    level = 2 if wrapper else 1
+
+    def college_list():
+        yield "["
+        first = True
+        for text in records:
+            value = json.dumps(loads(text), indent=indent, ensure_ascii=False)
+            yield ("\n" if first else ",\n") + pad * level + _shift(value, pad * level)
+            first = False
+        yield "]" if first else "\n" + pad * (level - 1) + "]"
+
+    if wrapper is None:
+        yield from college_list()
+        return
+    yield "{"
+    for n, (key, value) in enumerate(layout.items()):
+        yield ("\n" if n == 0 else ",\n") + pad + json.dumps(key, ensure_ascii=False) + ": "
+        if key == wrapper:
+            yield from college_list()
+        else:
+            yield _shift(json.dumps(value, indent=indent, ensure_ascii=False), pad)
+    yield "\n}"
+
+
+class SqliteStateFile:
+    """The records of one state file in the database
+
+    Same interface as college_store.StateFile. Records are fetched by id
+    on demand; adds and changes are kept in memory until the store
+    commits.
+    """
+
+    def __init__(self, store, filename):
+        self.store = store
+        self.filename = filename
+        self.path = f"{store.db_path}:{filename}"
+        self.records = {}   # id -> record, for records fetched or added this session
+        self.rowids = {}    # id -> rowid, for fetched records
+        self.touched = {}   # id -> hash before the first change (None if added)
+        self.removed = []   # rowids of removed records
+
+    def _fetch(self, college_id):
+        if college_id in self.records:
+            return self.records[college_id]
+        if college_id in self.touched:
+            return None  # removed this session
+        row = self.store.conn.execute(
+            "SELECT rowid, data FROM colleges WHERE id = ? AND file = ? ORDER BY position LIMIT 1",
+            (college_id, self.filename)).fetchone()
+        if row is None:
+            return None
+        college = self.store.expand(loads(row[1]))
+        self.records[college_id] = college
+        self.rowids[college_id] = row[0]
+        return college
+
+    def __contains__(self, college_id):
+        return self._fetch(college_id) is not None
+
+    def __len__(self):
+        count = self.store.conn.execute("SELECT COUNT(*) FROM colleges WHERE file = ?", (self.filename,)).fetchone()[0]
+        added = sum(1 for before in self.touched.values() if before is None)
+        return count + added - len(self.removed)
+
+    def get(self, college_id):
+        return self._fetch(college_id)
+
+    def _touch(self, college_id):
+        if college_id not in self.touched:
+            college = self._fetch(college_id)
+            self.touched[college_id] = None if college is None else record_hash(college)
+
+    def edit(self, college_id):
+        college = self._fetch(college_id)
+        if college is not None:
+            self._touch(college_id)
+        return college
+
+    def add(self, college):
+        if college['id'] in self:
+            return False
+        self._touch(college['id'])
+        self.records[college['id']] = college
+        return True
+
+    def update(self, college_id, fields):
+        college = self.edit(college_id)
+        if college is None:
+            return False
+        college.update(fields)
+        return True
+
+    def upsert(self, college):
+        if college['id'] not in self:
+            return self.add(college)
+        self._touch(college['id'])
+        self.records[college['id']] = college
+        return True
+
+    def remove(self, college_id):
+        if self._fetch(college_id) is None:
+            return False
+        self._touch(college_id)
+        del self.records[college_id]
+        rowid = self.rowids.pop(college_id, None)
+        if rowid is not None:
+            self.removed.append(rowid)
+        return True
+
+    def changed_ids(self):
+        changed = []
+        for college_id, before in self.touched.items():
+            college = self.records.get(college_id)
+            if college is None:
+                if before is not None:
+                    changed.append(college_id)
+            elif before is None or record_hash(college) != before:
+                changed.append(college_id)
+        return changed
+
+    @property
+    def dirty(self):
+        return bool(self.changed_ids())
+
+    def _write(self, conn):
+        """Write this session's changes inside the store's transaction"""
+        if self.removed:
+            conn.executemany("DELETE FROM colleges WHERE rowid = ?", [(rowid,) for rowid in self.removed])
+        changed = [cid for cid in self.changed_ids() if cid in self.records]
+        updates = [(self.rowids[cid], self.records[cid]) for cid in changed if cid in self.rowids]
+        added = [self.records[cid] for cid in changed if cid not in self.rowids]
+        if updates:
+            self.store.update_rows(updates)
+        if added:
+            conn.execute("INSERT OR IGNORE INTO files (name) VALUES (?)", (self.filename,))
+            position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM colleges WHERE file = ?",
+                                    (self.filename,)).fetchone()[0]
+            for college in added:
+                self.rowids[college['id']] = self.store.insert_row(self.filename, position, college)
+                position += 1
+        self.touched = {}
+        self.removed = []
+
+
+class SqliteStore:
+    """CollegeStore over a SQLite database instead of the state files"""
+
+    def __init__(self, db_path=DB_PATH, validator=None):
+        self.db_path = Path(db_path)
+        self.validator = validator
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'formatVersion'").fetchone()
+        if version is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO meta VALUES ('formatVersion', ?)", (str(DB_FORMAT_VERSION),))
+        elif int(version[0]) != DB_FORMAT_VERSION:
+            raise ValueError(f"{self.db_path}: database format {version[0]}, expected {DB_FORMAT_VERSION}")
+        self.files = {}
+        self._load_shared()
+
+    def _load_shared(self):
+        row = self.conn.execute("SELECT content FROM raw_files WHERE name = ?", (SHARED_VALUES_NAME,)).fetchone()
+        self.shared = SharedValues(loads(bytes(row[0])).get("values", {})) if row else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    # -- rows ------------------------------------------------------------
+
+    def expand(self, college):
+        return college if self.shared is None else self.shared.expand(college)
+
+    def _stored(self, college):
+        """(data, state, tier, ownership, district, exams) for an expanded record"""
+        stored = college if self.shared is None else self.shared.compress(college)
+        # Records the store writes are canonical (sorted keys), as CollegeStore writes them;
+        # imported records keep their key order so an unchanged file exports byte for byte
+        return (dumps(stored, pretty=False), *index_columns(college))
+
+    def insert_row(self, filename, position, college):
+        data, state, tier, ownership, district, exams = self._stored(college)
+        rowid = self.conn.execute(
+            "INSERT INTO colleges (file, position, id, state, tier, ownership, district, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (filename, position, college.get("id"), state, tier, ownership, district, data)).lastrowid
+        self.conn.executemany("INSERT OR IGNORE INTO exams VALUES (?, ?)", [(exam, rowid) for exam in exams])
+        return rowid
+
+    def update_rows(self, rows):
+        """Rewrite (rowid, expanded record) pairs and their exam rows"""
+        values, exam_rows = [], []
+        with METRICS.stage("serialize"):
+            for rowid, college in rows:
+                data, state, tier, ownership, district, exams = self._stored(college)
+                values.append((college.get("id"), state, tier, ownership, district, data, rowid))
+                exam_rows.extend((exam, rowid) for exam in exams)
+        with METRICS.stage("write"):
+            self.conn.executemany(
+                "UPDATE colleges SET id = ?, state = ?, tier = ?, ownership = ?, district = ?, data = ?"
+                " WHERE rowid = ?", values)
+            self.conn.executemany("DELETE FROM exams WHERE college = ?", [(rowid,) for rowid, _ in rows])
+            self.conn.executemany("INSERT OR IGNORE INTO exams VALUES (?, ?)", exam_rows)
+        METRICS.count("records_written", len(rows))
+
+    # -- CollegeStore interface -------------------------------------------
+
+    def open(self, filename):
+        state_file = self.files.get(filename)
+        if state_file is None:
+            state_file = self.files[filename] = SqliteStateFile(self, filename)
+        return state_file
+
+    def state(self, state_name):
+        return self.open(state_filename(state_name))
+
+    def locate(self, college_id):
+        """Name of a state file holding `college_id`, or None (session changes included)"""
+        for filename, state_file in self.files.items():
+            if college_id in state_file:
+                return filename
+        for (filename,) in self.conn.execute("SELECT DISTINCT file FROM colleges WHERE id = ?", (college_id,)):
+            if filename not in self.files:
+                return filename
+        return None
+
+    def exists(self, college_id):
+        return self.locate(college_id) is not None
+
+    def contains(self, state_name, college_id):
+        return college_id in self.state(state_name)
+
+    def add(self, state_name, college):
+        return self.state(state_name).add(college)
+
+    def update(self, state_name, college_id, fields):
+        return self.state(state_name).update(college_id, fields)
+
+    def upsert(self, state_name, college):
+        return self.state(state_name).upsert(college)
+
+    def remove(self, state_name, college_id):
+        return self.state(state_name).remove(college_id)
+
+    def dirty_files(self):
+        return [f for f in self.files.values() if f.dirty]
+
+    def changed_ids(self):
+        changed = {}
+        for filename, state_file in self.files.items():
+            ids = state_file.changed_ids()
+            if ids:
+                changed[filename] = ids
+        return changed
+
+    def validate(self):
+        problems = []
+        for state_file in self.files.values():
+            for college_id in state_file.changed_ids():
+                college = state_file.records.get(college_id)
+                if college is not None:
+                    problems.extend((college_id, field, message) for field, message in self.validator(college))
+        return problems
+
+    def commit(self):
+        """Write every change in one transaction; returns the names of the files changed"""
+        if self.validator is not None:
+            problems = self.validate()
+            if problems:
+                raise SchemaError(problems)
+        dirty = self.dirty_files()
+        with self.conn:
+            for state_file in dirty:
+                state_file._write(self.conn)
+        return [f.filename for f in dirty]
+
+    # -- bulk operations --------------------------------------------------
+
+    def rewrite(self, transform, changed_ids=None):
+        """Run `transform(college)` over every record, saving the ones whose content changed
+
+        Like record_stream.rewrite_records: records are edited in place
+        and compared by content hash. Rows are read and written in
+        batches inside one transaction. Returns {file name: [changed ids]};
+        changed ids are also appended to `changed_ids` when given.
+        """
+        changed = {}
+        last = 0
+        with self.conn:
+            while True:
+                with METRICS.stage("load"):
+                    rows = self.conn.execute(
+                        "SELECT rowid, file, data FROM colleges WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                        (last, BATCH_SIZE)).fetchall()
+                if not rows:
+                    break
+                last = rows[-1][0]
+                METRICS.count("records_read", len(rows))
+                updates = []
+                for rowid, filename, data in rows:
+                    start = time.perf_counter()
+                    college = self.expand(loads(data))
+                    parsed = time.perf_counter()
+                    before = record_hash(college)
+                    transform(college)
+                    modified = record_hash(college) != before
+                    METRICS.add("parse", parsed - start)
+                    METRICS.add("transform", time.perf_counter() - parsed)
+                    if modified:
+                        updates.append((rowid, college))
+                        changed.setdefault(filename, []).append(college.get("id"))
+                        if changed_ids is not None:
+                            changed_ids.append(college.get("id"))
+                if updates:
+                    self.update_rows(updates)
+        METRICS.count("records_changed", sum(len(ids) for ids in changed.values()))
+        return changed
+
+    def query(self, tier=None, ownership=None, exam=None, state=None, district=None, explain=False):
+        """Records matching every given filter (ownership matches as a case-insensitive prefix)
+
+        With `explain`, returns SQLite's query plan instead.
+        """
+        sql = "SELECT c.data FROM colleges c"
+        where, params = [], []
+        if exam:
+            sql += " JOIN exams e ON e.college = c.rowid"
+            where.append("e.exam = ?")
+            params.append(exam.strip().lower())
+        for column, value in (("tier", tier), ("state", state), ("district", district)):
+            if value:
+                where.append(f"c.{column} = ?")
+                params.append(value)
+        if ownership:
+            where.append("c.ownership LIKE ?")
+            params.append(ownership.replace("%", "").replace("_", "") + "%")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.file, c.position"
+        if explain:
+            return [row[-1] for row in self.conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        return [self.expand(loads(data)) for (data,) in self.conn.execute(sql, params)]
+
+    # -- import / export ----------------------------------------------------
+
+    def import_models(self, models_dir=MODELS_DIR):
+        """Replace the database contents with models_dir; returns (files, records, inexact files)
+
+        Inexact files are those whose export would not be byte-identical
+        (e.g. hand-formatted JSON); their content still round-trips.
+        """
+        models_dir = Path(models_dir)
+        inexact = []
+        records = 0
+        with self.conn:
+            for table in ("exams", "colleges", "files", "raw_files"):
+                self.conn.execute(f"DELETE FROM {table}")
+            shared_path = models_dir / SHARED_VALUES_NAME
+            if shared_path.exists():
+                self.conn.execute("INSERT INTO raw_files VALUES (?, ?)", (SHARED_VALUES_NAME, shared_path.read_bytes()))
+            self._load_shared()
+
+            for path in state_paths(models_dir):
+                manifest = read_shard_manifest(path)
+                if manifest is not None:
+                    # Imported merged; exported as a single file in the default layout
+                    container, colleges, _ = load_shards(path, manifest)
+                    bom, indent, suffix = False, 2, "\n"
+                else:
+                    raw = path.read_bytes()
+                    bom = raw.startswith(b"\xef\xbb\xbf")
+                    text = raw.decode("utf-8-sig")
+                    try:
+                        container = loads(text)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"{path} contains invalid JSON: {e}") from e
+                    indent, suffix = detect_layout(text)
+                if isinstance(container, list):
+                    layout, colleges = [], container
+                else:
+                    wrapper = next((k for k in WRAPPER_KEYS if isinstance(container.get(k), list)), None)
+                    if wrapper is None:
+                        raise ValueError(f"{path}: no college list found")
+                    layout = {k: (None if k == wrapper else v) for k, v in container.items()}
+                    colleges = container[wrapper]
+
+                self.conn.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                                  (path.name, int(bom), indent, dumps(layout, pretty=False, sort_keys=False), suffix))
+                texts = []
+                for position, college in enumerate(colleges):
+                    data = record_text(college)
+                    texts.append(data)
+                    columns = index_columns(self.expand(loads(data))) if isinstance(college, dict) \
+                        else (None, None, None, None, [])
+                    rowid = self.conn.execute(
+                        "INSERT INTO colleges (file, position, id, state, tier, ownership, district, data)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (path.name, position, college.get("id") if isinstance(college, dict) else None,
+                         *columns[:4], data)).lastrowid
+                    self.conn.executemany("INSERT OR IGNORE INTO exams VALUES (?, ?)",
+                                          [(exam, rowid) for exam in columns[4]])
+                records += len(colleges)
+                if manifest is None and "".join(render_file(layout, texts, indent)) + suffix != text:
+                    inexact.append(path.name)
+        self.files = {}
+        self.conn.execute("ANALYZE")
+        return len(state_paths(models_dir)), records, inexact
+
+    def render(self, filename):
+        """The exact bytes of one state file as stored"""
+        bom, indent, layout, suffix = self.conn.execute(
+            "SELECT bom, indent, layout, suffix FROM files WHERE name = ?", (filename,)).fetchone()
+        records = (data for (data,) in self.conn.execute(
+            "SELECT data FROM colleges WHERE file = ? ORDER BY position", (filename,)))
+        text = "".join(render_file(loads(layout), records, indent)) + suffix
+        return (b"\xef\xbb\xbf" if bom else b"") + text.encode("utf-8")
+
+    def export_models(self, out_dir=MODELS_DIR):
+        """Write every state file (and shared_values.json) whose bytes differ; returns the names written"""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        contents = [(name, bytes(content)) for name, content in self.conn.execute("SELECT name, content FROM raw_files")]
+        names = [name for (name,) in self.conn.execute("SELECT name FROM files ORDER BY name")]
+        written = []
+        # shared_values.json first, so references in the state files always resolve
+        for name, data in contents + [(name, None) for name in names]:
+            data = data if data is not None else self.render(name)
+            path = out_dir / name
+            if path.exists() and path.read_bytes() == data:
+                continue
+            write_bytes_atomic(path, data)
+            written.append(name)
+        return written
+
+
+def open_store(backend="json", models_dir=MODELS_DIR, db=None, validator=None):
+    """A CollegeStore over the state files, or a SqliteStore for backend 'sqlite'"""
+    if backend == "sqlite":
+        return SqliteStore(db or DB_PATH, validator=validator)
+    from college_store import CollegeStore
+    return CollegeStore(models_dir, validator=validator)
+
+
+def add_backend_argument(parser):
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json',
+                        help='Write to the state files (default) or the SQLite store')
+    parser.add_argument('--db', default=str(DB_PATH), help='SQLite database for --backend sqlite')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite store for the college data')
+    parser.add_argument('command', choices=['import', 'export', 'query', 'stats'])
+    parser.add_argument('--db', default=str(DB_PATH), help='SQLite database file')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json (import)')
+    parser.add_argument('--output', '-o', help='Directory to export into (default: --models-dir)')
+    parser.add_argument('--tier', help='query: ranking tier, e.g. "Tier 2"')
+    parser.add_argument('--ownership', help='query: ownership prefix, e.g. private')
+    parser.add_argument('--exam', help='query: accepted exam id, e.g. mht-cet')
+    parser.add_argument('--state', help='query: state name')
+    parser.add_argument('--district', help='query: district name')
+    parser.add_argument('--explain', action='store_true', help='query: print the query plan')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with SqliteStore(args.db) as store:
+        if args.command == 'import':
+            files, records, inexact = store.import_models(args.models_dir)
+            print("=" * 70)
+            print(f"✓ Imported {records} colleges from {files} files into {args.db}")
+            for name in inexact:
+                print(f"  ⚠ {name}: export will be reformatted (content is unchanged)")
+        elif args.command == 'export':
+            written = store.export_models(args.output or args.models_dir)
+            print("=" * 70)
+            print(f"✓ Exported to {args.output or args.models_dir}: {len(written)} files changed")
+            for name in written:
+                print(f"  - {name}")
+        elif args.command == 'query':
+            filters = dict(tier=args.tier, ownership=args.ownership, exam=args.exam,
+                           state=args.state, district=args.district)
+            if args.explain:
+                for step in store.query(**filters, explain=True):
+                    print(f"  {step}")
+                return
+            colleges = store.query(**filters)
+            print("=" * 70)
+            for college in colleges:
+                print(f"  - {college.get('id')}: {college.get('name')} ({college.get('location', '')})")
+            print(f"✓ {len(colleges)} colleges")
+        else:
+            conn = store.conn
+            print("=" * 70)
+            print(f"✓ {conn.execute('SELECT COUNT(*) FROM colleges').fetchone()[0]} colleges in "
+                  f"{conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]} files")
+            for label, column in (("By tier", "tier"), ("By state", "state")):
+                print(f"\n{label}:")
+                for value, count in conn.execute(
+                        f"SELECT {column}, COUNT(*) FROM colleges GROUP BY {column} ORDER BY COUNT(*) DESC LIMIT 10"):
+                    print(f"  - {value}: {count}")
+    print(f"  ({time.perf_counter() - start:.2f}s)")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
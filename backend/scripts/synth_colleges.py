@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Synthetic College Dataset Generator
+===================================
+Writes a models/ tree of any size whose records look like the real ones,
+for capacity planning and for stress-testing every import and load path.
+
+A profile is learned from the existing state files:
+- how many records each file holds, and its places (city, district,
+  state) taken from `location`
+- tier/ownership combinations, acceptedExams mixes per file
+- course blocks, placements, recruiter lists and tuition per tier
+- pastCutoffs entries per exam and how often an accepted exam has one
+- name and overview patterns (with the city cut out), optional-field
+  rates, affiliations, founding years, NAAC grades
+
+From a seed, generate() then draws records file by file and streams
+them to disk, so memory stays flat for a million records and the same
+seed always gives byte-identical output. Files use the plain-list
+layout, the {"institutions": [...]} wrapper, or both (alternating).
+With --csv every file also gets a CSV in the colleges_template.csv
+columns (courses as JSON), importable with bulk_import_colleges.
+
+Usage:
+    python synth_colleges.py --size 100000 --output /tmp/models_100k
+    python synth_colleges.py --size 1000000 --seed 7 --layout institutions --output /tmp/m --csv /tmp/csv
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from itertools import accumulate
+from pathlib import Path
+
+from college_store import MODELS_DIR, canonical_json, load_state_file, state_paths
+from record_stream import RecordWriter
+
+LAYOUTS = ("list", "institutions", "mixed")
+CSV_COLUMNS = (
+    'name', 'shortName', 'location', 'rankingTier', 'overview', 'campus', 'officialUrl',
+    'acceptedExams', 'courses', 'district', 'ownership', 'establishedYear', 'affiliations',
+    'topRecruiters', 'tuition', 'state',
+)
+OPTIONAL_FIELDS = ("overview", "campus", "officialUrl", "tuition", "sources", "topRecruiters", "placements")
+OPTIONAL_META = ("affiliations", "establishedYear", "naacGrade")
+
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATORS = re.compile(r'[-\s]+')
+
+
+def slug(text):
+    return _SLUG_SEPARATORS.sub('-', _SLUG_STRIP.sub('', text.lower())).strip('-')
+
+
+class Choice:
+    """Weighted sampler over counted values"""
+
+    def __init__(self, counter, values):
+        # `counter` is keyed by canonical JSON; `values` holds the first
+        # value seen for each key, so key order stays as in the data
+        self.values = [values[key] for key in counter]
+        self.cum_weights = list(accumulate(counter.values()))
+
+    def __bool__(self):
+        return bool(self.values)
+
+    def draw(self, rng):
+        point = rng.random() * self.cum_weights[-1]
+        return self.values[bisect.bisect_right(self.cum_weights, point)]
+
+
+def _template(text, city, state):
+    """Text with the city and state cut out, for reuse with other places"""
+    if city:
+        text = re.sub(re.escape(city), "{city}", text, flags=re.IGNORECASE)
+    if state:
+        text = text.replace(state, "{state}")
+    return text
+
+
+def _fill(template, city, state):
+    return template.replace("{city}", city).replace("{state}", state)
+
+
+class Profile:
+    """Field distributions learned from a models directory"""
+
+    def __init__(self, models_dir=MODELS_DIR):
+        counts = defaultdict(Counter)
+        samples = defaultdict(dict)
+
+        def count(key, value):
+            text = canonical_json(value)
+            counts[key][text] += 1
+            samples[key].setdefault(text, value)
+
+        self.file_sizes = {}
+        presence = Counter()
+        meta_presence = Counter()
+        exam_pairs = 0
+        exam_pairs_with_cutoff = 0
+        total = 0
+
+        for path in state_paths(models_dir):
+            try:
+                _, colleges = load_state_file(path)
+            except ValueError as e:
+                print(f"  ⚠ Skipping {path.name}: {e}")
+                continue
+            colleges = [c for c in colleges if isinstance(c, dict) and c.get("name")]
+            if not colleges:
+                continue
+            self.file_sizes[path.name] = len(colleges)
+            for college in colleges:
+                total += 1
+                meta = college.get("meta") if isinstance(college.get("meta"), dict) else {}
+                parts = [p.strip() for p in str(college.get("location", "")).split(",")]
+                city = parts[0]
+                state = parts[-1] if len(parts) > 1 else ""
+                district = meta.get("district") or (parts[1].replace(" District", "") if len(parts) > 2 else city)
+                tier = college.get("rankingTier") or "Tier 2"
+                ownership = meta.get("ownership") or "Private"
+
+                count(("place", path.name), [city, district, state])
+                count("tierOwnership", [tier, ownership])
+                exams = [e for e in college.get("acceptedExams") or [] if isinstance(e, str)]
+                count(("exams", path.name), exams)
+
+                name = college["name"]
+                name_template = _template(name, city, state)
+                if "{city}" not in name_template:
+                    name_template = name_template + ", {city}"
+                count("name", name_template)
+
+                for field in OPTIONAL_FIELDS:
+                    if college.get(field):
+                        presence[field] += 1
+                for field in OPTIONAL_META:
+                    if meta.get(field):
+                        meta_presence[field] += 1
+                if college.get("overview"):
+                    count("overview", _template(college["overview"], city, state))
+                if college.get("courses"):
+                    count(("courses", tier), college["courses"])
+                if college.get("placements"):
+                    count(("placements", tier), college["placements"])
+                if college.get("topRecruiters"):
+                    count(("recruiters", tier), college["topRecruiters"])
+                if college.get("tuition"):
+                    count(("tuition", ownership), college["tuition"])
+                if meta.get("affiliations"):
+                    count(("affiliations", path.name), meta["affiliations"])
+                if meta.get("establishedYear"):
+                    count("established", meta["establishedYear"])
+                if meta.get("naacGrade"):
+                    count("naac", meta["naacGrade"])
+
+                cutoff_exams = set()
+                for cutoff in college.get("pastCutoffs") or []:
+                    if isinstance(cutoff, dict) and cutoff.get("examId"):
+                        cutoff_exams.add(cutoff["examId"])
+                        entry = {k: v for k, v in cutoff.items() if k != "examId"}
+                        count(("cutoff", cutoff["examId"]), entry)
+                        count(("cutoff", None), entry)
+                exam_pairs += len(exams)
+                exam_pairs_with_cutoff += len(cutoff_exams & set(exams))
+
+        if not total:
+            raise ValueError(f"No college records found in {models_dir}")
+        self.records = total
+        self.choices = {key: Choice(counter, samples[key]) for key, counter in counts.items()}
+        self.presence = {field: presence[field] / total for field in OPTIONAL_FIELDS}
+        self.meta_presence = {field: meta_presence[field] / total for field in OPTIONAL_META}
+        self.cutoff_rate = exam_pairs_with_cutoff / exam_pairs if exam_pairs else 0.0
+
+    def choice(self, *key):
+        key = key[0] if len(key) == 1 else key
+        return self.choices.get(key)
+
+    def draw(self, rng, *key, fallback=None):
+        """A value for `key` (or `fallback`'s key when it has no samples)"""
+        choice = self.choice(*key)
+        if not choice and fallback is not None:
+            choice = self.choice(*fallback)
+        return choice.draw(rng) if choice else None
+
+    def allocate(self, size):
+        """Records per file for a dataset of `size`, proportional to the real files"""
+        total = sum(self.file_sizes.values())
+        exact = {name: size * n / total for name, n in self.file_sizes.items()}
+        allocation = {name: int(value) for name, value in exact.items()}
+        # Largest remainders get the leftover records, ties broken by name
+        leftover = size - sum(allocation.values())
+        for name in sorted(exact, key=lambda n: (allocation[n] - exact[n], n))[:leftover]:
+            allocation[name] += 1
+        return allocation
+
+    def college(self, rng, filename, n, seed):
+        """One synthetic college for `filename` (nested values are shared; copy before editing)"""
+        city, district, state = self.draw(rng, "place", filename)
+        tier, ownership = self.draw(rng, "tierOwnership")
+        name = _fill(self.draw(rng, "name"), city, state)
+        college = {
+            "id": f"{slug(name)[:44].strip('-')}-s{seed}-{n}",
+            "name": name,
+            "shortName": name[:50],
+            "location": ", ".join(p for p in (city, f"{district} District" if district else "", state) if p),
+            "rankingTier": tier,
+        }
+        if rng.random() < self.presence["overview"] and self.choice("overview"):
+            college["overview"] = _fill(self.draw(rng, "overview"), city, state)
+        if rng.random() < self.presence["campus"]:
+            college["campus"] = city
+        if rng.random() < self.presence["officialUrl"]:
+            college["officialUrl"] = f"https://www.{slug(name)[:30].strip('-')}.ac.in"
+
+        exams = self.draw(rng, "exams", filename) or []
+        college["acceptedExams"] = exams
+        college["courses"] = self.draw(rng, "courses", tier, fallback=("courses", "Tier 2")) or []
+        college["pastCutoffs"] = [
+            {"examId": exam, **self.draw(rng, "cutoff", exam, fallback=("cutoff", None))}
+            for exam in exams if self.choice("cutoff", None) and rng.random() < self.cutoff_rate
+        ]
+        if rng.random() < self.presence["topRecruiters"]:
+            college["topRecruiters"] = self.draw(rng, "recruiters", tier, fallback=("recruiters", "Tier 2")) or []
+        if rng.random() < self.presence["placements"]:
+            college["placements"] = self.draw(rng, "placements", tier, fallback=("placements", "Tier 2")) or {}
+        if rng.random() < self.presence["tuition"]:
+            college["tuition"] = self.draw(rng, "tuition", ownership, fallback=("tuition", "Private")) or ""
+        if rng.random() < self.presence["sources"] and college.get("officialUrl"):
+            college["sources"] = [college["officialUrl"]]
+
+        meta = {"ownership": ownership, "district": district}
+        if rng.random() < self.meta_presence["affiliations"]:
+            meta["affiliations"] = self.draw(rng, "affiliations", filename) or []
+        if rng.random() < self.meta_presence["establishedYear"]:
+            meta["establishedYear"] = self.draw(rng, "established")
+        if rng.random() < self.meta_presence["naacGrade"]:
+            meta["naacGrade"] = self.draw(rng, "naac")
+        college["meta"] = meta
+        return college
+
+
+def csv_row(college):
+    """The college in the colleges_template.csv columns"""
+    meta = college.get("meta", {})
+    parts = [p.strip() for p in college["location"].split(",")]
+    return {
+        "name": college["name"],
+        "shortName": college.get("shortName", ""),
+        "location": college["location"],
+        "rankingTier": college["rankingTier"],
+        "overview": college.get("overview", ""),
+        "campus": college.get("campus", ""),
+        "officialUrl": college.get("officialUrl", ""),
+        "acceptedExams": ",".join(college.get("acceptedExams", [])),
+        "courses": json.dumps(college.get("courses", []), ensure_ascii=False),
+        "district": meta.get("district", ""),
+        "ownership": meta.get("ownership", ""),
+        "establishedYear": meta.get("establishedYear", ""),
+        "affiliations": ",".join(meta.get("affiliations", [])),
+        "topRecruiters": ",".join(college.get("topRecruiters", [])),
+        "tuition": college.get("tuition", ""),
+        "state": parts[-1] if len(parts) > 1 else "",
+    }
+
+
+def iter_files(profile, size, seed=0):
+    """Yield (position, file name, iterator of colleges) for every file of a dataset
+
+    Each file draws from its own random stream, so a file's records do
+    not depend on the others.
+    """
+    for position, (filename, count) in enumerate(sorted(profile.allocate(size).items())):
+        if count:
+            rng = random.Random(f"{seed}:{filename}")
+            yield position, filename, (profile.college(rng, filename, f"{position}-{n}", seed) for n in range(count))
+
+
+def write_csv(path, colleges):
+    """Write colleges as a template-format CSV; returns the number of rows"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        rows = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        rows.writeheader()
+        for college in colleges:
+            rows.writerow(csv_row(college))
+            count += 1
+    return count
+
+
+def generate(profile, size, output, seed=0, layout="mixed", csv_dir=None):
+    """Write `size` synthetic colleges under `output`; returns {file: records}"""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    if csv_dir:
+        Path(csv_dir).mkdir(parents=True, exist_ok=True)
+    written = {}
+    for position, filename, colleges in iter_files(profile, size, seed):
+        wrapped = layout == "institutions" or (layout == "mixed" and position % 2 == 1)
+        csv_file = None
+        try:
+            if csv_dir:
+                csv_file = open(Path(csv_dir) / filename.replace("_Colleges.json", ".csv"),
+                                'w', newline='', encoding='utf-8')
+                rows = csv.DictWriter(csv_file, fieldnames=CSV_COLUMNS)
+                rows.writeheader()
+            with RecordWriter(output / filename, wrapper="institutions" if wrapped else None,
+                              compress=False) as writer:
+                for college in colleges:
+                    writer.write(college)
+                    if csv_file:
+                        rows.writerow(csv_row(college))
+        finally:
+            if csv_file:
+                csv_file.close()
+        written[filename] = writer.count
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic models/ tree learned from the real one')
+    parser.add_argument('--size', type=int, required=True, help='Number of colleges to generate')
+    parser.add_argument('--output', '-o', required=True, help='Directory to write *_Colleges.json into')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same output)')
+    parser.add_argument('--layout', choices=LAYOUTS, default='mixed',
+                        help='Plain lists, {"institutions": [...]} wrappers, or alternating (default)')
+    parser.add_argument('--csv', help='Also write one template-format CSV per file into this directory')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Real data to learn distributions from')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profile = Profile(args.models_dir)
+    print(f"✓ Learned from {profile.records} colleges in {len(profile.file_sizes)} files")
+    written = generate(profile, args.size, args.output, args.seed, args.layout, args.csv)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 70)
+    print(f"✓ Wrote {sum(written.values())} colleges to {len(written)} files in {elapsed:.1f}s")
+    print(f"  - Output: {args.output}")
+    if args.csv:
+        print(f"  - CSVs: {args.csv}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""fetcher.py against a local HTTP server: retries, revalidation, offline replay, resume"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from crawl_checkpoint import CrawlCheckpoint
+from fetcher import PARSERS, Fetcher, HostPolicy, crawl
+from http_cache import HttpCache
+
+FAST = HostPolicy(concurrency=4, rate=1000, burst=1000)
+
+
+def listing(rows, next_path=None):
+    """An HTML listing page with one table row per name"""
+    body = "<table><tr><th>Name</th><th>City</th></tr>"
+    body += "".join(f"<tr><td>{name}</td><td>{city}</td></tr>" for name, city in rows)
+    body += "</table>"
+    if next_path:
+        body += f'<a rel="next" href="{next_path}">Next</a>'
+    return 200, {"Content-Type": "text/html"}, body.encode("utf-8")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def fetch(url, **options):
+    async with Fetcher(default_policy=FAST, backoff=0.01, **options) as fetcher:
+        page = await fetcher.fetch(url)
+        return page, fetcher.stats
+
+
+def test_retries_503_honouring_retry_after(http_server):
+    def flaky(request):
+        if request.hits == 1:
+            return 503, {"Retry-After": "0"}, b"busy"
+        return listing([("Alpha College", "Pune")])
+
+    http_server.routes["/flaky"] = flaky
+    page, stats = run(fetch(http_server.url("/flaky")))
+
+    assert page.status == 200
+    assert b"Alpha College" in page.body
+    assert http_server.hits["/flaky"] == 2
+    assert stats["retries"] == 1
+    assert stats["failures"] == 0
+
+
+def test_etag_revalidation_and_offline_replay(http_server, tmp_path):
+    def tagged(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        status, headers, body = listing([("Beta Institute", "Surat")])
+        return status, {**headers, "ETag": '"v1"'}, body
+
+    http_server.routes["/tagged"] = tagged
+    url = http_server.url("/tagged")
+    cache = HttpCache(tmp_path / "cache")
+
+    first, _ = run(fetch(url, cache=cache))
+    second, stats = run(fetch(url, cache=cache))
+    assert first.status == second.status == 200
+    assert second.body == first.body
+    assert second.from_cache
+    assert stats["notModified"] == 1
+    assert http_server.hits["/tagged"] == 2
+
+    replayed, stats = run(fetch(url, cache=cache, offline=True))
+    assert replayed.body == first.body
+    assert stats["requests"] == 0
+    assert http_server.hits["/tagged"] == 2
+
+
+def test_crawl_resumes_from_checkpoint(http_server, tmp_path):
+    http_server.routes["/page1"] = lambda request: listing([("Gamma College", "Nagpur")], "/page2")
+    http_server.routes["/page2"] = lambda request: (500, {}, b"down")
+    checkpoint_path = tmp_path / "crawl.sqlite"
+
+    async def crawl_once(resume):
+        with CrawlCheckpoint(checkpoint_path, resume=resume) as checkpoint:
+            async with Fetcher(default_policy=FAST, retries=0) as fetcher:
+                result = await crawl([http_server.url("/page1")], PARSERS["table"], fetcher,
+                                     checkpoint=checkpoint)
+            return result, list(checkpoint.records())
+
+    result, records = run(crawl_once(resume=False))
+    assert result.pages == 1
+    assert [url for url, _ in result.failed] == [http_server.url("/page2")]
+    assert [r["name"] for r in records] == ["Gamma College"]
+
+    http_server.routes["/page2"] = lambda request: listing([("Delta College", "Nashik")])
+    result, records = run(crawl_once(resume=True))
+    assert result.pages == 1
+    assert result.failed == []
+    assert [r["name"] for r in result.records] == ["Delta College"]
+    assert [r["name"] for r in records] == ["Gamma College", "Delta College"]
+    # The page finished in the first run is not fetched again
+    assert http_server.hits["/page1"] == 1
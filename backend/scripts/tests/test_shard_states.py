@@ -0,0 +1,62 @@
+"""shard_states.py with CollegeStore: shard -> edit -> unshard keeps every record"""
+
+from college_store import CollegeStore, load_state_file, read_shard_manifest, shard_dir, write_state_atomic
+from shard_states import shard_state, unshard_state
+
+
+def college(college_id, district):
+    return {"id": college_id, "name": f"College {college_id}", "location": f"{district}, Gujarat",
+            "meta": {"district": district}}
+
+
+COLLEGES = [college("a1", "Ahmedabad"), college("a2", "Ahmedabad"), college("s1", "Surat"),
+            college("v1", "Vadodara")]
+
+
+def make_state(models_dir, data=COLLEGES):
+    path = models_dir / "Gujarat_Colleges.json"
+    write_state_atomic(path, data)
+    return path
+
+
+def test_shard_unshard_is_byte_exact(tmp_path):
+    # Records already grouped by district, so unsharding restores the same order
+    path = make_state(tmp_path)
+    original = path.read_bytes()
+
+    assert shard_state(path) == 3
+    assert not path.exists()
+    assert [s["file"] for s in read_shard_manifest(path)["shards"]] == ["Ahmedabad.json", "Surat.json",
+                                                                         "Vadodara.json"]
+    assert unshard_state(path) == 4
+    assert path.read_bytes() == original
+    assert not shard_dir(path).exists()
+
+
+def test_edit_moves_record_between_shards(tmp_path):
+    path = make_state(tmp_path, {"source": "acpc", "colleges": COLLEGES})
+    shard_state(path)
+
+    store = CollegeStore(tmp_path)
+    state = store.state("Gujarat")
+    state.edit("a2")["meta"]["district"] = "Surat"
+    state.update("v1", {"tuition": "₹1,00,000"})
+    state.add(college("r1", "Rajkot"))
+    written = store.commit()
+    assert written == [path]
+
+    directory = shard_dir(path)
+    assert sorted(p.name for p in directory.iterdir()) == ["Ahmedabad.json", "Rajkot.json", "Surat.json",
+                                                           "Vadodara.json", "manifest.json"]
+    _, ahmedabad = load_state_file(directory / "Ahmedabad.json")
+    _, surat = load_state_file(directory / "Surat.json")
+    assert [c["id"] for c in ahmedabad] == ["a1"]
+    assert [c["id"] for c in surat] == ["a2", "s1"]
+
+    unshard_state(path)
+    container, colleges = load_state_file(path)
+    assert container["source"] == "acpc"
+    assert sorted(c["id"] for c in colleges) == ["a1", "a2", "r1", "s1", "v1"]
+    by_id = {c["id"]: c for c in colleges}
+    assert by_id["a2"]["meta"]["district"] == "Surat"
+    assert by_id["v1"]["tuition"] == "₹1,00,000"
@@ -0,0 +1,60 @@
+"""sqlite_store.py: a JSON -> SQLite -> JSON round trip reproduces the state files byte for byte"""
+
+import json
+
+from college_store import write_state_atomic
+from sqlite_store import SqliteStore
+
+
+def college(college_id, name, city, state, **fields):
+    return {"id": college_id, "name": name, "location": f"{city}, {state}",
+            "rankingTier": "Tier 2", "acceptedExams": ["jee-main"], "meta": {"district": city}, **fields}
+
+
+def write_models(models_dir):
+    """State files in each layout the importers have produced"""
+    write_state_atomic(models_dir / "Goa_Colleges.json", [
+        college("goa-eng", "Goa College of Engineering", "Ponda", "Goa"),
+        college("nit-goa", "NIT Goa", "Ponda", "Goa", tuition="₹1,50,000"),
+    ])
+    # BOM, 4-space indent, no final newline
+    text = json.dumps([college("kerala-1", "CET Trivandrum", "Thiruvananthapuram", "Kerala")],
+                      indent=4, ensure_ascii=False)
+    (models_dir / "Kerala_Colleges.json").write_bytes(b"\xef\xbb\xbf" + text.encode("utf-8"))
+    # List under a wrapper key, next to other top-level keys
+    write_state_atomic(models_dir / "Punjab_Colleges.json", {
+        "source": "manual", "colleges": [college("pec", "PEC Chandigarh", "Chandigarh", "Punjab")],
+    })
+
+
+def test_import_export_is_byte_exact(tmp_path):
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    write_models(models_dir)
+    originals = {path.name: path.read_bytes() for path in models_dir.iterdir()}
+
+    with SqliteStore(tmp_path / "colleges.db") as store:
+        files, records, inexact = store.import_models(models_dir)
+        assert (files, records, inexact) == (3, 4, [])
+        out_dir = tmp_path / "export"
+        assert sorted(store.export_models(out_dir)) == sorted(originals)
+        # Exporting over identical files writes nothing
+        assert store.export_models(models_dir) == []
+
+    assert {path.name: path.read_bytes() for path in out_dir.iterdir()} == originals
+
+
+def test_edit_round_trip(tmp_path):
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    write_models(models_dir)
+
+    with SqliteStore(tmp_path / "colleges.db") as store:
+        store.import_models(models_dir)
+        store.update("Goa", "nit-goa", {"tuition": "₹2,00,000"})
+        store.commit()
+        assert store.export_models(models_dir) == ["Goa_Colleges.json"]
+
+    goa = json.loads((models_dir / "Goa_Colleges.json").read_text(encoding="utf-8"))
+    assert [c["id"] for c in goa] == ["goa-eng", "nit-goa"]
+    assert goa[1]["tuition"] == "₹2,00,000"
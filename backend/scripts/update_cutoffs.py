@@ -1,8 +1,15 @@
 
-import json
-import os
+import argparse
 from pathlib import Path
 
+from change_log import ChangeLog
+from college_store import MODELS_DIR, file_label, record_files
+from parallel import add_jobs_argument, map_files
+from record_stream import rewrite_records
+from run_manifest import RunManifest, add_full_argument
+from run_metrics import Progress, add_profile_argument, instrumented
+from sqlite_store import SqliteStore, add_backend_argument
+
 # Verified Cutoff Data (2024/2023)
 CUTOFF_DATA = {
     # IITs (JEE Advanced 2024 - General - Gender Neutral - Round 5/6 Closing Ranks)
@@ -67,7 +74,23 @@ CUTOFF_DATA = {
     ]
 }
 
-def update_college_cutoffs(models_dir):
+def apply_cutoffs(college):
+    """Set verified cutoffs on one college; returns True if it has any"""
+    college_id = college.get('id')
+    if college_id not in CUTOFF_DATA:
+        return False
+    college['pastCutoffs'] = CUTOFF_DATA[college_id]
+    return True
+
+def update_file_cutoffs(file_path):
+    """Apply cutoff data to one state file; returns the number of colleges updated (None on error)"""
+    try:
+        return rewrite_records(file_path, apply_cutoffs)
+    except Exception as e:
+        print(f"  ✗ Error processing {file_label(file_path)}: {e}")
+        return None
+
+def update_college_cutoffs(models_dir, jobs=1, full=False):
     """Update all college JSON files with cutoff data"""
     models_path = Path(models_dir)
     
@@ -75,45 +98,54 @@ def update_college_cutoffs(models_dir):
         print(f"Error: Directory {models_dir} does not exist")
         return
     
-    college_files = list(models_path.glob("*_Colleges.json"))
+    college_files = record_files(models_path)
     updated_count = 0
     
-    for file_path in college_files:
-        print(f"Processing {file_path.name}...")
-        try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                data = json.load(f)
-            
-            # Handle Wrapper
-            if isinstance(data, dict) and 'institutions' in data:
-                colleges = data['institutions']
-                is_wrapper = True
-            else:
-                colleges = data
-                is_wrapper = False
-
-            file_updated = False
-            for college in colleges:
-                college_id = college.get('id')
-                if college_id in CUTOFF_DATA:
-                    college['pastCutoffs'] = CUTOFF_DATA[college_id]
-                    print(f"  ✓ Updated Cutoffs for {college.get('name', college_id)}")
-                    updated_count += 1
-                    file_updated = True
-            
-            # Write back
-            if file_updated:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    if is_wrapper:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    else:
-                        json.dump(colleges, f, indent=2, ensure_ascii=False)
-        
-        except Exception as e:
-            print(f"  ✗ Error processing {file_path.name}: {e}")
+    # Skip files already processed with the same CUTOFF_DATA
+    manifest = RunManifest("update_cutoffs", models_path, inputs=(CUTOFF_DATA, apply_cutoffs))
+    pending = college_files if full else manifest.pending(college_files)
+    if len(pending) < len(college_files):
+        print(f"Skipping {len(college_files) - len(pending)} unchanged files")
+    
+    progress = Progress(len(pending), "files")
+    for file_path, count in map_files(update_file_cutoffs, pending, jobs):
+        progress.update()
+        if count is None:
+            continue
+        updated_count += count
+        manifest.record(file_path)
+    manifest.save()
     
     print(f"\n✓ Updated {updated_count} colleges with verified cutoff data")
 
+def update_sqlite_cutoffs(db):
+    """Apply cutoff data to every college in the SQLite store in one transaction"""
+    with SqliteStore(db) as store:
+        changed = store.rewrite(apply_cutoffs)
+    updated_count = sum(len(ids) for ids in changed.values())
+    print(f"\n✓ Updated {updated_count} colleges with verified cutoff data")
+
+def log_college_cutoffs(change_log):
+    """Append cutoff patches to the change log instead of rewriting state files"""
+    for college_id, cutoffs in CUTOFF_DATA.items():
+        change_log.patch(college_id, {"pastCutoffs": cutoffs})
+    print(f"✓ Logged cutoff updates for {len(CUTOFF_DATA)} colleges to {change_log.path}")
+    print("  Run: python change_log.py compact")
+
 if __name__ == "__main__":
-    models_directory = r"e:\CMAT-PROBLEM\backend\models"
-    update_college_cutoffs(models_directory)
+    parser = argparse.ArgumentParser(description='Apply verified cutoff data')
+    parser.add_argument('--models-dir', default=str(MODELS_DIR), help='Directory holding *_Colleges.json')
+    parser.add_argument('--log', action='store_true', help='Append to the change log instead of rewriting files')
+    add_jobs_argument(parser)
+    add_full_argument(parser)
+    add_backend_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with instrumented("update_cutoffs", args.profile):
+        if args.log:
+            log_college_cutoffs(ChangeLog.for_models(args.models_dir))
+        elif args.backend == "sqlite":
+            update_sqlite_cutoffs(args.db)
+        else:
+            update_college_cutoffs(args.models_dir, args.jobs, args.full)
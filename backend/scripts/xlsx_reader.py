@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Streaming XLSX Reader
+=====================
+Read-only row iterator for large .xlsx workbooks (seat matrices and
+college lists published by state counselling bodies), without openpyxl.
+
+An .xlsx file is a zip of XML parts. The sheet XML is read with
+iterparse and every row element is dropped once it has been emitted, so
+memory stays bounded by one row however long the sheet is. The only
+part held in memory is the shared string table, which Excel
+deduplicates.
+
+The first non-empty row is the header row; each following row is
+yielded as a dict like csv.DictReader's, with numbers written the way
+Excel shows them (1995, not 1995.0).
+
+Usage:
+    python xlsx_reader.py colleges.xlsx --sheet "College List" --output colleges.csv
+
+    for row_number, row in iter_xlsx_rows("colleges.xlsx"):
+        ...
+"""
+
+import argparse
+import csv
+import posixpath
+import sys
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+V_TAG = f"{MAIN_NS}v"
+
+_DIGITS = "0123456789"
+_column_cache = {}
+
+
+def column_index(ref):
+    """'A1' -> 0, 'AB7' -> 27"""
+    letters = ref.rstrip(_DIGITS)
+    index = _column_cache.get(letters)
+    if index is None:
+        index = 0
+        for letter in letters:
+            index = index * 26 + ord(letter) - 64
+        index = _column_cache[letters] = index - 1
+    return index
+
+
+def _text(element):
+    """Concatenated <t> text of a shared or inline string (rich text runs included)"""
+    return "".join(t.text or "" for t in element.iter(f"{MAIN_NS}t"))
+
+
+def _number(text):
+    value = float(text)
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def _iter_children(f, parent_tag, tag):
+    """iterparse yielding each finished `tag` element inside `parent_tag`
+
+    Each element is removed from its parent once the caller resumes, so
+    the partial tree never grows past one element.
+    """
+    parent = None
+    for event, element in iterparse(f, events=("start", "end")):
+        if event == "end":
+            if element.tag == tag and parent is not None:
+                yield element
+                parent.remove(element)
+        elif element.tag == parent_tag:
+            parent = element
+
+
+def read_shared_strings(archive):
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for element in _iter_children(f, f"{MAIN_NS}sst", f"{MAIN_NS}si"):
+            strings.append(_text(element))
+    return strings
+
+
+def sheet_paths(archive):
+    """{sheet name: part path} in workbook order"""
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        targets = {}
+        for _, element in iterparse(f):
+            if element.tag == f"{PKG_REL_NS}Relationship":
+                target = element.get("Target")
+                path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+                targets[element.get("Id")] = path
+    sheets = {}
+    with archive.open("xl/workbook.xml") as f:
+        for _, element in iterparse(f):
+            if element.tag == f"{MAIN_NS}sheet":
+                sheets[element.get("name")] = targets[element.get(f"{REL_NS}id")]
+    return sheets
+
+
+def _cell_value(cell, shared_strings):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return _text(cell)
+    value = None
+    for child in cell:
+        if child.tag == V_TAG:
+            value = child.text
+            break
+    if value is None:
+        return ""
+    if kind == "s":
+        return shared_strings[int(value)]
+    if kind == "b":
+        return "TRUE" if value == "1" else "FALSE"
+    if kind == "n":
+        try:
+            return _number(value)
+        except ValueError:
+            return value
+    return value  # str (formula result), e (error)
+
+
+def iter_sheet_cells(path, sheet=None):
+    """Yield (row number, [cell text, ...]) for one sheet (default: the first)"""
+    with zipfile.ZipFile(path) as archive:
+        sheets = sheet_paths(archive)
+        if not sheets:
+            raise ValueError(f"{path}: workbook has no sheets")
+        if sheet is None:
+            part = next(iter(sheets.values()))
+        elif sheet in sheets:
+            part = sheets[sheet]
+        else:
+            raise ValueError(f"{path}: no sheet named {sheet!r} (sheets: {', '.join(sheets)})")
+        shared_strings = read_shared_strings(archive)
+
+        with archive.open(part) as f:
+            next_row = 1
+            for element in _iter_children(f, f"{MAIN_NS}sheetData", f"{MAIN_NS}row"):
+                row_number = int(element.get("r") or next_row)
+                next_row = row_number + 1
+                cells = []
+                for position, cell in enumerate(element):
+                    ref = cell.get("r")
+                    index = column_index(ref) if ref else position
+                    if index == len(cells):
+                        cells.append(_cell_value(cell, shared_strings))
+                        continue
+                    if index > len(cells):
+                        cells.extend([""] * (index + 1 - len(cells)))
+                    cells[index] = _cell_value(cell, shared_strings)
+                yield row_number, cells
+
+
+def iter_xlsx_rows(path, sheet=None):
+    """Yield (row number, {header: text}) for every data row of a sheet
+
+    Row numbers are the sheet's own, so they match what Excel shows.
+    Fully empty rows are skipped.
+    """
+    headers = None
+    for row_number, cells in iter_sheet_cells(path, sheet):
+        if not any(cell.strip() for cell in cells):
+            continue
+        if headers is None:
+            headers = [cell.strip() for cell in cells]
+            continue
+        if len(cells) < len(headers):
+            cells.extend([""] * (len(headers) - len(cells)))
+        yield row_number, {header: value for header, value in zip(headers, cells) if header}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream rows out of a (large) .xlsx sheet')
+    parser.add_argument('xlsx', help='Workbook to read')
+    parser.add_argument('--sheet', help='Sheet name (default: first sheet)')
+    parser.add_argument('--output', '-o', help='CSV file to write (default: stdout)')
+    args = parser.parse_args()
+
+    rows = iter_xlsx_rows(args.xlsx, args.sheet)
+    first = next(rows, None)
+    if first is None:
+        print("⚠ No data rows found", file=sys.stderr)
+        return
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=list(first[1]), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerow(first[1])
+        count = 1
+        for _, row in rows:
+            writer.writerow(row)
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"✓ Extracted {count} rows", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
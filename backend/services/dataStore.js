@@ -1,8 +1,20 @@
 ﻿const fs = require("fs");
 const path = require("path");
+const crypto = require("crypto");
 const { getRedisClient } = require("../config/redis");
 
 const MODELS_DIR = path.join(__dirname, "..", "models");
+// Pre-merged bundle written by scripts/build_bundle.py
+const BUNDLE_DIR = path.join(MODELS_DIR, "bundle");
+const BUNDLE_FORMAT_VERSION = 2;
+// Values hoisted out of the state files by scripts/normalize_colleges.py;
+// a field holding {"$shared": key} stands for values[key]
+const SHARED_VALUES_FILE = "shared_values.json";
+const SHARED_REF = "$shared";
+// States split by scripts/shard_states.py: models/<State>/manifest.json lists
+// the district files that together stand in for <State>_Colleges.json
+const SHARD_MANIFEST_FILE = "manifest.json";
+const SHARD_FORMAT_VERSION = 1;
 
 // Cache keys
 const CACHE_KEYS = {
@@ -25,13 +37,108 @@ function loadJson(file) {
   return JSON.parse(cleaned);
 }
 
+function loadSharedValues() {
+  const data = loadJson(SHARED_VALUES_FILE);
+  return (data && data.values) || {};
+}
+
+// Replaces {"$shared": key} fields with the shared value, in place. Records
+// are never mutated in place elsewhere, so they can share one object.
+function expandShared(college, shared) {
+  for (const [field, value] of Object.entries(college)) {
+    if (value && typeof value === "object" && !Array.isArray(value)) {
+      const keys = Object.keys(value);
+      if (keys.length === 1 && keys[0] === SHARED_REF && shared[value[SHARED_REF]] !== undefined) {
+        college[field] = shared[value[SHARED_REF]];
+      }
+    }
+  }
+  return college;
+}
+
+// State files in name order as { name, files }: a single file, or a sharded
+// state's district files in manifest order. A single file wins over a shard
+// directory (both exist only while shard_states.py is switching layouts).
+function listStateSources() {
+  const entries = fs.readdirSync(MODELS_DIR, { withFileTypes: true });
+  const states = new Map();
+  for (const entry of entries) {
+    if (entry.isFile() && /_Colleges\.json$/i.test(entry.name)) {
+      states.set(entry.name, { name: entry.name, files: [entry.name] });
+    }
+  }
+  for (const entry of entries) {
+    const name = `${entry.name}_Colleges.json`;
+    if (!entry.isDirectory() || states.has(name)) continue;
+    const manifestFile = `${entry.name}/${SHARD_MANIFEST_FILE}`;
+    let manifest = null;
+    try {
+      manifest = loadJson(manifestFile);
+    } catch (err) {
+      console.warn(`Failed to read ${manifestFile}:`, err.message);
+    }
+    if (!manifest || manifest.formatVersion !== SHARD_FORMAT_VERSION || !Array.isArray(manifest.shards)) continue;
+    states.set(name, {
+      name,
+      manifest: manifestFile,
+      files: manifest.shards.map(shard => `${entry.name}/${shard.file}`)
+    });
+  }
+  return Array.from(states.values()).sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0));
+}
+
+// Every file the college list is read from (shard manifests included), as
+// named in the bundle manifest's sources
+function listSourceFiles(states) {
+  return states.flatMap(state => (state.manifest ? [state.manifest, ...state.files] : state.files));
+}
+
+// Returns the bundled college list, or null if there is no bundle or any
+// source file changed since it was built (so a stale bundle is never served).
+// Sources whose size and mtime match the manifest are trusted; only the
+// others are hashed.
+function loadCollegeBundle(files) {
+  const manifestPath = path.join(BUNDLE_DIR, "manifest.json");
+  if (!fs.existsSync(manifestPath)) return null;
+  try {
+    const manifest = JSON.parse(fs.readFileSync(manifestPath, "utf8"));
+    if (manifest.formatVersion !== BUNDLE_FORMAT_VERSION) return null;
+
+    const sources = manifest.sources || {};
+    if (Object.keys(sources).length !== files.length) return null;
+    for (const file of files) {
+      const expected = sources[file];
+      if (!expected) return null;
+      const filePath = path.join(MODELS_DIR, file);
+      const stat = fs.statSync(filePath, { bigint: true });
+      if (Number(stat.size) !== expected.size) return null;
+      if (String(stat.mtimeNs) === expected.mtimeNs) continue;
+      const raw = fs.readFileSync(filePath);
+      if (crypto.createHash("sha256").update(raw).digest("hex") !== expected.sha256) return null;
+    }
+
+    const bundle = JSON.parse(fs.readFileSync(path.join(BUNDLE_DIR, manifest.file), "utf8"));
+    if (!bundle || !Array.isArray(bundle.colleges)) return null;
+    const shared = bundle.shared || {};
+    return bundle.colleges.map(c => expandShared(c, shared));
+  } catch (err) {
+    console.warn("Failed to read college bundle:", err.message);
+    return null;
+  }
+}
+
 function loadStateCollegeFiles() {
   if (!fs.existsSync(MODELS_DIR)) return [];
-  const files = fs.readdirSync(MODELS_DIR).filter((file) => /_Colleges\.json$/i.test(file));
+  const states = listStateSources();
+  const files = states.flatMap(state => state.files);
+
+  const bundled = states.length > 0 ? loadCollegeBundle(listSourceFiles(states)) : null;
+  if (bundled) return bundled;
 
   const combined = [];
+  const shared = loadSharedValues();
 
-  if (files.length === 0) {
+  if (states.length === 0) {
     const legacyData = loadJson("colleges.json");
     return legacyData || [];
   }
@@ -52,7 +159,7 @@ function loadStateCollegeFiles() {
         if (possibleKey) list = data[possibleKey];
       }
 
-      const validColleges = list.filter(c => c && (c.id || c.name));
+      const validColleges = list.filter(c => c && (c.id || c.name)).map(c => expandShared(c, shared));
       combined.push(...validColleges);
       // console.log(`Loaded ${validColleges.length} from ${file}`);
     } catch (err) {